@@ -2,18 +2,28 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from datetime import datetime, timedelta
 import json
+import os
 import traceback
 import numpy as np
 import jwt
 import functools
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.exc import SQLAlchemyError
 
 from config.settings import get_config
-from models.database import db, User, DailyLog, Decision, Pattern, Insight
+from models.database import db, User, DailyLog, Decision, Pattern, Insight, ensure_schema
 from services.ml_predictor import MLPredictor
+from services.model_registry import ModelRegistry
+from services.training_jobs import TrainingJobQueue
 from services.context_classifier import ContextClassifier
 from services.ai_engine import AIEngine
+from services.analytics_frame import AnalyticsFrame
+from services.journal_features import JournalFeatureExtractor
+from services.keyword_index import KeywordIndex
 from services.knowledge_base import KnowledgeBase
+from services.classifier_metrics import begin_request_timing, end_request_timing, server_timing_header
+from services.model_client import ModelClient, RemoteAIEngine, RemoteContextClassifier
+from services.model_warmup import ModelWarmup
 from utils.validators import validate_metrics, validate_decision_data
 
 # Initialize Flask app
@@ -29,10 +39,35 @@ CORS(app, resources={r"/*": {"origins": "*"}})
 db.init_app(app)
 
 # Initialize AI services
-ml_predictor = MLPredictor()
-context_classifier = ContextClassifier()
-ai_engine = AIEngine()
+# Each user gets their own ML models once they have enough logs, trained
+# in the background; handlers fetch one predictor snapshot per request
+model_registry = ModelRegistry(
+    MLPredictor(config),
+    config.ML_REGISTRY_DIR,
+    max_models=config.ML_REGISTRY_MAX_MODELS,
+    max_memory_mb=config.ML_REGISTRY_MAX_MEMORY_MB,
+    refresh_seconds=config.ML_REGISTRY_REFRESH_SECONDS
+)
+ml_training = TrainingJobQueue(model_registry)
+model_client = None
+if config.MODEL_SERVING_MODE == 'remote':
+    # The transformer models live in the shared model server process
+    model_client = ModelClient(config.MODEL_SERVER_SOCKET, timeout=config.MODEL_SERVER_TIMEOUT)
+    context_classifier = RemoteContextClassifier(model_client)
+    ai_engine = RemoteAIEngine(model_client)
+else:
+    context_classifier = ContextClassifier(config)
+    ai_engine = AIEngine()
 knowledge_base = KnowledgeBase()
+journal_features = JournalFeatureExtractor()
+keyword_index = KeywordIndex()
+
+# Models are loaded and warmed in the background; requests that arrive
+# before the classifier is ready get its degraded path instead of blocking
+model_warmup = ModelWarmup()
+model_warmup.register('context_classifier', context_classifier.warmup)
+model_warmup.register('ai_engine', ai_engine.warmup)
+model_warmup.register('ml_predictor', lambda: model_registry.default.warmup())
 
 
 # Helper function to convert numpy types to Python types
@@ -156,24 +191,83 @@ def get_current_user(current_user):
 # Initialize database and load models
 with app.app_context():
     db.create_all()
+    ensure_schema()
     print("✅ Database initialized")
     
     # Try to load existing models, otherwise will train on first use
-    ml_predictor.load_models()
+    model_registry.default.load_models()
+
+# Flask's debug reloader runs this module in a watcher process that never
+# serves requests, so only warm models where requests are actually handled
+if config.MODEL_WARMUP_ENABLED and not (
+    __name__ == '__main__' and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'
+):
+    model_warmup.start()
+
+
+if config.CLASSIFIER_SERVER_TIMING:
+    @app.before_request
+    def start_server_timing():
+        begin_request_timing()
+
+    @app.after_request
+    def add_server_timing(response):
+        timings = end_request_timing()
+        if timings:
+            response.headers['Server-Timing'] = server_timing_header(timings)
+        return response
 
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
-        'status': 'healthy',
+    server_health = None
+    if model_client is not None:
+        server_health = model_client.ping()
+        # Remote models' warm-up only pinged the server once; the live answer
+        # is their current readiness
+        for name in ('context_classifier', 'ai_engine'):
+            model_warmup.record(name, server_health is not None, error='model server unreachable')
+    warmup_status = model_warmup.status()
+    
+    response = {
+        'status': 'healthy' if warmup_status['state'] in ('ready', 'not_started') else warmup_status['state'],
         'timestamp': datetime.utcnow().isoformat() + 'Z',
         'services': {
             'database': 'connected',
-            'ml_models': 'loaded' if ml_predictor.is_trained else 'not_loaded',
+            'ml_models': 'loaded' if model_registry.default.is_trained else 'not_loaded',
             'ai_engine': 'ready'
-        }
-    })
+        },
+        'models': warmup_status['models'],
+        'process_rss_mb': warmup_status['process_rss_mb'],
+        'ml_training': ml_training.status(),
+        'ml_registry': model_registry.stats()
+    }
+    
+    if model_client is not None:
+        response['model_server'] = server_health or {'status': 'unreachable'}
+        if server_health is None:
+            response['status'] = 'degraded'
+        elif server_health['status'] != 'healthy':
+            response['status'] = server_health['status']
+    else:
+        response['classifier'] = context_classifier.readiness()
+        response['classifier_cache'] = context_classifier.cache.stats()
+        if response['classifier']['state'] == 'failed':
+            response['status'] = 'degraded'
+    
+    return jsonify(response)
+
+
+@app.route('/api/metrics/classifier', methods=['GET'])
+def classifier_metrics():
+    """Per-stage classifier latency histograms and hit rates"""
+    try:
+        if model_client is not None:
+            return jsonify(model_client.call('classifier_metrics'))
+        return jsonify(context_classifier.metrics.snapshot())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 503
 
 
 @app.route('/api/analyze-journal', methods=['POST'])
@@ -190,34 +284,17 @@ def analyze_journal(current_user):
         # Classify context
         classification = context_classifier.classify(text)
         
-        # Return sentiment-based metrics
-        sentiment = classification['sentiment']
-        
-        # Extract sleep hours from text if mentioned
-        sleep_hours = 7  # default
-        import re
-        # Look for patterns like "2 hours", "slept 3 hours", "only 4 hours of sleep", etc.
-        sleep_patterns = [
-            r'(\d+)\s*(?:hours?|hrs?)\s*(?:of\s+)?sleep',
-            r'slept?\s+(?:for\s+)?(\d+)\s*(?:hours?|hrs?)',
-            r'(?:only|just)\s+(\d+)\s*(?:hours?|hrs?)',
-            r'(\d+)\s*(?:hours?|hrs?)\s+(?:last\s+)?night'
-        ]
-        
-        text_lower = text.lower()
-        for pattern in sleep_patterns:
-            match = re.search(pattern, text_lower)
-            if match:
-                extracted_hours = int(match.group(1))
-                if 0 <= extracted_hours <= 24:  # Sanity check
-                    sleep_hours = extracted_hours
-                    break
+        # Metrics suggested by the journal: sentiment for mood, explicit cues
+        # (sleep hours, energy and stress words) for the rest
+        features = journal_features.extract(text)
+        metrics = journal_features.estimate_metrics(features, classification['sentiment'])
+        
+        # Keywords weighted against what this user usually writes about
+        classification = {**classification, 'keywords': keyword_index.keywords(current_user.id, text)}
         
         return jsonify({
-            'mood': sentiment['mood_score'],
-            'energy': 3,
-            'stress': 5 - sentiment['mood_score'] if sentiment['mood_score'] < 3 else 2,
-            'sleep': sleep_hours,
+            **metrics,
+            'features': features,
             'classification': classification
         })
         
@@ -239,28 +316,31 @@ def create_daily_log(current_user):
         if not is_valid:
             return jsonify({'error': error_msg}), 400
         
-        # Get journal text and classify context
+        # Get journal text, classify context and extract its signals
         journal_text = data.get('text', '')
         classification = None
+        features = None
         
         if journal_text:
             classification = context_classifier.classify(journal_text)
+            features = journal_features.extract(journal_text)
         
-        # Predict mode and capacity
-        mode_prediction = ml_predictor.predict_mode(
-            data['mood'], data['energy'], data['stress'], data['sleep']
-        )
-        
-        capacity = ml_predictor.predict_capacity(
-            data['mood'], data['energy'], data['stress'], data['sleep']
-        )
+        # Predict mode and capacity with one model snapshot; the user's own
+        # model (if any) also decides how to update it below
+        own_predictor = model_registry.get_own(current_user.id)
+        ml_predictor = own_predictor or model_registry.default
+        mode_prediction = ml_predictor.predict_batch(
+            [(data['mood'], data['energy'], data['stress'], data['sleep'])]
+        )[0]
+        capacity = mode_prediction['capacity']
         
         # Generate AI plan
         category = classification['category'] if classification else 'General Productivity'
         urgency = classification['urgency'] if classification else 'low'
         sentiment = classification['sentiment'] if classification else None
+        group = classification.get('group') if classification else 'general'
         
-        plan = ai_engine.generate_plan(category, urgency, mode_prediction['mode'], sentiment)
+        plan = ai_engine.generate_plan(category, urgency, mode_prediction['mode'], sentiment, group)
         
         # Create database entry
         log = DailyLog(
@@ -271,6 +351,7 @@ def create_daily_log(current_user):
             journal_text=journal_text,
             detected_context=category,
             context_confidence=classification['confidence'] if classification else None,
+            context_model_version=classification.get('model_version') if classification else None,
             plan_schedule=plan['schedule'],
             plan_environment=plan['environment'],
             plan_nutrition=plan['nutrition'],
@@ -280,6 +361,18 @@ def create_daily_log(current_user):
         db.session.add(log)
         db.session.commit()
         
+        # Index the journal in its own transaction, so an indexing failure
+        # can't roll back the user's entry
+        keywords = []
+        if journal_text:
+            try:
+                keyword_index.add_document(current_user.id, journal_text, datetime.utcnow().date(), log_id=log.id)
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                print(f"⚠️ Could not index journal {log.id} for keywords: {e}")
+            keywords = keyword_index.keywords(current_user.id, journal_text)
+        
         # Fetch knowledge base insights
         insights = knowledge_base.fetch_insights(category)
         resources = knowledge_base.get_related_resources(category)
@@ -287,21 +380,51 @@ def create_daily_log(current_user):
         # Check for safety concerns
         safety_response = None
         if classification and urgency == 'critical':
-            safety_response = context_classifier.get_safety_response(category, urgency)
-        
-        # Train ML model if we have enough data
-        logs_count = DailyLog.query.filter_by(user_id=current_user.id).count()
-        if logs_count == 50 or logs_count % 100 == 0:
-            print(f"🔄 Retraining ML models for user {current_user.id} with {logs_count} data points...")
-            historical_logs = DailyLog.query.filter_by(user_id=current_user.id).all()
-            import pandas as pd
-            training_data = pd.DataFrame([{
-                'mood': log.mood,
-                'energy': log.energy,
-                'stress': log.stress,
-                'sleep': log.sleep
-            } for log in historical_logs])
-            ml_predictor.train_models(training_data)
+            safety_response = classification.get('safety_response') or \
+                context_classifier.get_safety_response(category, urgency)
+        
+        # Update the user's ML models in the background as logs accumulate:
+        # incrementally from the logs their model hasn't seen yet once they
+        # have one, from their whole history until then
+        import pandas as pd
+        if config.ML_INCREMENTAL_ENABLED and own_predictor is not None and own_predictor.last_log_id is not None:
+            new_logs = DailyLog.query.filter(
+                DailyLog.user_id == current_user.id,
+                DailyLog.id > own_predictor.last_log_id
+            ).order_by(DailyLog.id).all()
+            if len(new_logs) >= config.ML_INCREMENTAL_MIN_LOGS:
+                print(f"🔄 Queueing incremental ML update for user {current_user.id} with {len(new_logs)} new data points...")
+                ml_training.submit(
+                    pd.DataFrame([{
+                        'id': new_log.id,
+                        'mood': new_log.mood,
+                        'energy': new_log.energy,
+                        'stress': new_log.stress,
+                        'sleep': new_log.sleep
+                    } for new_log in new_logs]),
+                    user_id=current_user.id,
+                    reason=f'user {current_user.id} has {len(new_logs)} new logs',
+                    incremental=True,
+                    last_log_id=new_logs[-1].id
+                )
+        else:
+            logs_count = DailyLog.query.filter_by(user_id=current_user.id).count()
+            if logs_count == 50 or logs_count % 100 == 0:
+                print(f"🔄 Queueing ML training for user {current_user.id} with {logs_count} data points...")
+                historical_logs = DailyLog.query.filter_by(user_id=current_user.id).order_by(DailyLog.id).all()
+                training_data = pd.DataFrame([{
+                    'id': historical_log.id,
+                    'mood': historical_log.mood,
+                    'energy': historical_log.energy,
+                    'stress': historical_log.stress,
+                    'sleep': historical_log.sleep
+                } for historical_log in historical_logs])
+                ml_training.submit(
+                    training_data,
+                    user_id=current_user.id,
+                    reason=f'user {current_user.id} reached {logs_count} logs',
+                    last_log_id=historical_logs[-1].id
+                )
         
         response = {
             'message': 'Log saved successfully',
@@ -318,9 +441,11 @@ def create_daily_log(current_user):
             },
             'context': {
                 'category': category,
+                'group': group,
                 'confidence': float(classification['confidence']) if classification else None,
                 'urgency': urgency,
-                'keywords': classification['keywords'] if classification else []
+                'keywords': keywords,
+                'features': features
             },
             'web_insights': [{
                 'title': insight['title'],
@@ -373,7 +498,7 @@ def analyze_decision(current_user):
         
         # Calculate capacity (handle no data case)
         if logs_data:
-            capacity_analysis = ml_predictor.calculate_decision_capacity(logs_data)
+            capacity_analysis = model_registry.get(current_user.id).calculate_decision_capacity(logs_data)
         else:
             capacity_analysis = {
                 'capacity': 50,
@@ -490,6 +615,56 @@ def analyze_decision(current_user):
         return jsonify({'error': str(e), 'details': traceback.format_exc()}), 500
 
 
+@app.route('/api/themes', methods=['GET'])
+@token_required
+def get_themes(current_user):
+    """Top journal themes over the last N days"""
+    try:
+        days = request.args.get('days', 7, type=int)
+        limit = request.args.get('limit', 10, type=int)
+        
+        if days < 1 or limit < 1:
+            return jsonify({'error': 'days and limit must be positive'}), 400
+        
+        return jsonify({
+            'days': days,
+            'themes': keyword_index.top_themes(current_user.id, days=days, top_k=limit)
+        })
+        
+    except Exception as e:
+        print(f"Error in get_themes: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/predictions', methods=['POST'])
+@token_required
+def predict_scenarios(current_user):
+    """Capacity and mode for up to 100 what-if metric combinations"""
+    try:
+        scenarios = (request.json or {}).get('scenarios')
+        if not isinstance(scenarios, list) or not scenarios:
+            return jsonify({'error': 'scenarios must be a non-empty list'}), 400
+        if len(scenarios) > 100:
+            return jsonify({'error': 'At most 100 scenarios per request'}), 400
+        
+        for i, scenario in enumerate(scenarios):
+            is_valid, error_msg = validate_metrics(scenario) if isinstance(scenario, dict) else (False, 'must be an object')
+            if not is_valid:
+                return jsonify({'error': f'Scenario {i}: {error_msg}'}), 400
+        
+        predictions = model_registry.get(current_user.id).predict_batch(
+            [(s['mood'], s['energy'], s['stress'], s['sleep']) for s in scenarios]
+        )
+        
+        return jsonify({'predictions': convert_to_serializable(predictions)})
+        
+    except Exception as e:
+        print(f"Error in predict_scenarios: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/history', methods=['GET'])
 @token_required
 def get_history(current_user):
@@ -541,7 +716,7 @@ def get_analytics(current_user):
         } for log in logs]
         
         # Get trend analysis
-        trends = ml_predictor.analyze_trends(logs_data)
+        trends = model_registry.get(current_user.id).analyze_trends(logs_data)
         
         # Generate AI insights
         insights = ai_engine.generate_insights(
@@ -609,32 +784,28 @@ def get_advanced_analytics(current_user):
                 'message': 'No data available for advanced analysis'
             })
         
-        # Prepare data for analysis
-        logs_data = [{
-            'mood': log.mood,
-            'energy': log.energy,
-            'stress': log.stress,
-            'sleep': log.sleep,
-            'timestamp': log.timestamp.isoformat() + 'Z'
-        } for log in logs]
+        # Columnar data for analysis, shared by every analysis below
+        frame = AnalyticsFrame.from_logs(logs)
+        
+        ml_predictor = model_registry.get(current_user.id)
         
         # Calculate health score
-        health_score = ml_predictor.calculate_health_score(logs_data)
+        health_score = ml_predictor.calculate_health_score(frame)
         
         # Detect correlations
-        correlations = ml_predictor.detect_correlations(logs_data)
+        correlations = ml_predictor.detect_correlations(frame)
         
         # Forecast next 7 days
-        forecast = ml_predictor.forecast_metrics(logs_data, days=7)
+        forecast = ml_predictor.forecast_metrics(frame, days=7)
         
         # Detect anomalies
-        anomalies = ml_predictor.detect_anomalies(logs_data)
+        anomalies = ml_predictor.detect_anomalies(frame)
         
         # Detect cycles
-        cycles = ml_predictor.detect_cycles(logs_data)
+        cycles = ml_predictor.detect_cycles(frame)
         
         # Get basic trend analysis
-        trends = ml_predictor.analyze_trends(logs_data)
+        trends = ml_predictor.analyze_trends(frame)
         
         # Generate AI insights
         ai_insights = ai_engine.generate_analytics_insights(
@@ -652,7 +823,7 @@ def get_advanced_analytics(current_user):
         )
         
         # Generate weekly summary
-        weekly_summary = ai_engine.generate_weekly_summary(logs_data, trends)
+        weekly_summary = ai_engine.generate_weekly_summary(frame, trends)
         
         response = {
             'status': 'success',
@@ -717,16 +888,9 @@ def internal_error(error):
 
 
 if __name__ == '__main__':
-    # Initialize AI services on startup
-    print("🚀 Initializing MindMesh AI Engine...")
-    try:
-        context_classifier.initialize()
-        ai_engine.initialize()
-        ml_predictor.train_models()
-        print("✅ All systems ready!")
-    except Exception as e:
-        print(f"⚠️ Warning: Some AI services failed to initialize: {e}")
-        print("The application will continue but some features may be limited.")
+    # AI services warm up in the background (see model_warmup above);
+    # /api/health reports their progress
+    print("🚀 Starting MindMesh API...")
     
     # Run the app on port 5001
     app.run(debug=True, port=5001, host='0.0.0.0')
\ No newline at end of file
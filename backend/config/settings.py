@@ -18,12 +18,130 @@ class Config:
     AI_MODELS = {
         'classifier': 'valhalla/distilbart-mnli-12-1',
         'generator': 'distilgpt2',
-        'sentiment': 'vader'
+        'sentiment': 'vader',
+        'embedder': 'sentence-transformers/all-MiniLM-L6-v2'
     }
     
+    AI_MODEL_CACHE_DIR = os.environ.get('AI_MODEL_CACHE_DIR', './models')
+    # Load and warm every model on a background thread at app start-up
+    MODEL_WARMUP_ENABLED = os.environ.get('MODEL_WARMUP_ENABLED', 'True').lower() == 'true'
+    # While warm-up runs, classifications get a degraded keyword answer; if it
+    # failed or never started they load the models themselves, retrying a
+    # failed load at most every CLASSIFIER_INIT_RETRY_SECONDS
+    CLASSIFIER_INIT_RETRY_SECONDS = float(os.environ.get('CLASSIFIER_INIT_RETRY_SECONDS', 30))
+    
+    # 'inprocess' loads the models in every web worker; 'remote' forwards
+    # classification and plan generation to one shared model server process
+    # (python -m services.model_server) over a Unix socket
+    MODEL_SERVING_MODE = os.environ.get('MODEL_SERVING_MODE', 'inprocess')
+    MODEL_SERVER_SOCKET = os.environ.get('MODEL_SERVER_SOCKET', '/tmp/mindmesh-models.sock')
+    MODEL_SERVER_TIMEOUT = float(os.environ.get('MODEL_SERVER_TIMEOUT', 30))
+    MODEL_SERVER_WORKERS = int(os.environ.get('MODEL_SERVER_WORKERS', 8))
+    
+    # Context Classifier Configuration
+    # 'full' scores every label with the NLI model; 'shortlist' ranks labels by
+    # embedding similarity first and only scores the top K with the NLI model;
+    # 'hierarchical' scores the taxonomy groups first, then only the labels
+    # inside the best groups. Both cheaper strategies also score the critical
+    # categories every time, but can still miss a label the NLI model would
+    # pick, so 'full' stays the default (see
+    # scripts/compare_classifier_strategies.py)
+    CLASSIFIER_STRATEGY = os.environ.get('CLASSIFIER_STRATEGY', 'full')
+    CLASSIFIER_SHORTLIST_K = int(os.environ.get('CLASSIFIER_SHORTLIST_K', 10))
+    CLASSIFIER_HIERARCHY_TOP_GROUPS = int(os.environ.get('CLASSIFIER_HIERARCHY_TOP_GROUPS', 2))
+    # Runner-up groups are only expanded when their group score reaches this
+    CLASSIFIER_HIERARCHY_MIN_GROUP_SCORE = float(os.environ.get('CLASSIFIER_HIERARCHY_MIN_GROUP_SCORE', 0.15))
+    # NLI backend: 'torch' (transformers pipeline) or 'onnx' (int8 quantized
+    # ONNX Runtime model, exported once into AI_MODEL_CACHE_DIR)
+    CLASSIFIER_BACKEND = os.environ.get('CLASSIFIER_BACKEND', 'torch')
+    # ONNX Runtime intra-op threads per process; 0 uses half the CPU cores
+    CLASSIFIER_ONNX_THREADS = int(os.environ.get('CLASSIFIER_ONNX_THREADS', 0))
+    # Premise/hypothesis pairs per NLI forward pass
+    CLASSIFIER_NLI_BATCH_SIZE = int(os.environ.get('CLASSIFIER_NLI_BATCH_SIZE', 32))
+    # Journals longer than CLASSIFIER_CHUNK_TOKENS are split into overlapping
+    # token windows, scored in one batch and aggregated ('max' or 'mean');
+    # tokens beyond CLASSIFIER_MAX_TOKENS per journal are not scored at all
+    CLASSIFIER_CHUNKING_ENABLED = os.environ.get('CLASSIFIER_CHUNKING_ENABLED', 'True').lower() == 'true'
+    CLASSIFIER_CHUNK_TOKENS = int(os.environ.get('CLASSIFIER_CHUNK_TOKENS', 256))
+    CLASSIFIER_CHUNK_OVERLAP = int(os.environ.get('CLASSIFIER_CHUNK_OVERLAP', 32))
+    CLASSIFIER_CHUNK_AGGREGATION = os.environ.get('CLASSIFIER_CHUNK_AGGREGATION', 'max')
+    CLASSIFIER_MAX_TOKENS = int(os.environ.get('CLASSIFIER_MAX_TOKENS', 1024))
+    # Cross-request micro-batching: requests arriving within the window are
+    # scored together, up to CLASSIFIER_MAX_BATCH journals per batch
+    CLASSIFIER_BATCHING_ENABLED = os.environ.get('CLASSIFIER_BATCHING_ENABLED', 'True').lower() == 'true'
+    CLASSIFIER_BATCH_WINDOW_MS = float(os.environ.get('CLASSIFIER_BATCH_WINDOW_MS', 10))
+    CLASSIFIER_MAX_BATCH = int(os.environ.get('CLASSIFIER_MAX_BATCH', 16))
+    # Phrase-lexicon fast path for critical safety categories; matches at or
+    # above the confidence skip the model, which re-checks them in background
+    SAFETY_FAST_PATH_ENABLED = os.environ.get('SAFETY_FAST_PATH_ENABLED', 'True').lower() == 'true'
+    SAFETY_FAST_PATH_MIN_CONFIDENCE = float(os.environ.get('SAFETY_FAST_PATH_MIN_CONFIDENCE', 0.85))
+    SAFETY_REFINE_ASYNC = os.environ.get('SAFETY_REFINE_ASYNC', 'True').lower() == 'true'
+    # Distilled student (scripts/train_student.py) answers journals it is at
+    # least this confident about; the NLI teacher handles the rest and its
+    # answers are appended to CLASSIFIER_TEACHER_LOG. The log holds raw journal
+    # text, so it is off unless a path is set; it rotates at
+    # CLASSIFIER_TEACHER_LOG_MAX_MB, keeping one previous file
+    CLASSIFIER_STUDENT_ENABLED = os.environ.get('CLASSIFIER_STUDENT_ENABLED', 'True').lower() == 'true'
+    CLASSIFIER_STUDENT_PATH = os.environ.get('CLASSIFIER_STUDENT_PATH', './models/context_student.pkl')
+    CLASSIFIER_STUDENT_MIN_CONFIDENCE = float(os.environ.get('CLASSIFIER_STUDENT_MIN_CONFIDENCE', 0.8))
+    CLASSIFIER_TEACHER_LOG = os.environ.get('CLASSIFIER_TEACHER_LOG', '')
+    CLASSIFIER_TEACHER_LOG_MAX_MB = float(os.environ.get('CLASSIFIER_TEACHER_LOG_MAX_MB', 50))
+    # Per-stage latency histograms (/api/metrics/classifier); Server-Timing
+    # additionally reports the stages of each request in a response header
+    CLASSIFIER_METRICS_ENABLED = os.environ.get('CLASSIFIER_METRICS_ENABLED', 'True').lower() == 'true'
+    CLASSIFIER_SERVER_TIMING = os.environ.get('CLASSIFIER_SERVER_TIMING', 'False').lower() == 'true'
+    # Classification result cache (entries, seconds); size 0 disables it
+    CLASSIFIER_CACHE_SIZE = int(os.environ.get('CLASSIFIER_CACHE_SIZE', 1024))
+    CLASSIFIER_CACHE_TTL = int(os.environ.get('CLASSIFIER_CACHE_TTL', 600))
+    
     # ML Configuration
     ML_RANDOM_STATE = 42
     ML_TRAINING_SAMPLES = 1000
+    # Capacity/mode model family (services/training_pipeline.MODEL_FAMILIES:
+    # gradient_boosting, hist_gradient_boosting, random_forest, extra_trees)
+    # and training parallelism (-1 = all cores)
+    ML_MODEL_FAMILY = os.environ.get('ML_MODEL_FAMILY', 'gradient_boosting')
+    ML_TRAINING_JOBS = int(os.environ.get('ML_TRAINING_JOBS', 1))
+    # Capacity/mode predictions precomputed over a grid of inputs after
+    # training (step on the 1-5 scales, step in sleep hours); lookups
+    # interpolate instead of running the models. Approximate (at the default
+    # steps capacity MAE ~0.5 and up to ~4 points off, mode probabilities in
+    # 1/255 steps, ~3% of modes flipped near boundaries; see
+    # scripts/benchmark_prediction_grid.py), so off by default: the exact
+    # flattened trees (ML_FLAT_TREES_ENABLED) serve small batches instead
+    ML_PREDICTION_GRID_ENABLED = os.environ.get('ML_PREDICTION_GRID_ENABLED', 'False').lower() == 'true'
+    ML_GRID_METRIC_STEP = float(os.environ.get('ML_GRID_METRIC_STEP', 0.25))
+    ML_GRID_SLEEP_STEP = float(os.environ.get('ML_GRID_SLEEP_STEP', 0.5))
+    # Without the grid, small batches walk both ensembles as flat numpy
+    # arrays instead of through sklearn's per-call overhead (same results)
+    ML_FLAT_TREES_ENABLED = os.environ.get('ML_FLAT_TREES_ENABLED', 'True').lower() == 'true'
+    # Shared models are saved as content-hashed artifacts under ML_ARTIFACT_DIR
+    # and memory-mapped on load, so worker processes predict from the same
+    # page-cache copy of the flattened trees' arrays
+    ML_ARTIFACT_DIR = os.environ.get('ML_ARTIFACT_DIR', './models/ml')
+    ML_ARTIFACT_MMAP = os.environ.get('ML_ARTIFACT_MMAP', 'True').lower() == 'true'
+    # Per-user models: versioned artifacts under ML_REGISTRY_DIR, at most
+    # ML_REGISTRY_MAX_MODELS / ML_REGISTRY_MAX_MEMORY_MB of them in memory;
+    # cached models re-check for a newer version every refresh interval
+    ML_REGISTRY_DIR = os.environ.get('ML_REGISTRY_DIR', './models/users')
+    ML_REGISTRY_MAX_MODELS = int(os.environ.get('ML_REGISTRY_MAX_MODELS', 1000))
+    ML_REGISTRY_MAX_MEMORY_MB = int(os.environ.get('ML_REGISTRY_MAX_MEMORY_MB', 512))
+    ML_REGISTRY_REFRESH_SECONDS = float(os.environ.get('ML_REGISTRY_REFRESH_SECONDS', 30))
+    # Once a user has a model, every ML_INCREMENTAL_MIN_LOGS new logs update it
+    # incrementally: each ensemble gains ML_INCREMENTAL_TREES trees fitted on
+    # the new logs plus ML_REPLAY_SAMPLE rows from a replay buffer holding a
+    # uniform sample of ML_REPLAY_BUFFER_SIZE past observations
+    ML_INCREMENTAL_ENABLED = os.environ.get('ML_INCREMENTAL_ENABLED', 'True').lower() == 'true'
+    ML_INCREMENTAL_MIN_LOGS = int(os.environ.get('ML_INCREMENTAL_MIN_LOGS', 10))
+    ML_INCREMENTAL_TREES = int(os.environ.get('ML_INCREMENTAL_TREES', 10))
+    ML_MAX_BOOSTING_STAGES = int(os.environ.get('ML_MAX_BOOSTING_STAGES', 300))
+    ML_REPLAY_BUFFER_SIZE = int(os.environ.get('ML_REPLAY_BUFFER_SIZE', 500))
+    ML_REPLAY_SAMPLE = int(os.environ.get('ML_REPLAY_SAMPLE', 200))
+    # Anomaly detector for advanced analytics: zscore (against the mean of all
+    # logs), mad (against the median, robust to outliers) or rolling (against
+    # the ML_ANOMALY_WINDOW logs before each one)
+    ML_ANOMALY_METHOD = os.environ.get('ML_ANOMALY_METHOD', 'zscore')
+    ML_ANOMALY_WINDOW = int(os.environ.get('ML_ANOMALY_WINDOW', 14))
     
     # Cache Configuration
     CACHE_TYPE = 'simple'
@@ -1,3 +1,8 @@
-from .database import db, DailyLog, Decision, Pattern, Insight
+from .database import (
+    db, DailyLog, Decision, Pattern, Insight, KeywordTerm, KeywordDaily, KeywordIndexStats, ensure_schema
+)
 
-__all__ = ['db', 'DailyLog', 'Decision', 'Pattern', 'Insight']
\ No newline at end of file
+__all__ = [
+    'db', 'DailyLog', 'Decision', 'Pattern', 'Insight', 'KeywordTerm', 'KeywordDaily',
+    'KeywordIndexStats', 'ensure_schema'
+]
\ No newline at end of file
@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
 from datetime import datetime
 import json
 
@@ -47,6 +48,7 @@ class DailyLog(db.Model):
     journal_text = db.Column(db.Text, nullable=True)
     detected_context = db.Column(db.String(200), nullable=True)
     context_confidence = db.Column(db.Float, nullable=True)
+    context_model_version = db.Column(db.String(100), nullable=True)
     
     # Generated Plan
     plan_schedule = db.Column(db.Text, nullable=True)
@@ -71,6 +73,7 @@ class DailyLog(db.Model):
             'journal_text': self.journal_text,
             'detected_context': self.detected_context,
             'context_confidence': self.context_confidence,
+            'context_model_version': self.context_model_version,
             'plan': {
                 'schedule': self.plan_schedule,
                 'environment': self.plan_environment,
@@ -217,4 +220,55 @@ class Insight(db.Model):
             'is_read': self.is_read,
             'is_dismissed': self.is_dismissed,
             'user_feedback': self.user_feedback
-        }
\ No newline at end of file
+        }
+
+class KeywordTerm(db.Model):
+    """Per-user document frequency of a journal term"""
+    __tablename__ = 'keyword_terms'
+    __table_args__ = (db.UniqueConstraint('user_id', 'term', name='uq_keyword_terms_user_term'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    term = db.Column(db.String(64), nullable=False)
+    doc_freq = db.Column(db.Integer, nullable=False, default=0)
+
+class KeywordDaily(db.Model):
+    """How often a user wrote a term on one day, for theme queries"""
+    __tablename__ = 'keyword_daily'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'day', 'term', name='uq_keyword_daily_user_day_term'),
+        db.Index('ix_keyword_daily_user_day', 'user_id', 'day')
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    term = db.Column(db.String(64), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class KeywordIndexStats(db.Model):
+    """Number of journals in a user's keyword index"""
+    __tablename__ = 'keyword_index_stats'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    doc_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Columns added after the first release. db.create_all() only creates missing
+# tables, so existing databases get these through ensure_schema().
+ADDED_COLUMNS = {
+    'daily_logs': [
+        ('context_model_version', 'VARCHAR(100)')
+    ]
+}
+
+def ensure_schema():
+    """Add any ADDED_COLUMNS missing from existing tables"""
+    inspector = inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name, column_type in columns:
+                if name not in existing:
+                    connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}'))
+                    print(f"✅ Added column {table}.{name}")
@@ -0,0 +1,90 @@
+"""CPU time of the advanced analytics computations per request
+
+Runs the analyses behind /api/analytics/advanced (health score,
+correlations, forecast, anomalies, cycles, trends and weekly summary) over
+generated daily logs, once passing the list of log dicts each method turns
+into its own DataFrame and once passing one AnalyticsFrame built straight
+from the rows, and checks both give the same results.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_analytics_frame --days 365
+"""
+import argparse
+from datetime import datetime, timedelta
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from services.ai_engine import AIEngine
+from services.analytics_frame import AnalyticsFrame
+from services.ml_predictor import MLPredictor
+
+
+def generated_logs(days, seed=0):
+    """DailyLog-like rows, one per day"""
+    rng = np.random.default_rng(seed)
+    start = datetime.utcnow() - timedelta(days=days)
+    return [SimpleNamespace(
+        mood=float(rng.integers(1, 6)),
+        energy=float(rng.integers(1, 6)),
+        stress=float(rng.integers(1, 6)),
+        sleep=float(np.round(rng.uniform(4, 10), 1)),
+        timestamp=start + timedelta(days=day, seconds=int(rng.integers(0, 36000)))
+    ) for day in range(days)]
+
+
+def as_records(logs):
+    return [{
+        'mood': log.mood,
+        'energy': log.energy,
+        'stress': log.stress,
+        'sleep': log.sleep,
+        'timestamp': log.timestamp.isoformat() + 'Z'
+    } for log in logs]
+
+
+def analyze(predictor, ai_engine, data):
+    trends = predictor.analyze_trends(data)
+    return {
+        'health_score': predictor.calculate_health_score(data),
+        'correlations': predictor.detect_correlations(data),
+        'forecast': predictor.forecast_metrics(data, days=7),
+        'anomalies': predictor.detect_anomalies(data),
+        'cycles': predictor.detect_cycles(data),
+        'trends': trends,
+        'weekly_summary': ai_engine.generate_weekly_summary(data, trends)
+    }
+
+
+def cpu_ms(run, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        run()
+    return (time.process_time() - start) / iterations * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, nargs='+', default=[30, 90, 365], help='days of history')
+    parser.add_argument('--iterations', type=int, default=50, help='requests per measurement')
+    args = parser.parse_args()
+
+    predictor = MLPredictor()
+    predictor.train_models()
+    ai_engine = AIEngine()
+
+    print(f"\n{'days':>6}{'dicts ms':>10}{'frame ms':>10}{'speedup':>9}  same results")
+    for days in args.days:
+        logs = generated_logs(days)
+        records_result = analyze(predictor, ai_engine, as_records(logs))
+        frame_result = analyze(predictor, ai_engine, AnalyticsFrame.from_logs(logs))
+
+        records_ms = cpu_ms(lambda: analyze(predictor, ai_engine, as_records(logs)), args.iterations)
+        frame_ms = cpu_ms(lambda: analyze(predictor, ai_engine, AnalyticsFrame.from_logs(logs)), args.iterations)
+        print(f"{days:>6}{records_ms:>10.2f}{frame_ms:>10.2f}{records_ms / frame_ms:>8.1f}x  "
+              f"{'yes' if repr(records_result) == repr(frame_result) else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
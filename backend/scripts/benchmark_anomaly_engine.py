@@ -0,0 +1,99 @@
+"""CPU time of anomaly detection per user, alone and in batches of users
+
+Runs each AnomalyEngine detector (zscore, mad, rolling) over generated
+daily logs with a few injected spikes and drops, next to the per-value loop
+MLPredictor.detect_anomalies used before, and checks the zscore detector
+finds the same anomalies. Then scores many users' histories one at a time
+and in one detect_many call, as a batch job would.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_anomaly_engine --rows 30 365 3650 --users 1000
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from scripts.benchmark_analytics_frame import as_records, cpu_ms, generated_logs
+from services.analytics_frame import METRICS, AnalyticsFrame
+from services.anomaly_engine import AnomalyEngine
+
+
+def logs_with_anomalies(rows, seed=0):
+    """Generated logs with about 2% of metric values pushed to an extreme"""
+    logs = generated_logs(rows, seed)
+    rng = np.random.default_rng(seed + 1)
+    for index in rng.choice(rows, max(1, rows // 50), replace=False).tolist():
+        metric = METRICS[int(rng.integers(len(METRICS)))]
+        extreme = {'sleep': (0.0, 16.0)}.get(metric, (-4.0, 10.0))
+        setattr(logs[index], metric, extreme[int(rng.integers(2))])
+    return logs
+
+
+def per_value_loop(logs_data):
+    """Anomalies as MLPredictor.detect_anomalies found them before, unsorted and untruncated"""
+    df = pd.DataFrame(logs_data)
+    anomalies = []
+    for metric in ['mood', 'energy', 'stress', 'sleep']:
+        values = df[metric].values
+        mean = np.mean(values)
+        std = np.std(values)
+        for i, value in enumerate(values):
+            z_score = abs((value - mean) / std) if std > 0 else 0
+            if z_score > 2:
+                anomaly_type = 'spike' if value > mean else 'drop'
+                anomalies.append({
+                    'metric': metric,
+                    'type': anomaly_type,
+                    'value': round(value, 2),
+                    'expected_range': f"{round(mean - std, 2)} - {round(mean + std, 2)}",
+                    'severity': 'high' if z_score > 3 else 'medium',
+                    'date': df.iloc[i].get('timestamp', f'Entry {i+1}'),
+                    'z_score': round(z_score, 2),
+                    'message': f"Unusual {anomaly_type} in {metric}: {value:.1f} (normal range: {mean-std:.1f}-{mean+std:.1f})"
+                })
+    return anomalies
+
+
+def same_anomalies(expected, found):
+    def key(anomaly):
+        return anomaly['metric'], anomaly['date']
+    return repr(sorted(expected, key=key)) == repr(sorted(found, key=key))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[30, 365, 3650], help='days of history per user')
+    parser.add_argument('--users', type=int, default=1000, help='users per batch')
+    parser.add_argument('--batch-rows', type=int, default=365, help='days of history per user in batches')
+    parser.add_argument('--window', type=int, default=14, help='rolling detector window')
+    parser.add_argument('--iterations', type=int, default=20, help='runs per measurement')
+    args = parser.parse_args()
+
+    engines = {method: AnomalyEngine(method, window=args.window) for method in AnomalyEngine.METHODS}
+
+    # The frame is built once per analytics request and shared, so it is timed apart
+    print(f"\n{'rows':>6}{'loop ms':>10}{'frame ms':>10}" + ''.join(f"{method + ' ms':>12}" for method in engines)
+          + f"{'speedup':>9}  same anomalies")
+    for rows in args.rows:
+        records = as_records(logs_with_anomalies(rows))
+        frame = AnalyticsFrame.of(records)
+        loop_ms = cpu_ms(lambda: per_value_loop(records), args.iterations)
+        frame_ms = cpu_ms(lambda: AnalyticsFrame.of(records), args.iterations)
+        engine_ms = {method: cpu_ms(lambda: engine.detect(frame), args.iterations) for method, engine in engines.items()}
+        same = same_anomalies(per_value_loop(records), AnomalyEngine(limit=None).detect(frame))
+        print(f"{rows:>6}{loop_ms:>10.2f}{frame_ms:>10.2f}" + ''.join(f"{engine_ms[method]:>12.3f}" for method in engines)
+              + f"{loop_ms / engine_ms['zscore']:>8.1f}x  {'yes' if same else 'NO'}")
+
+    frames = [AnalyticsFrame.from_logs(logs_with_anomalies(args.batch_rows, seed)) for seed in range(args.users)]
+    print(f"\n{args.users} users x {args.batch_rows} rows, ms per user")
+    print(f"{'method':>10}{'one by one':>12}{'batched':>10}{'speedup':>9}  same anomalies")
+    for method, engine in engines.items():
+        single_ms = cpu_ms(lambda: [engine.detect(frame) for frame in frames], 1) / args.users
+        batch_ms = cpu_ms(lambda: engine.detect_many(frames), 1) / args.users
+        same = [engine.detect(frame) for frame in frames] == engine.detect_many(frames)
+        print(f"{method:>10}{single_ms:>12.3f}{batch_ms:>10.3f}{single_ms / batch_ms:>8.1f}x  {'yes' if same else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Measure classifier throughput and tail latency with and without micro-batching
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_classifier_batching --threads 8 --requests 200
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from config.settings import get_config
+from services.context_classifier import ContextClassifier
+from scripts.sample_journals import SAMPLE_JOURNALS
+
+
+def run(batching, threads, requests, window_ms):
+    """Fire `requests` classifications from `threads` concurrent callers"""
+    settings = type('BatchingSettings', (get_config(),), {
+        'CLASSIFIER_BATCHING_ENABLED': batching,
+        'CLASSIFIER_BATCH_WINDOW_MS': window_ms,
+        'CLASSIFIER_CACHE_SIZE': 0
+    })
+    classifier = ContextClassifier(settings)
+    classifier.initialize()
+    classifier.classify(SAMPLE_JOURNALS[0][0])
+
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            text = SAMPLE_JOURNALS[i % len(SAMPLE_JOURNALS)][0]
+            start = time.perf_counter()
+            classifier.classify(text)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    stats = classifier.batcher.stats() if classifier.batcher else {'avg_batch_size': 1.0}
+    if classifier.batcher:
+        classifier.batcher.stop()
+
+    return requests / wall, np.percentile(latencies, 99), stats['avg_batch_size']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--window-ms', type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"\n{'mode':<12}{'journals/s':>12}{'p99 ms':>10}{'avg batch':>11}")
+    for batching in (False, True):
+        throughput, p99, batch_size = run(batching, args.threads, args.requests, args.window_ms)
+        mode = 'batched' if batching else 'per-request'
+        print(f"{mode:<12}{throughput:>12.1f}{p99:>10.1f}{batch_size:>11.2f}")
+
+
+if __name__ == '__main__':
+    main()
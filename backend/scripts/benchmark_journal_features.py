@@ -0,0 +1,70 @@
+"""Microbenchmark the journal feature extractor at several journal lengths
+
+Compares the single-pass extractor with one scan per pattern for the same
+signals, and with the four sleep regexes /api/analyze-journal used to run
+per request (sleep hours only, stopping at the first match).
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_journal_features --iterations 2000
+"""
+import argparse
+import re
+import time
+
+from services.journal_features import JournalFeatureExtractor
+from scripts.sample_journals import SAMPLE_JOURNALS
+
+LEGACY_SLEEP_PATTERNS = [
+    r'(\d+)\s*(?:hours?|hrs?)\s*(?:of\s+)?sleep',
+    r'slept?\s+(?:for\s+)?(\d+)\s*(?:hours?|hrs?)',
+    r'(?:only|just)\s+(\d+)\s*(?:hours?|hrs?)',
+    r'(\d+)\s*(?:hours?|hrs?)\s+(?:last\s+)?night'
+]
+
+FILLER = (
+    " Slept 6-7 hours but still feel drained. Had two coffees and went for a run for 20 minutes;"
+    " work deadlines keep me stressed."
+)
+
+
+def legacy_sleep(text):
+    text_lower = text.lower()
+    for pattern in LEGACY_SLEEP_PATTERNS:
+        match = re.search(pattern, text_lower)
+        if match:
+            return int(match.group(1))
+    return 7
+
+
+def per_pattern_scan(patterns, text):
+    text = text.lower()
+    return [list(pattern.finditer(text)) for pattern in patterns]
+
+
+def time_per_call(fn, text, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(text)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    extractor = JournalFeatureExtractor()
+    separate = [re.compile(r"(?<![\w'])(?=\w)(?:" + part + r")\b") for part in extractor.patterns]
+    base_text = ' '.join(text for text, _ in SAMPLE_JOURNALS) + FILLER
+
+    print(f"{'chars':>8}{'extractor us':>15}{'per-pattern us':>17}{'legacy sleep us':>18}")
+    for length in (200, 1000, 5000, 10000):
+        text = (base_text * (length // len(base_text) + 1))[:length]
+        extractor_us = time_per_call(extractor.extract, text, args.iterations)
+        separate_us = time_per_call(lambda t: per_pattern_scan(separate, t), text, args.iterations)
+        legacy_us = time_per_call(legacy_sleep, text, args.iterations)
+        print(f"{length:>8}{extractor_us:>15.1f}{separate_us:>17.1f}{legacy_us:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""Cost and accuracy of each ML model family, to pick the cheapest good enough
+
+For every family in services/training_pipeline.MODEL_FAMILIES, fits the
+capacity and mode models on synthetic data like a cold start does and
+reports fit time, size on disk, one-row and per-row batch predict latency
+(sklearn, and the flattened trees where the family has them) and accuracy
+on held-out synthetic rows and on the logged days in the database (labelled
+by the same rules as training data). It then names the family with the
+fastest one-row prediction among those meeting the accuracy targets.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_model_families --jobs -1 --max-mae 2 --min-mode-accuracy 0.95
+"""
+import argparse
+import io
+import time
+import warnings
+
+from flask import Flask
+import joblib
+import numpy as np
+import pandas as pd
+
+from config.settings import get_config
+from models.database import db, DailyLog
+from services.ml_predictor import MLPredictor
+from services.training_pipeline import MODEL_FAMILIES
+
+FEATURES = ['mood', 'energy', 'stress', 'sleep']
+
+
+def synthetic_rows(predictor, samples, seed):
+    rng = np.random.default_rng(seed)
+    return predictor._label_training_data(pd.DataFrame({
+        'mood': rng.uniform(1, 5, samples),
+        'energy': rng.uniform(1, 5, samples),
+        'stress': rng.uniform(1, 5, samples),
+        'sleep': rng.uniform(4, 10, samples)
+    }))
+
+
+def logged_rows(predictor, limit):
+    """The newest logged days, labelled like training data (None without any)"""
+    app = Flask(__name__)
+    app.config.from_object(get_config())
+    db.init_app(app)
+    with app.app_context():
+        rows = (
+            db.session.query(DailyLog.mood, DailyLog.energy, DailyLog.stress, DailyLog.sleep)
+            .order_by(DailyLog.id.desc())
+            .limit(limit)
+            .all()
+        )
+    if not rows:
+        return None
+    return predictor._label_training_data(pd.DataFrame(rows, columns=FEATURES))
+
+
+def accuracy(predictor, rows):
+    if rows is None:
+        return None, None
+    predictions = predictor.predict_batch(rows[FEATURES].to_numpy())
+    capacity = np.array([prediction['capacity'] for prediction in predictions])
+    modes = np.array([prediction['mode'] for prediction in predictions])
+    return np.abs(capacity - rows['capacity'].to_numpy()).mean(), (modes == rows['recommended_mode'].to_numpy()).mean()
+
+
+def latency_us(predict, inputs, rows, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        offset = (i * rows) % (len(inputs) - rows + 1)
+        predict(inputs[offset:offset + rows])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def size_mb(predictor):
+    buffer = io.BytesIO()
+    joblib.dump((predictor.capacity_model, predictor.mode_classifier), buffer)
+    return buffer.tell() / 1e6
+
+
+def benchmark(family, settings, args, held_out, logged):
+    predictor = MLPredictor(type('FamilySettings', (settings,), {
+        'ML_MODEL_FAMILY': family,
+        'ML_TRAINING_JOBS': args.jobs,
+        'ML_PREDICTION_GRID_ENABLED': False
+    }))
+    training_data = synthetic_rows(predictor, args.samples, settings.ML_RANDOM_STATE)
+    start = time.perf_counter()
+    predictor.train_models(training_data)
+    fit_seconds = time.perf_counter() - start
+
+    def sklearn_predict(rows):
+        scaled = predictor.scaler.transform(rows)
+        return predictor.capacity_model.predict(scaled), predictor.mode_classifier.predict_proba(scaled)
+
+    inputs = held_out[FEATURES].to_numpy()
+    flat_us = None
+    if predictor.compiled is not None:
+        flat_us = latency_us(predictor.compiled.predict, inputs, 1, args.iterations * 10)
+
+    synthetic_mae, synthetic_accuracy = accuracy(predictor, held_out)
+    logged_mae, logged_accuracy = accuracy(predictor, logged)
+    return {
+        'family': family,
+        'fit_s': fit_seconds,
+        'size_mb': size_mb(predictor),
+        'row_us': latency_us(sklearn_predict, inputs, 1, args.iterations),
+        'flat_us': flat_us,
+        'batch_us': latency_us(sklearn_predict, inputs, 1000, 5) / 1000,
+        'synthetic_mae': synthetic_mae,
+        'synthetic_accuracy': synthetic_accuracy,
+        'logged_mae': logged_mae,
+        'logged_accuracy': logged_accuracy
+    }
+
+
+def meets_targets(result, args):
+    for mae, mode_accuracy in ((result['synthetic_mae'], result['synthetic_accuracy']),
+                               (result['logged_mae'], result['logged_accuracy'])):
+        if mae is not None and (mae > args.max_mae or mode_accuracy < args.min_mode_accuracy):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=1000, help='synthetic training rows')
+    parser.add_argument('--held-out', type=int, default=5000, help='held-out synthetic rows')
+    parser.add_argument('--logged', type=int, default=5000, help='newest logged days to evaluate on (0: skip)')
+    parser.add_argument('--jobs', type=int, default=1, help='training n_jobs (-1 = all cores)')
+    parser.add_argument('--iterations', type=int, default=200, help='calls per one-row latency measurement')
+    parser.add_argument('--max-mae', type=float, default=2.0, help='capacity MAE target (0-100 scale)')
+    parser.add_argument('--min-mode-accuracy', type=float, default=0.95, help='mode accuracy target')
+    parser.add_argument('--families', nargs='+', default=list(MODEL_FAMILIES), choices=list(MODEL_FAMILIES))
+    args = parser.parse_args()
+    settings = get_config()
+    # The sklearn path passes bare arrays to a scaler fitted on a DataFrame
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    labeller = MLPredictor(settings)
+    held_out = synthetic_rows(labeller, args.held_out, settings.ML_RANDOM_STATE + 1)
+    logged = logged_rows(labeller, args.logged) if args.logged else None
+    print(f"\nTraining on {args.samples} synthetic rows; evaluating on {len(held_out)} held-out synthetic "
+          f"and {len(logged) if logged is not None else 0} logged days")
+
+    results = [benchmark(family, settings, args, held_out, logged) for family in args.families]
+
+    def metric(value, spec, width=9):
+        return f"{value:>{width}{spec}}" if value is not None else f"{'-':>{width}}"
+
+    print(f"\n{'family':>24}{'fit s':>8}{'size MB':>9}{'row us':>9}{'flat us':>9}{'batch us/row':>14}"
+          f"{'syn MAE':>9}{'syn acc':>9}{'log MAE':>9}{'log acc':>9}  targets")
+    for result in results:
+        print(f"{result['family']:>24}{result['fit_s']:>8.2f}{result['size_mb']:>9.2f}{result['row_us']:>9,.0f}"
+              f"{metric(result['flat_us'], ',.0f')}{result['batch_us']:>14.1f}"
+              f"{result['synthetic_mae']:>9.2f}{result['synthetic_accuracy']:>9.3f}"
+              f"{metric(result['logged_mae'], '.2f')}{metric(result['logged_accuracy'], '.3f')}"
+              f"  {'met' if meets_targets(result, args) else 'missed'}")
+
+    eligible = [result for result in results if meets_targets(result, args)]
+    if not eligible:
+        print("\nNo family meets the accuracy targets")
+        return
+    cheapest = min(eligible, key=lambda result: (result['flat_us'] or result['row_us'], result['size_mb']))
+    print(f"\nCheapest family meeting the targets: ML_MODEL_FAMILY={cheapest['family']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Startup time and memory of worker processes getting their ML models
+
+Starts N fresh processes the way a pre-forking server does and has each one
+get ready to predict by fitting the models itself (the old cold start),
+loading the saved artifact into private memory, or memory-mapping it.
+Reports each strategy's median time to ready, RSS and PSS. PSS splits
+shared pages between the processes mapping them, so it shows what memory
+mapping saves and RSS doesn't.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_model_startup --workers 8
+"""
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+
+from config.settings import get_config
+
+STRATEGIES = ('train', 'load', 'mmap')
+
+
+def memory_mb():
+    """RSS and PSS of this process in MB, from /proc/self/smaps_rollup"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as rollup:
+        for line in rollup:
+            fields = line.split()
+            if fields[0] in ('Rss:', 'Pss:'):
+                values[fields[0][:-1]] = int(fields[1]) / 1024
+    return values['Rss'], values['Pss']
+
+
+def worker(strategy, directory, barrier, results):
+    start = time.perf_counter()
+    # Imported here so each process pays for its own imports, as at startup
+    from services.ml_predictor import MLPredictor
+
+    settings = type('StartupSettings', (get_config(),), {
+        'ML_ARTIFACT_DIR': directory,
+        'ML_ARTIFACT_MMAP': strategy == 'mmap'
+    })
+    predictor = MLPredictor(settings)
+    if strategy == 'train':
+        predictor.train_models()
+    elif not predictor.load_models():
+        raise RuntimeError(f'no saved models in {directory}')
+    predictor.predict_batch([[3, 3, 3, 7]])
+    ready_seconds = time.perf_counter() - start
+
+    # Measure once every worker holds its models, so shared pages are split
+    barrier.wait()
+    rss, pss = memory_mb()
+    results.put((ready_seconds, rss, pss))
+    barrier.wait()
+
+
+def run(strategy, directory, workers):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(strategy, directory, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return [statistics.median(column) for column in zip(*measurements)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8, help='processes started at once')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        from services.ml_predictor import MLPredictor
+
+        settings = type('StartupSettings', (get_config(),), {'ML_ARTIFACT_DIR': directory})
+        predictor = MLPredictor(settings)
+        predictor.train_models()
+        manifest = predictor.save_models()
+        print(f"\nArtifact {manifest['version']}: {manifest['size_bytes'] / 1e6:.2f} MB")
+
+        print(f"\n{'strategy':>10}{'ready s':>10}{'RSS MB':>10}{'PSS MB':>10}   (median of {args.workers} workers)")
+        for strategy in STRATEGIES:
+            ready_seconds, rss, pss = run(strategy, directory, args.workers)
+            print(f"{strategy:>10}{ready_seconds:>10.2f}{rss:>10.1f}{pss:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Accuracy and latency of the precomputed prediction grid against the live models
+
+Trains the ML predictor once, then for each grid resolution reports build
+time, memory, capacity error and mode agreement on random valid inputs,
+the latency of one-row predict_batch calls (one request) and the per-row
+cost of predicting 1000 rows in one call.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_prediction_grid --samples 5000
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from config.settings import get_config
+from services.ml_predictor import MLPredictor
+from services.prediction_grid import PredictionGrid
+
+RESOLUTIONS = ((0.5, 1.0), (0.25, 0.5), (0.125, 0.25))
+
+
+def random_inputs(samples, seed, sleep_range):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(1, 5, samples),
+        rng.uniform(1, 5, samples),
+        rng.uniform(1, 5, samples),
+        rng.uniform(*sleep_range, samples)
+    ])
+
+
+def live_predictions(predictor, inputs):
+    """Capacity and mode probabilities from the models themselves, batched"""
+    scaled = predictor.scaler.transform(inputs)
+    capacity = np.clip(predictor.capacity_model.predict(scaled), 0, 100)
+    return capacity, predictor.mode_classifier.predict_proba(scaled)
+
+
+def accuracy(grid, predictor, inputs):
+    capacity, probabilities = live_predictions(predictor, inputs)
+    grid_capacity, grid_probabilities = grid.predict(inputs)
+
+    errors = np.abs(grid_capacity - capacity)
+    return {
+        'capacity_mae': errors.mean(),
+        'capacity_p99': np.percentile(errors, 99),
+        'capacity_max': errors.max(),
+        'mode_agreement': (grid_probabilities.argmax(axis=1) == probabilities.argmax(axis=1)).mean(),
+        'probability_mae': np.abs(grid_probabilities - probabilities).mean()
+    }
+
+
+def latency_us(predictor, inputs, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        predictor.predict_batch(inputs[i % len(inputs)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def batch_row_us(predictor, inputs, rows=1000):
+    start = time.perf_counter()
+    predictor.predict_batch(inputs[:rows])
+    return (time.perf_counter() - start) / rows * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=5000, help='random inputs for the accuracy report')
+    parser.add_argument('--iterations', type=int, default=500, help='calls per latency measurement')
+    args = parser.parse_args()
+    settings = get_config()
+    # The live path passes bare arrays to a scaler fitted on a DataFrame
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    live = MLPredictor(type('LiveSettings', (settings,), {'ML_PREDICTION_GRID_ENABLED': False}))
+    live.train_models()
+    uniform = random_inputs(args.samples, settings.ML_RANDOM_STATE, (0, 24))
+    typical = random_inputs(args.samples, settings.ML_RANDOM_STATE + 1, (4, 10))
+
+    live_us = latency_us(live, typical, args.iterations)
+    print(f"\nLive models: {live_us:,.0f} us per one-row predict_batch, "
+          f"{batch_row_us(live, typical):,.1f} us per row in a 1000-row batch")
+
+    print(f"\n{'step':>12}{'build s':>9}{'size MB':>9}{'inputs':>9}{'cap MAE':>9}{'cap p99':>9}"
+          f"{'cap max':>9}{'mode agr':>10}{'prob MAE':>10}{'us/call':>9}{'speedup':>9}{'us/row':>9}")
+    for metric_step, sleep_step in RESOLUTIONS:
+        start = time.perf_counter()
+        grid = PredictionGrid.build(live, metric_step, sleep_step)
+        build_seconds = time.perf_counter() - start
+
+        compiled = MLPredictor(type('GridSettings', (settings,), {'ML_PREDICTION_GRID_ENABLED': False}))
+        compiled.capacity_model, compiled.mode_classifier, compiled.scaler = live.capacity_model, live.mode_classifier, live.scaler
+        compiled.grid = grid
+        compiled.is_trained = True
+        grid_us = latency_us(compiled, typical, args.iterations * 10)
+        grid_row_us = batch_row_us(compiled, typical)
+
+        for name, inputs in (('0-24h', uniform), ('4-10h', typical)):
+            report = accuracy(grid, live, inputs)
+            print(f"{f'{metric_step}/{sleep_step}h':>12}{build_seconds:>9.2f}{grid.nbytes / 1e6:>9.2f}{name:>9}"
+                  f"{report['capacity_mae']:>9.3f}{report['capacity_p99']:>9.3f}{report['capacity_max']:>9.3f}"
+                  f"{report['mode_agreement']:>10.3f}{report['probability_mae']:>10.4f}"
+                  f"{grid_us:>9.1f}{live_us / grid_us:>8.0f}x{grid_row_us:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
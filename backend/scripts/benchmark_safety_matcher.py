@@ -0,0 +1,84 @@
+"""Evaluate and benchmark the safety fast-path matcher
+
+Reports precision/recall on the labeled safety set and the per-journal cost
+of the single precompiled pattern versus searching the lexicon one phrase at
+a time, at several journal lengths.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_safety_matcher
+"""
+import argparse
+import re
+import time
+
+from config.settings import get_config
+from services.safety_matcher import SAFETY_LEXICON, SafetyMatcher
+from scripts.safety_eval_set import SAFETY_EVAL_SET
+from scripts.sample_journals import SAMPLE_JOURNALS
+
+
+def naive_match(text):
+    """Baseline: one word-bounded search per lexicon phrase"""
+    text = SafetyMatcher.normalize(text)
+    found = []
+    for category, concepts in SAFETY_LEXICON.items():
+        for entries in concepts:
+            for phrase, _ in entries:
+                if re.search(r"(?<!\w)" + re.escape(phrase) + r"(?!\w)", text):
+                    found.append(category)
+    return found
+
+
+def evaluate(matcher, min_confidence):
+    """Precision and recall of fast-path decisions on the labeled set"""
+    true_positive = false_positive = false_negative = 0
+    for text, expected in SAFETY_EVAL_SET:
+        match = matcher.match(text)
+        predicted = match['category'] if match and match['confidence'] >= min_confidence else None
+        if predicted is not None and predicted == expected:
+            true_positive += 1
+        elif predicted is not None:
+            false_positive += 1
+            print(f"  false positive: {text!r} -> {predicted}")
+        if expected is not None and predicted != expected:
+            false_negative += 1
+            print(f"  missed: {text!r} (expected {expected})")
+
+    precision = true_positive / max(1, true_positive + false_positive)
+    recall = true_positive / max(1, true_positive + false_negative)
+    return precision, recall
+
+
+def time_per_call(fn, text, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(text)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+
+    min_confidence = get_config().SAFETY_FAST_PATH_MIN_CONFIDENCE
+    start = time.perf_counter()
+    matcher = SafetyMatcher()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Pattern compiled in {build_ms:.2f} ms")
+    precision, recall = evaluate(matcher, min_confidence)
+    print(f"Labeled set ({len(SAFETY_EVAL_SET)} journals, min confidence {min_confidence}): "
+          f"precision {precision:.2f}, recall {recall:.2f}\n")
+
+    base_text = ' '.join(text for text, _ in SAMPLE_JOURNALS)
+    print(f"{'chars':>8}{'compiled us':>15}{'per-phrase us':>15}")
+    for length in (200, 1000, 5000, 10000):
+        text = (base_text * (length // len(base_text) + 1))[:length]
+        compiled_us = time_per_call(matcher.match, text, args.iterations)
+        naive_us = time_per_call(naive_match, text, args.iterations)
+        print(f"{length:>8}{compiled_us:>15.1f}{naive_us:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
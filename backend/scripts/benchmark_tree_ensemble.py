@@ -0,0 +1,87 @@
+"""Agreement and latency of the flattened tree ensembles against sklearn
+
+Trains the ML predictor once, flattens both ensembles and reports the
+largest capacity and probability differences from sklearn's predict /
+predict_proba on random valid inputs, then the latency of each model per
+call for batches of increasing size.
+
+Usage (from the backend directory):
+    python -m scripts.benchmark_tree_ensemble --samples 5000
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from config.settings import get_config
+from services.ml_predictor import MLPredictor
+from services.tree_ensemble import CompiledModels
+
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def random_inputs(samples, seed):
+    rng = np.random.default_rng(seed)
+    inputs = np.column_stack([
+        rng.uniform(1, 5, samples),
+        rng.uniform(1, 5, samples),
+        rng.uniform(1, 5, samples),
+        rng.uniform(0, 24, samples)
+    ])
+    # Logged values sit on the 1-5 steps and half hours, where splits fall
+    inputs[:samples // 2] = np.round(inputs[:samples // 2] * 2) / 2
+    return inputs
+
+
+def per_call_us(predict, inputs, rows, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        offset = (i * rows) % (len(inputs) - rows + 1)
+        predict(inputs[offset:offset + rows])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--samples', type=int, default=5000, help='random inputs for the agreement report')
+    parser.add_argument('--iterations', type=int, default=200, help='calls per latency measurement')
+    args = parser.parse_args()
+    settings = get_config()
+    # The sklearn path passes bare arrays to a scaler fitted on a DataFrame
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    predictor = MLPredictor(settings)
+    predictor.train_models()
+    start = time.perf_counter()
+    compiled = CompiledModels.from_predictor(predictor)
+    flatten_ms = (time.perf_counter() - start) * 1e3
+    inputs = random_inputs(args.samples, settings.ML_RANDOM_STATE)
+
+    def sklearn_predict(rows):
+        scaled = predictor.scaler.transform(rows)
+        capacity = np.clip(predictor.capacity_model.predict(scaled), 0, 100)
+        return capacity, predictor.mode_classifier.predict_proba(scaled)
+
+    capacity, probabilities = sklearn_predict(inputs)
+    flat_capacity, flat_probabilities = compiled.predict(inputs)
+    single = np.array([compiled.predict(inputs[i:i + 1])[0][0] for i in range(min(len(inputs), 500))])
+    print(f"\nFlattened in {flatten_ms:.1f} ms, {compiled.nbytes / 1e6:.2f} MB "
+          f"({len(compiled.capacity.roots)} + {len(compiled.mode.roots)} trees, "
+          f"depth {compiled.capacity.depth} / {compiled.mode.depth})")
+    print(f"Max |capacity diff| {np.abs(flat_capacity - capacity).max():.2e} "
+          f"(single rows {np.abs(single - capacity[:len(single)]).max():.2e}), "
+          f"max |probability diff| {np.abs(flat_probabilities - probabilities).max():.2e}, "
+          f"mode agreement {(flat_probabilities.argmax(axis=1) == probabilities.argmax(axis=1)).mean():.4f}")
+
+    print(f"\n{'rows':>6}{'sklearn us':>12}{'flat us':>10}{'speedup':>9}{'sklearn us/row':>16}{'flat us/row':>13}")
+    for rows in BATCH_SIZES:
+        iterations = max(args.iterations // rows, 5)
+        sklearn_us = per_call_us(sklearn_predict, inputs, rows, iterations)
+        flat_us = per_call_us(compiled.predict, inputs, rows, iterations * 10)
+        print(f"{rows:>6}{sklearn_us:>12,.0f}{flat_us:>10,.0f}{sklearn_us / flat_us:>8.1f}x"
+              f"{sklearn_us / rows:>16,.1f}{flat_us / rows:>13,.1f}")
+
+
+if __name__ == '__main__':
+    main()
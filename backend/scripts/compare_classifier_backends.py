@@ -0,0 +1,87 @@
+"""Compare the PyTorch and quantized ONNX classifier backends
+
+Each backend runs in its own process so the reported RSS is not polluted by
+the other model. Reports p50/p95 latency, resident memory and top-1
+agreement with the PyTorch path on the fixed sample journals.
+
+Usage (from the backend directory):
+    python -m scripts.compare_classifier_backends --strategy full --repeats 3
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+import numpy as np
+
+from scripts.sample_journals import SAMPLE_JOURNALS
+
+
+def _rss_mb():
+    """Current resident set size of this process in MB"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_backend(backend, strategy, repeats):
+    """Load one backend in a fresh process and classify every sample journal"""
+    from config.settings import get_config
+    from services.context_classifier import ContextClassifier
+
+    settings = type('BackendSettings', (get_config(),), {
+        'CLASSIFIER_BACKEND': backend,
+        'CLASSIFIER_STRATEGY': strategy,
+        'CLASSIFIER_BATCHING_ENABLED': False,
+        'CLASSIFIER_CACHE_SIZE': 0
+    })
+    rss_before = _rss_mb()
+    classifier = ContextClassifier(settings)
+    classifier.initialize()
+    classifier.classify(SAMPLE_JOURNALS[0][0])
+
+    predictions = []
+    latencies = []
+    for text, _ in SAMPLE_JOURNALS:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = classifier.classify(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append(result['category'])
+
+    return {
+        'predictions': predictions,
+        'latencies': latencies,
+        'rss_mb': _rss_mb(),
+        'model_rss_mb': _rss_mb() - rss_before
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--strategy', default='full', choices=['full', 'shortlist', 'hierarchical'])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+    results = {}
+    for backend in ('torch', 'onnx'):
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (backend, args.strategy, args.repeats))
+
+    reference = results['torch']['predictions']
+    print(f"\n{'backend':<10}{'p50 ms':>10}{'p95 ms':>10}{'RSS MB':>10}{'model MB':>10}{'top-1 agree':>13}")
+    for backend, result in results.items():
+        latencies = np.array(result['latencies'])
+        agreement = np.mean([p == r for p, r in zip(result['predictions'], reference)])
+        print(f"{backend:<10}{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 95):>10.1f}"
+              f"{result['rss_mb']:>10.0f}{result['model_rss_mb']:>10.0f}{agreement:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Compare accuracy and latency of the context classifier strategies
+
+Usage (from the backend directory):
+    python -m scripts.compare_classifier_strategies --repeats 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from config.settings import get_config
+from services.context_classifier import ContextClassifier
+from scripts.sample_journals import SAMPLE_JOURNALS
+
+
+def run_strategy(strategy, repeats):
+    """Classify every sample journal and collect predictions and latencies"""
+    # Cache and batching off so every call measures a real classification
+    settings = type('StrategySettings', (get_config(),), {
+        'CLASSIFIER_STRATEGY': strategy,
+        'CLASSIFIER_BATCHING_ENABLED': False,
+        'CLASSIFIER_CACHE_SIZE': 0
+    })
+    classifier = ContextClassifier(settings)
+    classifier.initialize()
+
+    predictions = []
+    latencies = []
+    for text, _ in SAMPLE_JOURNALS:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = classifier.classify(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+        predictions.append(result['category'])
+
+    return predictions, np.array(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=3, help='classifications per journal')
+    args = parser.parse_args()
+
+    expected = [category for _, category in SAMPLE_JOURNALS]
+    results = {
+        strategy: run_strategy(strategy, args.repeats)
+        for strategy in ('full', 'shortlist', 'hierarchical')
+    }
+    reference = results['full'][0]
+
+    # Missing a crisis costs far more than a wrong everyday label
+    critical = [i for i, category in enumerate(expected) if category in ContextClassifier.CRITICAL_CATEGORIES]
+
+    print(f"\n{'strategy':<12}{'accuracy':>10}{'agree/full':>12}{'critical':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for strategy, (predictions, latencies) in results.items():
+        accuracy = np.mean([p == e for p, e in zip(predictions, expected)])
+        agreement = np.mean([p == r for p, r in zip(predictions, reference)])
+        critical_recall = np.mean([predictions[i] in ContextClassifier.CRITICAL_CATEGORIES for i in critical]) if critical else float('nan')
+        print(f"{strategy:<12}{accuracy:>10.2f}{agreement:>12.2f}{critical_recall:>10.2f}"
+              f"{np.percentile(latencies, 50):>10.1f}{np.percentile(latencies, 95):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""Re-classify stored journals after the label set or classifier model changes
+
+Streams DailyLog rows that have journal text in primary-key order (keyset
+pagination, so each page is an index range scan however far the job has
+got), classifies them in batches across worker processes and writes the
+results back in bulk transactions. After every commit the last written id
+goes to a checkpoint file, so an interrupted run picks up where it stopped.
+
+Usage (from the backend directory):
+    python -m scripts.reclassify_logs --workers 4
+    python -m scripts.reclassify_logs --restart --no-student
+"""
+import argparse
+import json
+import os
+import time
+
+from flask import Flask
+from sqlalchemy import update
+
+from config.settings import get_config
+from models.database import db, DailyLog
+from services.context_classifier import ContextClassifier
+
+_classifier = None
+
+
+def classifier_settings(args):
+    """Serving settings with the request-time conveniences turned off"""
+    settings = get_config()
+    overrides = {
+        # Every journal is seen once, and the job must never settle for the
+        # degraded keyword answer while the model loads
+        'CLASSIFIER_CACHE_SIZE': 0,
+        'CLASSIFIER_BATCHING_ENABLED': False,
+        'MODEL_WARMUP_ENABLED': False,
+        'SAFETY_REFINE_ASYNC': False,
+        # Several processes appending to one teacher log would interleave lines
+        'CLASSIFIER_TEACHER_LOG': '',
+        'CLASSIFIER_ONNX_THREADS': args.threads
+    }
+    if args.no_student:
+        overrides['CLASSIFIER_STUDENT_ENABLED'] = False
+    return type('ReclassifySettings', (settings,), overrides)
+
+
+def init_worker(args):
+    """Load one classifier per worker process"""
+    global _classifier
+    threads = args.threads
+    if threads:
+        try:
+            import torch
+            # Keep workers x threads within the machine's cores
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    _classifier = ContextClassifier(classifier_settings(args))
+    _classifier.initialize()
+
+
+def classify_batch(batch):
+    """Classify (id, text) pairs; returns the column updates for each row"""
+    results = _classifier.classify_batch([text for _, text in batch])
+    return [
+        {
+            'id': log_id,
+            'detected_context': result['category'],
+            'context_confidence': float(result['confidence']),
+            'context_model_version': result.get('model_version')
+        }
+        for (log_id, _), result in zip(batch, results)
+    ]
+
+
+def iter_pages(after_id, page_size):
+    """Keyset pages of (id, text) journals with id > after_id"""
+    while True:
+        page = (
+            db.session.query(DailyLog.id, DailyLog.journal_text)
+            .filter(DailyLog.id > after_id, DailyLog.journal_text.isnot(None), DailyLog.journal_text != '')
+            .order_by(DailyLog.id)
+            .limit(page_size)
+            .all()
+        )
+        # Release the read transaction so SQLite writers aren't held up
+        db.session.commit()
+        if not page:
+            return
+
+        yield [(row.id, row.journal_text) for row in page]
+        after_id = page[-1].id
+
+
+def load_checkpoint(path, version):
+    """Last committed id from an earlier run with the same classifier, else 0"""
+    try:
+        with open(path, encoding='utf-8') as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except FileNotFoundError:
+        return 0, 0
+
+    if checkpoint.get('classifier_version') != version:
+        print("⚠️ Checkpoint was written by a different classifier configuration; starting over")
+        return 0, 0
+    return checkpoint['last_id'], checkpoint.get('processed', 0)
+
+
+def save_checkpoint(path, version, last_id, processed):
+    """Atomically record progress; only ever called after a commit"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as checkpoint_file:
+        json.dump({
+            'classifier_version': version,
+            'last_id': last_id,
+            'processed': processed,
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+        }, checkpoint_file)
+    os.replace(temp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=1, help='classifier processes')
+    parser.add_argument('--threads', type=int, default=None,
+                        help='inference threads per worker (default: cores / workers)')
+    parser.add_argument('--batch-size', type=int, default=32, help='journals per classify_batch call')
+    parser.add_argument('--page-size', type=int, default=1000, help='rows fetched per keyset page')
+    parser.add_argument('--commit-every', type=int, default=500, help='rows per write transaction')
+    parser.add_argument('--checkpoint', default='./models/reclassify_checkpoint.json')
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint and start from the first row')
+    parser.add_argument('--no-student', action='store_true',
+                        help='classify every journal with the NLI model, bypassing the student')
+    args = parser.parse_args()
+    args.threads = args.threads or max(1, (os.cpu_count() or 1) // args.workers)
+
+    app = Flask(__name__)
+    app.config.from_object(get_config())
+    db.init_app(app)
+
+    # Only used for its version; the workers hold the loaded models
+    version = ContextClassifier(classifier_settings(args)).cache_version
+
+    with app.app_context():
+        last_id, processed = (0, 0) if args.restart else load_checkpoint(args.checkpoint, version)
+        remaining = (
+            DailyLog.query
+            .filter(DailyLog.id > last_id, DailyLog.journal_text.isnot(None), DailyLog.journal_text != '')
+            .count()
+        )
+        db.session.commit()
+        print(f"Re-classifying {remaining} journals after id {last_id} with {args.workers} worker(s)")
+        if not remaining:
+            return
+
+        pool = None
+        if args.workers > 1:
+            import multiprocessing
+            pool = multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(args,))
+        else:
+            init_worker(args)
+
+        start = time.perf_counter()
+        done = 0
+        pending = []
+        try:
+            # Pages are read on this thread (the session belongs to it); the
+            # pool classifies a page's batches in parallel and imap hands them
+            # back in order, so the checkpoint never skips an unwritten row
+            for page in iter_pages(last_id, args.page_size):
+                batches = [page[i:i + args.batch_size] for i in range(0, len(page), args.batch_size)]
+                results = pool.imap(classify_batch, batches) if pool is not None else map(classify_batch, batches)
+                for updates in results:
+                    pending.extend(updates)
+                    if len(pending) >= args.commit_every:
+                        done += write(pending, args.checkpoint, version, processed + done)
+                        report_progress(done, remaining, start)
+                        pending = []
+
+            if pending:
+                done += write(pending, args.checkpoint, version, processed + done)
+                report_progress(done, remaining, start)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    print(f"✅ Re-classified {done} journals")
+
+
+def write(updates, checkpoint_path, version, processed):
+    """Apply one transaction of updates, then checkpoint past it"""
+    db.session.execute(update(DailyLog), updates)
+    db.session.commit()
+    save_checkpoint(checkpoint_path, version, updates[-1]['id'], processed + len(updates))
+    return len(updates)
+
+
+def report_progress(done, total, start):
+    elapsed = time.perf_counter() - start
+    rate = done / elapsed if elapsed else 0.0
+    eta = (total - done) / rate if rate else float('inf')
+    print(f"  {done}/{total} journals  {rate:.1f} rows/s  ETA {eta / 60:.1f} min", flush=True)
+
+
+if __name__ == '__main__':
+    main()
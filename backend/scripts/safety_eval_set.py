@@ -0,0 +1,72 @@
+"""Labeled journals for evaluating the safety fast path
+
+Each entry is (journal text, expected critical category or None). Negatives
+include figurative language and negated mentions that must not trigger.
+"""
+
+SAFETY_EVAL_SET = [
+    # Critical
+    ("I can't do this anymore, I want to kill myself tonight.", "Suicidal Ideation"),
+    ("Everyone would be better off dead without me around.", "Suicidal Ideation"),
+    ("I've been thinking about suicide a lot this week.", "Suicidal Ideation"),
+    ("Honestly I don't want to live anymore.", "Suicidal Ideation"),
+    ("I wrote a suicide note and hid it in my drawer.", "Suicidal Ideation"),
+    ("Some days I feel suicidal and I don't tell anyone.", "Suicidal Ideation"),
+    ("I cut myself again last night after the argument.", "Self-Harm"),
+    ("When I'm this stressed I start hurting myself.", "Self-Harm"),
+    ("I keep wanting to harm myself when I'm alone.", "Self-Harm"),
+    ("My roommate is unconscious on the floor and won't wake up.", "Medical Emergency"),
+    ("I can't breathe properly and my lips are turning blue.", "Medical Emergency"),
+    ("We had to call an ambulance for my dad this morning.", "Medical Emergency"),
+    ("A guy on the street punched me and took my bag.", "Physical Assault"),
+    ("My brother attacked me with a belt yesterday.", "Physical Assault"),
+    ("He choked me during the fight and I'm scared.", "Physical Assault"),
+    ("My manager groped me in the elevator.", "Sexual Harassment"),
+    ("A professor has sexually harassed me for months.", "Sexual Harassment"),
+    ("My ex keeps following me home from the station.", "Stalking"),
+    ("I'm being stalked by someone from my old job.", "Stalking"),
+    ("I think I'm having a heart attack, crushing chest pain down my arm.", "Heart Attack"),
+    ("My grandmother's face is drooping and she has slurred speech.", "Stroke"),
+    ("My sister had a seizure at dinner and we're at the hospital.", "Seizure"),
+    ("The cut on my leg won't stop bleeding even with pressure.", "Heavy Bleeding"),
+    ("I took too many pills on purpose an hour ago.", "Overdose"),
+    ("My friend overdosed at the party last night.", "Overdose"),
+    ("I am not okay, I want to die.", "Suicidal Ideation"),
+
+    # Not critical
+    ("This exam is going to kill me, so much to revise.", None),
+    ("I'm not suicidal, just really exhausted and sad.", None),
+    ("I would never hurt myself, but I feel numb.", None),
+    ("The realization hit me hard during the meeting.", None),
+    ("Watched a documentary about heart attack prevention.", None),
+    ("Went to a suicide prevention awareness seminar at college.", None),
+    ("My code keeps crashing and I want to scream.", None),
+    ("I'm dying to go on holiday after this sprint.", None),
+    ("We beat the other team in the final, what a game!", None),
+    ("I stalked her instagram for an hour, embarrassing.", None),
+    ("The lecture on seizure medication was interesting.", None),
+    ("Slept badly and had a headache all day.", None),
+    ("My boss is impossible and I'm burning out.", None),
+    ("Grateful for a quiet evening with my family.", None),
+    ("The ambulance siren outside woke me up at 3am.", None),
+    ("Feeling lonely since moving to the new city.", None),
+    ("Budget is tight this month and rent is due.", None),
+    ("I passed the driving test on my first attempt!", None),
+    ("My toddler had a meltdown at the supermarket.", None),
+    ("Spent the day decluttering the spare room.", None),
+    ("Tried a new deadlift and hurt myself at the gym.", None),
+    ("The baby kicked me all night, can't wait to meet her.", None),
+    ("My brother beat me at chess again.", None),
+    ("I can't breathe lol this meme is too good.", None),
+    ("Third espresso before noon, coffee overdose.", None),
+    ("I don't think I will ever hurt myself again.", None),
+    ("Sat through unconscious bias at work training all afternoon.", None),
+    ("My dog has seizures again, had to pick up more seizure meds.", None),
+    ("Walked my drunk friend home, slurred speech and all.", None),
+    ("Found out I have an instagram stalker lol.", None),
+    ("The camera flashed me right in the eyes at graduation.", None),
+    ("Passed out on the couch after the ambulance drama on Grey's Anatomy.", None),
+    ("Watched a documentary on suicide prevention and how to reach suicidal teens.", None),
+    ("The detective found a suicide note in the second episode.", None),
+    ("My cat keeps following me around the flat.", None),
+]
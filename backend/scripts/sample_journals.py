@@ -0,0 +1,29 @@
+"""Fixed journal entries used by the classifier comparison scripts"""
+
+# (journal text, expected category)
+SAMPLE_JOURNALS = [
+    ("I have my final exams next week and I can't stop panicking about failing them.", "Exam Stress"),
+    ("My head has been pounding since this morning, the light makes it worse.", "Migraine"),
+    ("Couldn't sleep again last night, lay awake until 4am staring at the ceiling.", "Insomnia"),
+    ("My manager yelled at me in front of the whole team again today.", "Toxic Boss"),
+    ("We broke up after three years together and I feel empty.", "Breakup"),
+    ("I owe so much on my credit cards that I don't know how to pay rent.", "Debt"),
+    ("My heart was racing, I couldn't breathe and thought I was dying on the bus.", "Panic Attack"),
+    ("I keep putting off my assignment and watching videos instead.", "Procrastination"),
+    ("The thesis chapter is due Friday and I've only written two pages.", "Thesis Writing"),
+    ("Got the promotion I've been working towards all year!", "Promotion"),
+    ("My grandmother passed away last week and I keep crying.", "Grief"),
+    ("Everyone at the new office seems to have friends except me.", "Loneliness"),
+    ("I have a job interview tomorrow morning for my dream company.", "Job Interview"),
+    ("Spent the whole weekend packing boxes for the move to the new apartment.", "Moving House"),
+    ("I want to lose ten kilos before summer so I started going to the gym.", "Weight Loss"),
+    ("Some seniors in the hostel forced us to do humiliating things all night.", "Ragging"),
+    ("I feel like a fraud at work, everyone else seems so much smarter.", "Imposter Syndrome"),
+    ("Working from home makes it impossible to switch off in the evening.", "Work-Life Balance"),
+    ("Cramps are so bad today I can barely get out of bed.", "Menstrual Pain"),
+    ("I can't stop scrolling instagram, I lose hours every night.", "Social Media Addiction"),
+    ("My toddler screamed on the supermarket floor for twenty minutes.", "Toddler Tantrum"),
+    ("I've been staring at a blank canvas for weeks with no ideas.", "Creative Block"),
+    ("My laptop won't turn on and all my files are on it.", "Device Issues"),
+    ("Grateful for a quiet sunny morning and coffee with my sister.", "Grateful"),
+]
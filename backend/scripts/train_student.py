@@ -0,0 +1,94 @@
+"""Train the distilled student classifier and evaluate it against the teacher
+
+Reads the NLI teacher's logged classifications, holds out a test split to
+measure how often the student agrees with the teacher at each confidence
+threshold, then refits on all examples and saves the student.
+
+Usage (from the backend directory):
+    python -m scripts.train_student --min-teacher-confidence 0.3
+    python -m scripts.train_student --evaluate-only
+"""
+import argparse
+from collections import Counter
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from config.settings import get_config
+from services.student_classifier import StudentClassifier, TeacherLog
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9, 0.95)
+
+
+def report(student, texts, teacher_labels, serving_threshold):
+    """Agreement with the teacher and coverage at each confidence threshold"""
+    start = time.perf_counter()
+    rankings = student.predict(texts)
+    per_journal_us = (time.perf_counter() - start) / len(texts) * 1e6
+
+    predicted = np.array([labels[0] for labels, _ in rankings])
+    confidence = np.array([scores[0] for _, scores in rankings])
+    agrees = predicted == np.array(teacher_labels)
+
+    print(f"\nJournals: {len(texts)}   overall agreement with teacher: {agrees.mean():.3f}")
+    print(f"Student inference: {per_journal_us:.0f} us/journal (batched)")
+    print(f"\n{'threshold':>10}{'coverage':>10}{'agreement':>11}")
+    for threshold in sorted(set(THRESHOLDS) | {serving_threshold}):
+        covered = confidence >= threshold
+        agreement = agrees[covered].mean() if covered.any() else float('nan')
+        marker = '  <- serving' if threshold == serving_threshold else ''
+        print(f"{threshold:>10.2f}{covered.mean():>10.3f}{agreement:>11.3f}{marker}")
+
+
+def main():
+    settings = get_config()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--log', default=settings.CLASSIFIER_TEACHER_LOG or None,
+                        required=not settings.CLASSIFIER_TEACHER_LOG,
+                        help='teacher log (JSONL; default CLASSIFIER_TEACHER_LOG)')
+    parser.add_argument('--output', default=settings.CLASSIFIER_STUDENT_PATH)
+    parser.add_argument('--min-teacher-confidence', type=float, default=0.0,
+                        help='drop teacher labels below this confidence')
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--threshold', type=float, default=settings.CLASSIFIER_STUDENT_MIN_CONFIDENCE,
+                        help='serving confidence threshold to highlight')
+    parser.add_argument('--evaluate-only', action='store_true',
+                        help='evaluate the saved student on the whole log without retraining')
+    args = parser.parse_args()
+
+    examples = TeacherLog(args.log).load(min_confidence=args.min_teacher_confidence)
+    texts = [example['text'] for example in examples]
+    labels = [example['category'] for example in examples]
+    teacher_versions = Counter(example['teacher_version'] for example in examples)
+    print(f"Loaded {len(texts)} teacher-labelled journals across {len(set(labels))} labels from {args.log}")
+
+    if args.evaluate_only:
+        student = StudentClassifier(args.output)
+        if not student.load():
+            parser.error(f"No student at {args.output}")
+        report(student, texts, labels, args.threshold)
+        return
+
+    if len(set(labels)) < 2 or len(texts) < 10:
+        parser.error("Need at least 10 journals with 2 or more distinct labels to train a student")
+
+    # Stratify when every label has at least two examples
+    counts = Counter(labels)
+    stratify = labels if min(counts.values()) >= 2 else None
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=args.test_size, random_state=settings.ML_RANDOM_STATE, stratify=stratify
+    )
+
+    holdout = StudentClassifier(args.output)
+    holdout.train(train_texts, train_labels)
+    print("\nHeld-out evaluation:")
+    report(holdout, test_texts, test_labels, args.threshold)
+
+    student = StudentClassifier(args.output)
+    student.train(texts, labels, teacher_version=teacher_versions.most_common(1)[0][0])
+    student.save()
+
+
+if __name__ == '__main__':
+    main()
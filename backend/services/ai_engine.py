@@ -3,6 +3,9 @@ import random
 import pandas as pd
 import numpy as np
 
+from .analytics_frame import AnalyticsFrame
+from .label_taxonomy import group_of
+
 class AIEngine:
     """Advanced AI recommendation engine with context-seeking intelligence"""
     
@@ -24,6 +27,15 @@ class AIEngine:
             print(f"⚠️ AI Generator initialization failed: {e}")
             self.generator = None
     
+    def warmup(self):
+        """Load the generator and run one dummy generation"""
+        if self.generator is None:
+            self.initialize()
+        if self.generator is None:
+            raise RuntimeError("AI Generator unavailable")
+        self.generator("Today I plan to", max_new_tokens=1,
+                       pad_token_id=self.generator.tokenizer.eos_token_id)
+    
     def assess_decision_context(self, decision_data, conversation_history):
         """
         Assess if we have enough context to make a decision recommendation.
@@ -281,10 +293,10 @@ class AIEngine:
             }
         }
     
-    def generate_plan(self, context_category, urgency, mode, sentiment):
+    def generate_plan(self, context_category, urgency, mode, sentiment, group=None):
         """Generate context-aware recommendations"""
         # Determine template category
-        template_category = self._map_to_template(context_category, urgency, mode)
+        template_category = self._map_to_template(context_category, urgency, mode, group)
         
         # Get templates
         templates = self.recommendation_templates.get(template_category, self.recommendation_templates['general'])
@@ -303,27 +315,34 @@ class AIEngine:
         
         return plan
     
-    def _map_to_template(self, category, urgency, mode):
+    def _map_to_template(self, category, urgency, mode, group=None):
         """Map category to appropriate template"""
         if urgency == 'critical':
             return 'critical'
         
-        # Health mapping
-        health_physical = ['Headache', 'Migraine', 'Back Pain', 'Stomach Ache', 'Flu', 'Fever', 'Fatigue', 'Menstrual Pain']
-        if any(h in category for h in health_physical):
-            return 'health_physical'
-        
-        # Mental health mapping
-        mental_health = ['Anxiety', 'Depression', 'Panic', 'Stress', 'Burnout', 'Overwhelmed', 'Grief']
-        if any(m in category for m in mental_health):
-            return 'mental_health'
-        
-        # Academic/Work mapping
-        academic_work = ['Exam', 'Thesis', 'Assignment', 'Deadline', 'Interview', 'Procrastination']
-        if any(a in category for a in academic_work):
-            return 'academic_work'
+        # Labels whose template from the original keyword mapping differs
+        # from their group's keep it
+        overrides = {
+            'Overwhelmed': 'mental_health',
+            'Exam Stress': 'mental_health',
+            'Graduation Anxiety': 'mental_health',
+            'Postpartum Depression': 'mental_health',
+            'Parenting Stress': 'mental_health'
+        }
+        if category in overrides:
+            return overrides[category]
+        
+        # Everything else gets its taxonomy group's template; groups without
+        # one use 'general'
+        group_templates = {
+            'health_urgent': 'health_physical',
+            'health_common': 'health_physical',
+            'mental_health': 'mental_health',
+            'academic': 'academic_work',
+            'work_career': 'academic_work'
+        }
         
-        return 'general'
+        return group_templates.get(group or group_of(category), 'general')
     
     def _select_recommendation(self, options, context):
         """Select appropriate recommendation from options"""
@@ -737,6 +756,9 @@ class AIEngine:
         """
         Generate comprehensive weekly summary with highlights
         
+        Args:
+            logs_data: AnalyticsFrame or list of log dictionaries
+            
         Returns:
             dict with summary, highlights, lowlights, achievements
         """
@@ -746,30 +768,30 @@ class AIEngine:
                 'message': 'Need at least 3 days of data for weekly summary'
             }
         
-        df = pd.DataFrame(logs_data)
+        frame = AnalyticsFrame.of(logs_data)
         
         # Calculate key stats
-        avg_mood = df['mood'].mean()
-        avg_energy = df['energy'].mean()
-        avg_stress = df['stress'].mean()
-        avg_sleep = df['sleep'].mean()
+        avg_mood = frame.mood.mean()
+        avg_energy = frame.energy.mean()
+        avg_stress = frame.stress.mean()
+        avg_sleep = frame.sleep.mean()
         
         # Find best and worst days
-        df['overall_score'] = (df['mood'] + df['energy'] + (6 - df['stress'])) / 3
-        best_day_idx = df['overall_score'].idxmax()
-        worst_day_idx = df['overall_score'].idxmin()
+        overall_score = (frame.mood + frame.energy + (6 - frame.stress)) / 3
+        best_day_idx = int(overall_score.argmax())
+        worst_day_idx = int(overall_score.argmin())
         
         # Highlights (best moments)
         highlights = []
         
-        if df['mood'].max() >= 4.5:
-            highlights.append(f"Peak mood of {df['mood'].max():.1f}/5 achieved!")
+        if frame.mood.max() >= 4.5:
+            highlights.append(f"Peak mood of {frame.mood.max():.1f}/5 achieved!")
         
-        if df['energy'].max() >= 4.5:
-            highlights.append(f"Excellent energy levels (max: {df['energy'].max():.1f}/5)")
+        if frame.energy.max() >= 4.5:
+            highlights.append(f"Excellent energy levels (max: {frame.energy.max():.1f}/5)")
         
-        if df['stress'].min() <= 1.5:
-            highlights.append(f"Very low stress days recorded (min: {df['stress'].min():.1f}/5)")
+        if frame.stress.min() <= 1.5:
+            highlights.append(f"Very low stress days recorded (min: {frame.stress.min():.1f}/5)")
         
         if avg_sleep >= 7.5:
             highlights.append(f"Great sleep average: {avg_sleep:.1f} hours/night")
@@ -777,30 +799,30 @@ class AIEngine:
         # Lowlights (areas for improvement)
         lowlights = []
         
-        if df['stress'].max() >= 4.5:
-            lowlights.append(f"High stress spike detected ({df['stress'].max():.1f}/5)")
+        if frame.stress.max() >= 4.5:
+            lowlights.append(f"High stress spike detected ({frame.stress.max():.1f}/5)")
         
-        if df['mood'].min() <= 1.5:
-            lowlights.append(f"Low mood day occurred ({df['mood'].min():.1f}/5)")
+        if frame.mood.min() <= 1.5:
+            lowlights.append(f"Low mood day occurred ({frame.mood.min():.1f}/5)")
         
         if avg_sleep < 6.5:
             lowlights.append(f"Sleep below optimal ({avg_sleep:.1f} hours avg)")
         
-        if df['energy'].min() <= 1.5:
-            lowlights.append(f"Very low energy day ({df['energy'].min():.1f}/5)")
+        if frame.energy.min() <= 1.5:
+            lowlights.append(f"Very low energy day ({frame.energy.min():.1f}/5)")
         
         # Achievements
         achievements = []
         
         # Consistency achievements
-        if df['mood'].std() < 0.5:
+        if np.std(frame.mood, ddof=1) < 0.5:
             achievements.append({
                 'title': 'Emotional Stability',
                 'description': 'Maintained consistent mood all week',
                 'icon': '🎯'
             })
         
-        if (df['sleep'] >= 7).sum() >= len(df) * 0.7:
+        if (frame.sleep >= 7).sum() >= len(frame) * 0.7:
             achievements.append({
                 'title': 'Sleep Champion',
                 'description': 'Got adequate sleep most days',
@@ -814,7 +836,7 @@ class AIEngine:
                 'icon': '🧘'
             })
         
-        if (df[['mood', 'energy']].mean(axis=1) >= 4).sum() >= 3:
+        if ((frame.mood + frame.energy) / 2 >= 4).sum() >= 3:
             achievements.append({
                 'title': 'High Performer',
                 'description': '3+ days of excellent mood & energy',
@@ -848,11 +870,11 @@ class AIEngine:
             'lowlights': lowlights,
             'achievements': achievements,
             'best_day': {
-                'date': df.iloc[best_day_idx].get('timestamp', 'N/A'),
-                'score': round(df.iloc[best_day_idx]['overall_score'], 2)
+                'date': frame.label(best_day_idx, 'N/A'),
+                'score': round(overall_score[best_day_idx], 2)
             },
             'worst_day': {
-                'date': df.iloc[worst_day_idx].get('timestamp', 'N/A'),
-                'score': round(df.iloc[worst_day_idx]['overall_score'], 2)
+                'date': frame.label(worst_day_idx, 'N/A'),
+                'score': round(overall_score[worst_day_idx], 2)
             }
         }
\ No newline at end of file
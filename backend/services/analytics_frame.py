@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+METRICS = ('mood', 'energy', 'stress', 'sleep')
+
+def _frozen(values, dtype):
+    array = np.ascontiguousarray(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+class AnalyticsFrame:
+    """Daily logs as read-only numpy columns, built once per analytics request
+
+    One float array per metric, in log order, plus the timestamps as UTC
+    datetime64 with their day of week (Monday = 0) and day of month. The
+    analytics methods of MLPredictor and AIEngine take a frame or, as
+    before, a list of log dicts, which they convert with `of`.
+    """
+
+    __slots__ = ('mood', 'energy', 'stress', 'sleep', 'timestamp', 'day_of_week', 'day_of_month', '_labels')
+
+    def __init__(self, mood, energy, stress, sleep, timestamp=None, labels=None):
+        self.mood = _frozen(mood, float)
+        self.energy = _frozen(energy, float)
+        self.stress = _frozen(stress, float)
+        self.sleep = _frozen(sleep, float)
+        self.timestamp = None
+        self.day_of_week = None
+        self.day_of_month = None
+        if timestamp is not None:
+            self.timestamp = _frozen(timestamp, 'datetime64[us]')
+            days = self.timestamp.astype('datetime64[D]')
+            # 1970-01-01 was a Thursday
+            self.day_of_week = _frozen((days.astype(np.int64) + 3) % 7, np.int64)
+            self.day_of_month = _frozen((days - days.astype('datetime64[M]')).astype(np.int64) + 1, np.int64)
+        # Timestamps as the dict form carried them, for dates in results
+        self._labels = labels
+
+    @classmethod
+    def from_logs(cls, logs):
+        """Frame over DailyLog rows straight from a query"""
+        count = len(logs)
+        return cls(
+            np.fromiter((log.mood for log in logs), float, count),
+            np.fromiter((log.energy for log in logs), float, count),
+            np.fromiter((log.stress for log in logs), float, count),
+            np.fromiter((log.sleep for log in logs), float, count),
+            np.array([log.timestamp for log in logs], dtype='datetime64[us]')
+        )
+
+    @classmethod
+    def from_records(cls, logs_data):
+        """Frame over a list of log dicts (mood, energy, stress, sleep, optional timestamp)"""
+        columns = [[record[metric] for record in logs_data] for metric in METRICS]
+        timestamp = labels = None
+        if logs_data and all('timestamp' in record for record in logs_data):
+            labels = [record['timestamp'] for record in logs_data]
+            parsed = pd.to_datetime(pd.Series(labels), utc=True, format='ISO8601').dt.tz_localize(None)
+            timestamp = parsed.to_numpy(dtype='datetime64[us]')
+        return cls(*columns, timestamp=timestamp, labels=labels)
+
+    @classmethod
+    def of(cls, data):
+        """`data` itself if it is a frame, else a frame over its log dicts"""
+        return data if isinstance(data, cls) else cls.from_records(data)
+
+    def __len__(self):
+        return len(self.mood)
+
+    def __getitem__(self, metric):
+        if metric not in METRICS:
+            raise KeyError(metric)
+        return getattr(self, metric)
+
+    def label(self, index, default=None):
+        """The timestamp of log `index` as an ISO string ('...Z'), or `default` without timestamps"""
+        if self.timestamp is None:
+            return default
+        if self._labels is not None:
+            return self._labels[index]
+        return self.timestamp[index].astype(object).isoformat() + 'Z'
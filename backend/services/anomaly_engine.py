@@ -0,0 +1,142 @@
+import numpy as np
+
+from .analytics_frame import METRICS
+
+# Scales a median absolute deviation (or, when that is 0, a mean absolute
+# deviation) to a standard deviation for normally distributed data
+_MAD_TO_STD = 1.4826
+_MEAN_AD_TO_STD = 1.2533
+
+# Spreads below this are rounding noise on a constant series
+_MIN_SPREAD = 1e-9
+
+def _median(padded, count):
+    """Median down each column of NaN-padded (users, rows, metrics) values, `count` values per user"""
+    ordered = np.sort(padded, axis=1)  # NaN padding sorts last
+    shape = (padded.shape[0], 1, padded.shape[2])
+    low = np.take_along_axis(ordered, np.broadcast_to((count - 1) // 2, shape), axis=1)
+    high = np.take_along_axis(ordered, np.broadcast_to(count // 2, shape), axis=1)
+    return (low + high) / 2
+
+class AnomalyEngine:
+    """Unusual spikes and drops across the four metrics, for one user or many
+
+    Each detector scores every value of every metric in a few array
+    operations over a (users, rows, metrics) block, padded and masked so
+    users with different history lengths run together:
+
+    - zscore: distance from the mean in standard deviations
+    - mad: distance from the median in robust standard deviations (median
+      absolute deviation), so a few extreme days don't hide each other
+    - rolling: distance from the mean of the preceding `window` logs, as a
+      streaming check would score each log on arrival; logs with fewer
+      than `min_periods` before them aren't scored
+
+    Values scoring above `threshold` are anomalies, 'high' severity above
+    `high_threshold`; each user gets the `limit` highest scoring.
+    """
+
+    METHODS = ('zscore', 'mad', 'rolling')
+
+    def __init__(self, method='zscore', threshold=2.0, high_threshold=3.0, window=14, min_periods=7, limit=5):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown anomaly method {method!r}; choose from {', '.join(self.METHODS)}")
+        self.method = method
+        self.threshold = threshold
+        self.high_threshold = high_threshold
+        self.window = window
+        self.min_periods = min_periods
+        self.limit = limit
+
+    def detect(self, frame):
+        """Top anomalies in one AnalyticsFrame, highest score first"""
+        return self.detect_many([frame])[0]
+
+    def detect_many(self, frames):
+        """Top anomalies for each of many users' AnalyticsFrames, in one pass"""
+        if not frames:
+            return []
+        values, mask = self._stack(frames)
+        scores, center, spread = getattr(self, f'_{self.method}')(values, mask)
+
+        results = []
+        for user, frame in enumerate(frames):
+            user_scores = scores[user, :len(frame)]
+            # Metric by metric, then log order, as the scores are ranked stably
+            metric, row = np.nonzero((user_scores > self.threshold).T)
+            top = np.argsort(-user_scores[row, metric], kind='stable')[:self.limit]
+            results.append([
+                self._anomaly(frame, row[hit], metric[hit], values[user, row[hit], metric[hit]],
+                              user_scores[row[hit], metric[hit]],
+                              self._at(center, user, row[hit], metric[hit]),
+                              self._at(spread, user, row[hit], metric[hit]))
+                for hit in top.tolist()
+            ])
+        return results
+
+    def _stack(self, frames):
+        """(users, rows, metrics) values padded with zeros after each history, and its row mask"""
+        lengths = np.array([len(frame) for frame in frames])
+        values = np.zeros((len(frames), lengths.max(), len(METRICS)))
+        for user, frame in enumerate(frames):
+            for column, metric in enumerate(METRICS):
+                values[user, :len(frame), column] = frame[metric]
+        mask = np.arange(lengths.max()) < lengths[:, None]
+        return values, mask[:, :, None]
+
+    def _zscore(self, values, mask):
+        count = np.maximum(mask.sum(axis=1, keepdims=True), 1)
+        mean = np.where(mask, values, 0).sum(axis=1, keepdims=True) / count
+        std = np.sqrt((np.where(mask, values - mean, 0) ** 2).sum(axis=1, keepdims=True) / count)
+        return self._scores(values, mask, mean, std), mean, std
+
+    def _mad(self, values, mask):
+        count = np.maximum(mask.sum(axis=1, keepdims=True), 1)
+        median = _median(np.where(mask, values, np.nan), count)
+        deviation = np.where(mask, np.abs(values - median), np.nan)
+        spread = _MAD_TO_STD * _median(deviation, count)
+        # Mostly identical values leave a zero MAD; fall back to the mean deviation
+        mean_deviation = np.where(mask, deviation, 0).sum(axis=1, keepdims=True) / count
+        spread = np.where(spread > _MIN_SPREAD, spread, _MEAN_AD_TO_STD * mean_deviation)
+        return self._scores(values, mask, median, spread), median, spread
+
+    def _rolling(self, values, mask):
+        # Prefix sums, so the window before each row is a difference of two
+        observed = np.where(mask, values, 0)
+        leading = np.zeros((values.shape[0], 1, values.shape[2]))
+        sums = np.concatenate([leading, np.cumsum(observed, axis=1)], axis=1)
+        squares = np.concatenate([leading, np.cumsum(observed ** 2, axis=1)], axis=1)
+        counts = np.concatenate([leading[:, :, :1], np.cumsum(mask, axis=1)], axis=1)
+
+        rows = np.arange(values.shape[1])
+        start = np.maximum(rows - self.window, 0)
+        count = counts[:, rows] - counts[:, start]
+        safe_count = np.maximum(count, 1)
+        mean = (sums[:, rows] - sums[:, start]) / safe_count
+        variance = (squares[:, rows] - squares[:, start]) / safe_count - mean ** 2
+        std = np.sqrt(np.maximum(variance, 0))
+        return self._scores(values, mask & (count >= self.min_periods), mean, std), mean, std
+
+    def _scores(self, values, mask, center, spread):
+        """|value - center| / spread where scored, else 0"""
+        scored = mask & (spread > _MIN_SPREAD)
+        return np.divide(np.abs(values - center), spread, out=np.zeros(values.shape), where=scored)
+
+    def _at(self, array, user, row, metric):
+        """An element of a per-user (1 row) or per-row center/spread array"""
+        return float(array[user, row if array.shape[1] > 1 else 0, metric])
+
+    def _anomaly(self, frame, row, metric, value, score, center, spread):
+        name = METRICS[metric]
+        value = float(value)
+        anomaly_type = 'spike' if value > center else 'drop'
+        return {
+            'metric': name,
+            'type': anomaly_type,
+            'value': round(value, 2),
+            'expected_range': f"{round(center - spread, 2)} - {round(center + spread, 2)}",
+            'severity': 'high' if score > self.high_threshold else 'medium',
+            'date': frame.label(row, f'Entry {row + 1}'),
+            'z_score': round(float(score), 2),
+            'message': f"Unusual {anomaly_type} in {name}: {value:.1f} (normal range: {center - spread:.1f}-{center + spread:.1f})"
+        }
@@ -0,0 +1,134 @@
+from datetime import datetime
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+
+def data_fingerprint(frame):
+    """Stable SHA-256 of a DataFrame's values, independent of its index"""
+    digest = hashlib.sha256()
+    digest.update(','.join(map(str, frame.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return f'sha256:{digest.hexdigest()}'
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as artifact_file:
+        for block in iter(lambda: artifact_file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _library_versions():
+    return {'sklearn': sklearn.__version__, 'numpy': np.__version__, 'joblib': joblib.__version__}
+
+class ArtifactStore:
+    """Content-addressed, versioned model artifacts
+
+    Each save writes `<name>/<hash>.joblib`, named by the SHA-256 of its
+    bytes, with a JSON manifest beside it (hash, size, library versions,
+    training data fingerprint and caller metadata), then points
+    `<name>/current.json` at it. Saving identical models again reuses the
+    same file. Artifacts are stored uncompressed so loading can memory-map
+    their numpy arrays: every process then reads the same page-cache pages
+    instead of unpickling a private copy.
+
+    The content hash is computed once, when the artifact is published. Loads
+    compare the file's size and modification time with the manifest and
+    only re-hash the file when those differ (e.g. after copying it).
+    """
+
+    KEEP_VERSIONS = 3
+
+    def __init__(self, directory, mmap=True):
+        self.directory = directory
+        self.mmap = mmap
+
+    def save(self, name, payload, metadata=None):
+        """Write an artifact and make it current; returns its manifest"""
+        artifact_dir = os.path.join(self.directory, name)
+        os.makedirs(artifact_dir, exist_ok=True)
+
+        temp_path = os.path.join(artifact_dir, f'.{os.getpid()}.joblib.tmp')
+        joblib.dump(payload, temp_path)
+        content_hash = _file_sha256(temp_path)
+        artifact = f'{content_hash[:16]}.joblib'
+        os.replace(temp_path, os.path.join(artifact_dir, artifact))
+        stat = os.stat(os.path.join(artifact_dir, artifact))
+
+        manifest = {
+            'name': name,
+            'version': f'sha256:{content_hash[:16]}',
+            'artifact': artifact,
+            'sha256': content_hash,
+            'size_bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'created_at': datetime.utcnow().isoformat() + 'Z',
+            'libraries': _library_versions(),
+            **(metadata or {})
+        }
+        self._write_json(os.path.join(artifact_dir, f'{content_hash[:16]}.json'), manifest)
+        self._write_json(os.path.join(artifact_dir, 'current.json'), manifest)
+        self._prune(artifact_dir, artifact)
+        return manifest
+
+    def load(self, name, verify=True):
+        """The current artifact's payload and manifest, or (None, None)
+
+        Artifacts written by other library versions count as missing, since
+        their pickled models may not load (or predict) the same way. With
+        `verify`, a file whose size or modification time no longer matches
+        the manifest is re-hashed and ignored if its content changed.
+        """
+        manifest = self.manifest(name)
+        if manifest is None:
+            return None, None
+        if manifest.get('libraries') != _library_versions():
+            print(f"⚠️ Artifact {name} {manifest['version']} was built with {manifest.get('libraries')}; ignoring it")
+            return None, None
+
+        path = os.path.join(self.directory, name, manifest['artifact'])
+        try:
+            if verify and not self._unchanged(path, manifest) and _file_sha256(path) != manifest['sha256']:
+                print(f"⚠️ Artifact {name} {manifest['version']} is corrupt; ignoring it")
+                return None, None
+            payload = joblib.load(path, mmap_mode='r' if self.mmap else None)
+        except FileNotFoundError:
+            return None, None
+        return payload, manifest
+
+    def manifest(self, name):
+        """The current artifact's manifest, or None"""
+        try:
+            with open(os.path.join(self.directory, name, 'current.json'), encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return None
+
+    def _unchanged(self, path, manifest):
+        """Whether the file still has the size and modification time it was published with"""
+        stat = os.stat(path)
+        return stat.st_size == manifest['size_bytes'] and stat.st_mtime_ns == manifest.get('mtime_ns')
+
+    def _write_json(self, path, data):
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as json_file:
+            json.dump(data, json_file, indent=2)
+        os.replace(temp_path, path)
+
+    def _prune(self, artifact_dir, current):
+        """Keep the newest KEEP_VERSIONS artifacts for rollback"""
+        artifacts = sorted(
+            (name for name in os.listdir(artifact_dir) if name.endswith('.joblib') and name != current),
+            key=lambda name: os.path.getmtime(os.path.join(artifact_dir, name)),
+            reverse=True
+        )
+        for name in artifacts[self.KEEP_VERSIONS - 1:]:
+            for path in (name, name.replace('.joblib', '.json')):
+                try:
+                    os.remove(os.path.join(artifact_dir, path))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,171 @@
+"""Lightweight per-stage latency metrics for the context classifier"""
+from contextlib import nullcontext
+import bisect
+import threading
+import time
+
+# Histogram bucket upper bounds in milliseconds; one more bucket holds the rest
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Journal length buckets as (upper bound in characters, label)
+LENGTH_BUCKETS = ((256, '<256'), (1024, '256-1k'), (4096, '1k-4k'), (None, '4k+'))
+
+_NOOP = nullcontext()
+
+# Stage timings of the request being handled on this thread (Server-Timing)
+_request_local = threading.local()
+
+class _Histogram:
+    """Fixed-bucket latency histogram"""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return None
+
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= q * self.count:
+                return min(bound, round(self.max, 3))
+        return round(self.max, 3)
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 3) if self.count else None,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max, 3),
+            'buckets': {
+                **{f'le_{bound}': count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts)},
+                f'gt_{LATENCY_BUCKETS_MS[-1]}': self.counts[-1]
+            }
+        }
+
+class _Timer:
+    """Context manager timing one stage; cheaper than a generator-based one"""
+
+    __slots__ = ('metrics', 'name', 'length', 'start')
+
+    def __init__(self, metrics, name, length):
+        self.metrics = metrics
+        self.name = name
+        self.length = length
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, (time.perf_counter() - self.start) * 1000, self.length)
+        return False
+
+class ClassifierMetrics:
+    """Stage histograms, event counters and length buckets
+
+    When disabled, stage() returns a shared no-op context manager and event()
+    returns immediately, so instrumented code pays nothing. With
+    `server_timing` off, stages aren't reported in the request's
+    Server-Timing header.
+    """
+
+    def __init__(self, enabled=True, server_timing=True):
+        self.enabled = enabled
+        self.server_timing = server_timing
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+            self._events = {}
+            self._lengths = {label: _Histogram() for _, label in LENGTH_BUCKETS}
+
+    def stage(self, name, length=None):
+        """Time the enclosed block as `name`; `length` also files it by text length"""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, name, length)
+
+    def event(self, name):
+        """Count an occurrence (cache hit, fast path, ...)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._events[name] = self._events.get(name, 0) + 1
+
+    def observe(self, name, ms, length=None):
+        """Record a duration measured elsewhere"""
+        with self._lock:
+            histogram = self._stages.get(name)
+            if histogram is None:
+                histogram = self._stages[name] = _Histogram()
+            histogram.observe(ms)
+            if length is not None:
+                self._lengths[self._length_label(length)].observe(ms)
+
+        timings = getattr(_request_local, 'timings', None) if self.server_timing else None
+        if timings is not None:
+            timings.append((name, ms))
+
+    def snapshot(self):
+        """Everything recorded so far, JSON-serializable"""
+        with self._lock:
+            stages = {name: histogram.snapshot() for name, histogram in self._stages.items()}
+            events = dict(self._events)
+            lengths = {label: histogram.snapshot() for label, histogram in self._lengths.items()}
+
+        # Every journal long enough to classify is either answered by the
+        # fast path or looked up in the cache
+        lookups = events.get('cache_hit', 0) + events.get('cache_miss', 0)
+        classified = lookups + events.get('fast_path', 0)
+
+        return {
+            'enabled': self.enabled,
+            'stages': stages,
+            'events': events,
+            'length_buckets': lengths,
+            'cache_hit_rate': round(events.get('cache_hit', 0) / lookups, 3) if lookups else 0.0,
+            'fast_path_rate': round(events.get('fast_path', 0) / classified, 3) if classified else 0.0
+        }
+
+    @staticmethod
+    def _length_label(length):
+        for bound, label in LENGTH_BUCKETS:
+            if bound is None or length < bound:
+                return label
+
+def begin_request_timing():
+    """Start collecting the stages timed on this thread for one request"""
+    _request_local.timings = []
+
+def end_request_timing():
+    """Stop collecting and return the (stage, ms) pairs recorded on this thread"""
+    timings = getattr(_request_local, 'timings', None)
+    _request_local.timings = None
+    return timings or []
+
+def server_timing_header(timings):
+    """Format stage timings as a Server-Timing header value"""
+    totals = {}
+    for name, ms in timings:
+        totals[name] = totals.get(name, 0.0) + ms
+
+    return ', '.join(f"{name};dur={ms:.2f}" for name, ms in totals.items())
@@ -1,129 +1,722 @@
+from concurrent.futures import Future, ThreadPoolExecutor
 from transformers import pipeline
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import hashlib
+import numpy as np
+import queue
 import re
+import threading
+import time
+
+from config.settings import get_config
+from .classification_cache import ClassificationCache
+from .classifier_metrics import ClassifierMetrics
+from .label_taxonomy import all_labels, group_hypotheses, group_keys, group_of, labels_in_group
+from .model_warmup import reset_after_fork
+from .onnx_backend import OnnxNLIBackend
+from .safety_matcher import SafetyMatcher
+from .student_classifier import StudentClassifier, TeacherLog
+
+
+class BatchingInferenceService:
+    """Coalesces concurrent classification requests into batched NLI passes"""
+    
+    def __init__(self, rank_fn, window_ms=10, max_batch=16):
+        self._rank_fn = rank_fn
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        reset_after_fork(self, BatchingInferenceService._reset_after_fork)
+    
+    def submit(self, text):
+        """Queue one text for ranking; returns a Future"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+    
+    def stop(self):
+        """Stop the dispatcher thread after the queued requests are served"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+    
+    def stats(self):
+        """Batching counters for throughput monitoring"""
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': round(self.items / self.batches, 2) if self.batches else 0.0
+        }
+    
+    def _reset_after_fork(self):
+        """A forked child gets no dispatcher thread; start its own on first submit"""
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._dispatch_loop, name='classifier-batcher', daemon=True
+                    )
+                    self._thread.start()
+    
+    def _dispatch_loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            
+            # Collect whatever else arrives within the window, up to max_batch
+            batch = [first]
+            deadline = time.monotonic() + self.window
+            stopping = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            self._run_batch(batch)
+            if stopping:
+                return
+    
+    def _run_batch(self, batch):
+        batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        
+        try:
+            rankings = self._rank_fn([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        
+        self.batches += 1
+        self.items += len(batch)
+        for (_, future), ranking in zip(batch, rankings):
+            future.set_result(ranking)
+
 
 class ContextClassifier:
     """Intelligent context classification system"""
     
-    def __init__(self):
+    HYPOTHESIS_TEMPLATE = "This example is {}."
+    
+    # Categories answered with critical urgency; the shortlist and
+    # hierarchical strategies always score them
+    CRITICAL_CATEGORIES = [
+        "Medical Emergency", "Physical Assault", "Sexual Harassment",
+        "Stalking", "Suicidal Ideation", "Self-Harm", "Heart Attack",
+        "Stroke", "Seizure", "Heavy Bleeding", "Overdose"
+    ]
+    
+    def __init__(self, settings=None):
+        settings = settings or get_config()
+        self.model_name = settings.AI_MODELS['classifier']
+        self.embedder_name = settings.AI_MODELS['embedder']
+        self.strategy = settings.CLASSIFIER_STRATEGY
+        self.shortlist_k = settings.CLASSIFIER_SHORTLIST_K
+        self.hierarchy_top_groups = settings.CLASSIFIER_HIERARCHY_TOP_GROUPS
+        self.hierarchy_min_group_score = settings.CLASSIFIER_HIERARCHY_MIN_GROUP_SCORE
+        self.nli_batch_size = settings.CLASSIFIER_NLI_BATCH_SIZE
+        self.chunking_enabled = settings.CLASSIFIER_CHUNKING_ENABLED
+        self.chunk_tokens = settings.CLASSIFIER_CHUNK_TOKENS
+        self.chunk_overlap = min(settings.CLASSIFIER_CHUNK_OVERLAP, self.chunk_tokens // 2)
+        self.chunk_aggregation = settings.CLASSIFIER_CHUNK_AGGREGATION
+        self.max_tokens = settings.CLASSIFIER_MAX_TOKENS
+        self.backend = settings.CLASSIFIER_BACKEND
+        
         self.classifier = None
+        self.nli_backend = None
+        if self.backend == 'onnx':
+            self.nli_backend = OnnxNLIBackend(
+                self.model_name,
+                settings.AI_MODEL_CACHE_DIR,
+                intra_op_threads=settings.CLASSIFIER_ONNX_THREADS
+            )
+        self.is_initialized = False
+        # While the background warm-up is loading the models, answer from the
+        # cheap degraded path instead of blocking requests on the model load.
+        # A warm-up that failed or never started doesn't keep requests degraded:
+        # they load the models themselves, at most once per retry interval
+        self.degrade_until_ready = settings.MODEL_WARMUP_ENABLED
+        self.init_retry_seconds = settings.CLASSIFIER_INIT_RETRY_SECONDS
+        self.init_error = None
+        self._warming = threading.Event()
+        self._retry_at = 0.0
+        self.embedder = None
+        self.label_embeddings = None
         self.analyzer = SentimentIntensityAnalyzer()
         self.labels = self._get_classification_labels()
+        self._init_lock = threading.Lock()
+        # A worker forked mid warm-up must not inherit the held lock or the flag
+        reset_after_fork(self, ContextClassifier._reset_after_fork)
+        self.metrics = ClassifierMetrics(enabled=settings.CLASSIFIER_METRICS_ENABLED)
+        
+        # Cached results are only valid for the same model, strategy and labels
+        self.cache = ClassificationCache(
+            max_entries=settings.CLASSIFIER_CACHE_SIZE,
+            ttl_seconds=settings.CLASSIFIER_CACHE_TTL
+        )
+        # A distilled TF-IDF student answers the journals it is confident
+        # about; the NLI model only runs for the rest, and its answers are
+        # logged so the student can be retrained on them
+        self.student = None
+        self.student_min_confidence = settings.CLASSIFIER_STUDENT_MIN_CONFIDENCE
+        if settings.CLASSIFIER_STUDENT_ENABLED:
+            self.student = self._load_student(settings.CLASSIFIER_STUDENT_PATH)
+        self.teacher_log = None
+        if settings.CLASSIFIER_TEACHER_LOG:
+            self.teacher_log = TeacherLog(
+                settings.CLASSIFIER_TEACHER_LOG,
+                max_bytes=int(settings.CLASSIFIER_TEACHER_LOG_MAX_MB * 1024 * 1024)
+            )
+        
+        self._set_versions()
+        
+        # Critical journals are answered from the phrase lexicon before any model
+        # runs; the model can still check the verdict in the background
+        self.safety_matcher = SafetyMatcher() if settings.SAFETY_FAST_PATH_ENABLED else None
+        self.safety_min_confidence = settings.SAFETY_FAST_PATH_MIN_CONFIDENCE
+        self._refiner = ThreadPoolExecutor(max_workers=1) if settings.SAFETY_REFINE_ASYNC else None
+        self.safety_stats = {'fast_path_hits': 0, 'refined': 0, 'model_agreed': 0}
+        
+        self.batcher = None
+        if settings.CLASSIFIER_BATCHING_ENABLED:
+            self.batcher = BatchingInferenceService(
+                self._rank_texts,
+                window_ms=settings.CLASSIFIER_BATCH_WINDOW_MS,
+                max_batch=settings.CLASSIFIER_MAX_BATCH
+            )
+        
+    def _set_versions(self):
+        """Version the NLI answers and cached results by everything that shapes them"""
+        teacher_digest = hashlib.sha1('\x00'.join(
+            [self.model_name, self.backend, self.embedder_name, self.strategy, str(self.shortlist_k),
+             str(self.hierarchy_top_groups), str(self.hierarchy_min_group_score),
+             str(self.chunking_enabled), str(self.chunk_tokens), str(self.chunk_overlap),
+             self.chunk_aggregation, str(self.max_tokens)]
+            + self.labels
+        ).encode('utf-8')).hexdigest()
+        self.teacher_version = f"nli-{teacher_digest[:12]}"
+        self.cache_version = hashlib.sha1(
+            f"{teacher_digest}\x00{self.student.version if self.student else ''}".encode('utf-8')
+        ).hexdigest()
         
     def initialize(self):
         """Initialize the classification model"""
         print("📚 Loading Context Classifier...")
-        self.classifier = pipeline(
-            "zero-shot-classification",
-            model="valhalla/distilbart-mnli-12-1",
-            device=-1
-        )
-        print("✅ Context Classifier ready")
+        if self.nli_backend is not None:
+            # The quantized backend replaces the PyTorch pipeline entirely
+            try:
+                self.nli_backend.load()
+            except ImportError as e:
+                # onnx/onnxruntime are optional; without them serve from PyTorch
+                print(f"⚠️ ONNX backend unavailable ({e}); falling back to PyTorch")
+                self.nli_backend = None
+                self.backend = 'torch'
+                self._set_versions()
+        if self.nli_backend is None:
+            self.classifier = pipeline(
+                "zero-shot-classification",
+                model=self.model_name,
+                device=-1
+            )
+        
+        if self.strategy == 'shortlist':
+            # Label embeddings only depend on the label set, so build them once
+            self.embedder = pipeline(
+                "feature-extraction",
+                model=self.embedder_name,
+                device=-1
+            )
+            self.label_embeddings = self._embed(self.labels)
+        
+        self.is_initialized = True
+        print(f"✅ Context Classifier ready (strategy: {self.strategy}, backend: {self.backend})")
+    
+    def _load_student(self, path):
+        """The trained student, or None if there is none usable for these labels"""
+        student = StudentClassifier(path)
+        if not student.load():
+            return None
+        
+        unknown = set(student.metadata['labels']) - set(self.labels)
+        if unknown:
+            print(f"⚠️ Student classifier ignored: labels no longer in the taxonomy: {sorted(unknown)}")
+            return None
+        
+        return student
+    
+    def _ensure_initialized(self):
+        """Load the models once, even when several threads race to classify"""
+        if not self.is_initialized:
+            with self._init_lock:
+                self._load_models()
+    
+    def _load_models(self):
+        """initialize() under _init_lock, recording a failure for the retry interval"""
+        if self.is_initialized:
+            return
+        try:
+            self.initialize()
+        except Exception as e:
+            self.init_error = str(e)
+            self._retry_at = time.monotonic() + self.init_retry_seconds
+            raise
+        self.init_error = None
+    
+    def warmup(self):
+        """Load the models and run one dummy inference through the full path"""
+        self._warming.set()
+        try:
+            self._ensure_initialized()
+            self._rank_texts(["Warming up the context classifier."])
+        finally:
+            self._warming.clear()
+    
+    def _reset_after_fork(self):
+        self._init_lock = threading.Lock()
+        self._warming = threading.Event()
+    
+    def _should_degrade(self):
+        """Whether to answer without the models because they aren't loaded yet
+
+        Only when degrading is enabled: while warm-up is loading them, or
+        within the retry interval after a failed load. Otherwise the models
+        are loaded here, so requests recover once a failed load succeeds.
+        """
+        if self.is_initialized or not self.degrade_until_ready:
+            return False
+        if self._warming.is_set() or time.monotonic() < self._retry_at:
+            return True
+        # Requests arriving while another one loads the models don't queue behind it
+        if not self._init_lock.acquire(blocking=False):
+            return True
+        try:
+            self._load_models()
+        except Exception as e:
+            print(f"⚠️ Context classifier failed to load, retrying in {self.init_retry_seconds:.0f}s: {e}")
+            return True
+        finally:
+            self._init_lock.release()
+        return False
+    
+    def readiness(self):
+        """How classifications are currently answered, for /api/health"""
+        if self.is_initialized:
+            state = 'ready'
+        elif self._warming.is_set():
+            state = 'warming'
+        elif self.init_error is not None:
+            state = 'failed'
+        else:
+            state = 'not_loaded'
+        return {
+            'state': state,
+            'degraded': state != 'ready' and self.degrade_until_ready and (
+                state == 'warming' or time.monotonic() < self._retry_at
+            ),
+            'error': self.init_error
+        }
     
     def _get_classification_labels(self):
         """Get comprehensive list of classification labels"""
-        return [
-            # === URGENT SAFETY ===
-            "Medical Emergency", "Physical Assault", "Sexual Harassment", "Stalking", 
-            "Blackmail", "Robbery", "Domestic Violence", "Child Abuse", "Ragging",
-            "Bullying", "Cyberbullying", "Suicidal Ideation", "Self-Harm",
-            
-            # === HEALTH - URGENT ===
-            "Heart Attack", "Stroke", "Severe Allergic Reaction", "Seizure",
-            "Heavy Bleeding", "Head Injury", "Broken Bone", "Overdose",
-            
-            # === HEALTH - COMMON ===
-            "Menstrual Pain", "Headache", "Migraine", "Back Pain", "Stomach Ache",
-            "Food Poisoning", "Flu", "Fever", "Common Cold", "Insomnia",
-            "Fatigue", "Muscle Pain", "Skin Rash", "Toothache",
-            
-            # === MENTAL HEALTH ===
-            "Panic Attack", "High Anxiety", "Social Anxiety", "Depression",
-            "Burnout", "Imposter Syndrome", "ADHD", "Stress Overload",
-            "Grief", "Loneliness", "Heartbreak", "Existential Crisis",
-            
-            # === EMOTIONS ===
-            "Anger", "Frustration", "Jealousy", "Guilt", "Shame", "Confusion",
-            "Overwhelmed", "Excited", "Grateful", "Inspired", "Bored",
-            
-            # === ACADEMIC ===
-            "Exam Stress", "Thesis Writing", "Assignment Deadline", "Group Project",
-            "Academic Probation", "Teacher Conflict", "Study Abroad", 
-            "College Application", "Graduation Anxiety",
-            
-            # === WORK & CAREER ===
-            "Job Interview", "Resume Writing", "Salary Negotiation", "Getting Fired",
-            "Toxic Boss", "Workplace Harassment", "Deadline Crunch", "Procrastination",
-            "Career Change", "Promotion", "Work-Life Balance", "Remote Work",
-            
-            # === BUSINESS & FINANCE ===
-            "Starting a Business", "Cash Flow Crisis", "Debt", "Investment Decision",
-            "Tax Issues", "Bankruptcy", "Budget Planning", "Credit Problems",
-            
-            # === RELATIONSHIPS ===
-            "Breakup", "Divorce", "Cheating", "Trust Issues", "Toxic Relationship",
-            "Gaslighting", "Dating", "Marriage", "In-Law Conflict", "Friendship",
-            "Making Friends", "Family Conflict",
-            
-            # === PARENTING ===
-            "Pregnancy", "Postpartum Depression", "Childcare", "Teenager Issues",
-            "Toddler Tantrum", "School Problems", "Parenting Stress",
-            
-            # === LIFESTYLE ===
-            "Moving House", "Home Renovation", "Cleaning", "Decluttering",
-            "Fitness Goals", "Weight Loss", "Nutrition", "Cooking",
-            "Travel Planning", "Hobby", "Time Management", "Sleep Schedule",
-            
-            # === TECHNOLOGY ===
-            "Device Issues", "Cybersecurity", "Social Media Addiction", 
-            "Digital Detox", "Gaming", "Technical Problem",
-            
-            # === GENERAL ===
-            "General Productivity", "Personal Growth", "Skill Learning",
-            "Creative Block", "Decision Making", "Goal Setting"
-        ]
+        return all_labels()
     
     def classify(self, text):
         """Classify text into context categories"""
+        with self.metrics.stage('classify', length=len(text or '')):
+            return self._classify(text)
+    
+    def _classify(self, text):
         if not text or len(text) < 3:
-            return {
-                'category': 'General Productivity',
-                'confidence': 0.5,
-                'urgency': 'low',
-                'sentiment': self._analyze_sentiment("")
-            }
+            return self._default_result()
+        
+        with self.metrics.stage('safety_fast_path'):
+            safety_result = self._safety_fast_path(text)
+        if safety_result is not None:
+            return safety_result
+        
+        # The same journal is often classified twice in a row (analyze, then log)
+        with self.metrics.stage('cache_lookup'):
+            cache_key = self.cache.make_key(text, self.cache_version)
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.metrics.event('cache_hit')
+            return cached
+        self.metrics.event('cache_miss')
+        
+        student_result = self._student_results([text])[0]
+        if student_result is not None:
+            self.cache.set(cache_key, student_result)
+            return student_result
+        
+        if self._should_degrade():
+            self.metrics.event('degraded')
+            return self._degraded_result(text)
         
         # Initialize classifier if needed
-        if self.classifier is None:
-            self.initialize()
+        self._ensure_initialized()
         
-        # Perform classification
-        result = self.classifier(text, self.labels)
+        # Perform classification; with batching this includes the queue wait
+        with self.metrics.stage('inference'):
+            if self.batcher is not None:
+                labels, scores = self.batcher.submit(text).result()
+            else:
+                labels, scores = self._rank_texts([text])[0]
         
-        category = result['labels'][0]
-        confidence = result['scores'][0]
+        result = self._build_result(text, labels, scores, self.teacher_version)
+        self.cache.set(cache_key, result)
+        self._log_teacher(text, labels, scores)
         
-        # Analyze sentiment
+        return result
+    
+    def classify_batch(self, texts):
+        """Classify several texts with one batched NLI pass"""
+        results = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if not text or len(text) < 3:
+                results[i] = self._default_result()
+                continue
+            
+            results[i] = self._safety_fast_path(text, refine=False)
+            if results[i] is None:
+                results[i] = self.cache.get(self.cache.make_key(text, self.cache_version))
+                self.metrics.event('cache_miss' if results[i] is None else 'cache_hit')
+            if results[i] is None:
+                pending.append(i)
+        
+        if pending:
+            student_results = self._student_results([texts[i] for i in pending])
+            for i, result in zip(pending, student_results):
+                if result is not None:
+                    results[i] = result
+                    self.cache.set(self.cache.make_key(texts[i], self.cache_version), result)
+            pending = [i for i in pending if results[i] is None]
+        
+        if pending and self._should_degrade():
+            for i in pending:
+                results[i] = self._degraded_result(texts[i])
+            pending = []
+        
+        if pending:
+            self._ensure_initialized()
+            pending_texts = [texts[i] for i in pending]
+            with self.metrics.stage('inference'):
+                rankings = self._rank_texts(pending_texts)
+            for i, text, (labels, scores) in zip(pending, pending_texts, rankings):
+                results[i] = self._build_result(text, labels, scores, self.teacher_version)
+                self.cache.set(self.cache.make_key(text, self.cache_version), results[i])
+                self._log_teacher(text, labels, scores)
+        
+        return results
+    
+    def _student_results(self, texts):
+        """Student results for the texts it is confident about, None for the rest"""
+        if self.student is None:
+            return [None] * len(texts)
+        
+        with self.metrics.stage('student'):
+            rankings = self.student.predict(texts)
+        
+        results = []
+        for text, (labels, scores) in zip(texts, rankings):
+            if scores[0] >= self.student_min_confidence:
+                self.metrics.event('student_hit')
+                results.append(self._build_result(text, labels, scores, self.student.version))
+            else:
+                self.metrics.event('student_fallback')
+                results.append(None)
+        
+        return results
+    
+    def _log_teacher(self, text, labels, scores):
+        """Record an NLI classification as training data for the student"""
+        if self.teacher_log is None:
+            return
+        
+        try:
+            self.teacher_log.append(text, labels[0], scores[0], self.teacher_version)
+        except OSError as e:
+            print(f"⚠️ Could not write teacher log: {e}")
+    
+    def _safety_fast_path(self, text, refine=True):
+        """Critical classification straight from the safety lexicon, if it is confident"""
+        if self.safety_matcher is None:
+            return None
+        
+        match = self.safety_matcher.match(text)
+        if match is None or match['confidence'] < self.safety_min_confidence:
+            return None
+        
+        self.safety_stats['fast_path_hits'] += 1
+        self.metrics.event('fast_path')
+        category = match['category']
+        
+        if refine and self._refiner is not None and self.is_initialized:
+            self._refiner.submit(self._refine_safety_result, text, category)
+        
+        return {
+            'category': category,
+            'group': group_of(category),
+            'confidence': match['confidence'],
+            'urgency': 'critical',
+            'sentiment': self._analyze_sentiment(text),
+            'keywords': self._extract_keywords(text),
+            'alternate_categories': match['alternates'][:2],
+            'fast_path': 'safety',
+            'model_version': 'safety-lexicon',
+            'safety_response': self.get_safety_response(category, 'critical')
+        }
+    
+    def _refine_safety_result(self, text, fast_category):
+        """Run the model on a fast-path journal and record whether it agrees"""
+        try:
+            labels, scores = self._rank_texts([text])[0]
+        except Exception as e:
+            print(f"⚠️ Safety refinement failed: {e}")
+            return
+        
+        self.safety_stats['refined'] += 1
+        if self._determine_urgency(labels[0], text, self._analyze_sentiment(text)) == 'critical':
+            self.safety_stats['model_agreed'] += 1
+        else:
+            print(f"🔎 Safety fast path chose {fast_category}; model chose {labels[0]} ({scores[0]:.2f})")
+    
+    def _default_result(self):
+        """Result for texts too short to classify"""
+        return {
+            'category': 'General Productivity',
+            'group': group_of('General Productivity'),
+            'confidence': 0.5,
+            'urgency': 'low',
+            'sentiment': self._analyze_sentiment("")
+        }
+    
+    def _degraded_result(self, text):
+        """Model-free result served while the classifier is still loading"""
         sentiment = self._analyze_sentiment(text)
+        category = 'General Productivity'
+        
+        return {
+            'category': category,
+            'group': group_of(category),
+            'confidence': 0.0,
+            'urgency': self._determine_urgency(category, text, sentiment),
+            'sentiment': sentiment,
+            'keywords': self._extract_keywords(text),
+            'alternate_categories': [],
+            'degraded': True,
+            'model_version': 'degraded'
+        }
+    
+    def _build_result(self, text, labels, scores, model_version):
+        """Assemble the classification response from ranked labels"""
+        category = labels[0]
+        confidence = scores[0]
+        
+        # Analyze sentiment
+        with self.metrics.stage('sentiment'):
+            sentiment = self._analyze_sentiment(text)
         
         # Determine urgency
-        urgency = self._determine_urgency(category, text, sentiment)
+        with self.metrics.stage('urgency'):
+            urgency = self._determine_urgency(category, text, sentiment)
         
         # Extract keywords
-        keywords = self._extract_keywords(text)
+        with self.metrics.stage('keywords'):
+            keywords = self._extract_keywords(text)
         
         return {
             'category': category,
+            'group': group_of(category),
             'confidence': round(confidence, 2),
             'urgency': urgency,
             'sentiment': sentiment,
             'keywords': keywords,
             'alternate_categories': [
-                {'category': result['labels'][i], 'confidence': round(result['scores'][i], 2)}
-                for i in range(1, min(3, len(result['labels'])))
-            ]
+                {'category': labels[i], 'confidence': round(scores[i], 2)}
+                for i in range(1, min(3, len(labels)))
+            ],
+            'model_version': model_version
         }
     
+    def _rank_texts(self, texts):
+        """Rank candidate labels for each text using the configured strategy"""
+        with self.metrics.stage('chunking'):
+            chunked = [self._chunk_text(text) for text in texts]
+        if self.strategy == 'hierarchical':
+            return self._rank_hierarchical(chunked)
+        
+        return self._rank_labels(chunked, self._candidate_labels(chunked))
+    
+    def _chunk_text(self, text):
+        """Split a journal into overlapping token windows within the token budget"""
+        # Byte-level BPE never produces more tokens than UTF-8 bytes, so short
+        # journals skip tokenization entirely
+        if not self.chunking_enabled or len(text.encode('utf-8')) <= self.chunk_tokens:
+            return [text]
+        
+        tokenizer = self.nli_backend.tokenizer if self.nli_backend is not None else self.classifier.tokenizer
+        offsets = tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True
+        )['offset_mapping'][:self.max_tokens]
+        if not offsets:
+            return [text]
+        
+        chunks = []
+        step = self.chunk_tokens - self.chunk_overlap
+        for start in range(0, len(offsets), step):
+            window = offsets[start:start + self.chunk_tokens]
+            chunks.append(text[window[0][0]:window[-1][1]])
+            if start + self.chunk_tokens >= len(offsets):
+                break
+        
+        return chunks
+    
+    def _rank_hierarchical(self, chunked):
+        """Coarse-to-fine ranking: score the label groups, then only their labels"""
+        groups = group_keys()
+        group_rankings = self._rank_labels(chunked, [group_hypotheses()] * len(chunked))
+        hypothesis_to_group = dict(zip(group_hypotheses(), groups))
+        
+        label_lists = []
+        for hypotheses, scores in group_rankings:
+            # Always keep the best group; add runners-up only if they are plausible
+            chosen = [hypothesis_to_group[hypotheses[0]]]
+            for hypothesis, score in zip(hypotheses[1:self.hierarchy_top_groups], scores[1:]):
+                if score >= self.hierarchy_min_group_score:
+                    chosen.append(hypothesis_to_group[hypothesis])
+            label_lists.append(self._with_critical([label for group in chosen for label in labels_in_group(group)]))
+        
+        return self._rank_labels(chunked, label_lists)
+    
+    def _rank_labels(self, chunked, label_lists):
+        """Rank each text's candidate labels, scoring all pairs in shared NLI batches"""
+        premises = []
+        hypotheses = []
+        for chunks, labels in zip(chunked, label_lists):
+            label_hypotheses = [self.HYPOTHESIS_TEMPLATE.format(label) for label in labels]
+            for chunk in chunks:
+                premises.extend([chunk] * len(labels))
+                hypotheses.extend(label_hypotheses)
+        
+        entail_logits = self._entailment_logits(premises, hypotheses)
+        
+        # Softmax the entailment logits over each text's own labels, like the
+        # zero-shot pipeline does for single-label classification, then
+        # aggregate the chunks of long texts
+        rankings = []
+        offset = 0
+        for chunks, labels in zip(chunked, label_lists):
+            chunk_scores = []
+            for _ in chunks:
+                logits = entail_logits[offset:offset + len(labels)]
+                offset += len(labels)
+                scores = np.exp(logits - logits.max())
+                chunk_scores.append(scores / scores.sum())
+            
+            if len(chunk_scores) == 1:
+                scores = chunk_scores[0]
+            else:
+                stacked = np.vstack(chunk_scores)
+                scores = stacked.max(axis=0) if self.chunk_aggregation == 'max' else stacked.mean(axis=0)
+                scores /= scores.sum()
+            order = np.argsort(-scores)
+            rankings.append(([labels[i] for i in order], [float(scores[i]) for i in order]))
+        
+        return rankings
+    
+    def _entailment_logits(self, premises, hypotheses):
+        """Entailment logit for every (premise, hypothesis) pair"""
+        # Group pairs of similar length so each forward pass pads as little as possible
+        order = sorted(range(len(premises)), key=lambda i: len(premises[i]) + len(hypotheses[i]))
+        logits = np.empty(len(premises), dtype=np.float32)
+        
+        for start in range(0, len(order), self.nli_batch_size):
+            chunk = order[start:start + self.nli_batch_size]
+            chunk_premises = [premises[i] for i in chunk]
+            chunk_hypotheses = [hypotheses[i] for i in chunk]
+            if self.nli_backend is not None:
+                with self.metrics.stage('tokenize'):
+                    inputs = self.nli_backend.tokenize(chunk_premises, chunk_hypotheses)
+                with self.metrics.stage('nli_forward'):
+                    logits[chunk] = self.nli_backend.run(inputs)
+            else:
+                logits[chunk] = self._torch_entailment_logits(chunk_premises, chunk_hypotheses)
+        
+        return logits
+    
+    def _torch_entailment_logits(self, premises, hypotheses):
+        """Entailment logits from the PyTorch zero-shot pipeline's model"""
+        import torch
+        
+        with self.metrics.stage('tokenize'):
+            inputs = self.classifier.tokenizer(
+                premises,
+                hypotheses,
+                padding=True,
+                truncation='only_first',
+                return_tensors='pt'
+            )
+        with self.metrics.stage('nli_forward'), torch.no_grad():
+            outputs = self.classifier.model(**inputs).logits
+        
+        return outputs[:, self.classifier.entailment_id].numpy()
+    
+    def _candidate_labels(self, chunked):
+        """Labels the NLI model should score for each text
+
+        The shortlist always includes CRITICAL_CATEGORIES, so a crisis the
+        embeddings rank poorly still reaches the NLI model.
+        """
+        if self.strategy != 'shortlist' or self.shortlist_k >= len(self.labels):
+            return [self.labels] * len(chunked)
+        
+        # A long text is represented by the mean of its chunk embeddings
+        with self.metrics.stage('embedding'):
+            chunk_vectors = self._embed([chunk for chunks in chunked for chunk in chunks])
+        bounds = np.cumsum([0] + [len(chunks) for chunks in chunked])
+        vectors = np.array([chunk_vectors[a:b].mean(axis=0) for a, b in zip(bounds[:-1], bounds[1:])])
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        
+        # Cosine similarity against the precomputed label embeddings
+        similarities = vectors @ self.label_embeddings.T
+        top_k = np.argpartition(-similarities, self.shortlist_k, axis=1)[:, :self.shortlist_k]
+        
+        return [self._with_critical([self.labels[i] for i in row]) for row in top_k]
+    
+    def _with_critical(self, labels):
+        """`labels` followed by the critical categories they don't already hold"""
+        return labels + [label for label in self.CRITICAL_CATEGORIES if label not in labels]
+    
+    def _embed(self, texts):
+        """Mean-pooled, L2-normalized sentence embeddings"""
+        outputs = self.embedder(list(texts), truncation=True)
+        vectors = np.array([np.mean(output[0], axis=0) for output in outputs])
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        
+        return vectors / np.maximum(norms, 1e-12)
+    
     def _analyze_sentiment(self, text):
         """Analyze sentiment of text"""
         scores = self.analyzer.polarity_scores(text)
@@ -153,12 +746,6 @@ class ContextClassifier:
     
     def _determine_urgency(self, category, text, sentiment):
         """Determine urgency level of the situation"""
-        urgent_categories = [
-            "Medical Emergency", "Physical Assault", "Sexual Harassment",
-            "Stalking", "Suicidal Ideation", "Self-Harm", "Heart Attack",
-            "Stroke", "Seizure", "Heavy Bleeding", "Overdose"
-        ]
-        
         high_priority_categories = [
             "Panic Attack", "Exam Stress", "Deadline Crunch", "Job Interview",
             "Burnout", "Getting Fired", "Toxic Relationship"
@@ -167,7 +754,7 @@ class ContextClassifier:
         # Urgent keywords
         urgent_keywords = ['emergency', 'urgent', 'immediately', 'crisis', 'help', 'danger']
         
-        if category in urgent_categories:
+        if category in self.CRITICAL_CATEGORIES:
             return 'critical'
         
         if any(keyword in text.lower() for keyword in urgent_keywords):
@@ -0,0 +1,214 @@
+import re
+
+# Spelled-out counts people use in journals ("slept five hours", "two coffees")
+_NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12
+}
+_NUMBER = r"(?:\d+(?:\.\d+)?|" + '|'.join(_NUMBER_WORDS) + r")"
+_HOURS = r"(?:hours?|hrs?|h)\b"
+_QUALIFIER = r"(?:(?:only|just|about|around|maybe|like|barely|roughly)\s+)?"
+
+# (signal, confidence, pattern). {range} expands to a number or a range
+# ("6-7", "5 to 6") captured as <group>_a / <group>_b. Where several patterns
+# match at the same position the earlier one wins, so specific come first.
+_SLEEP_PATTERNS = [
+    ('sleep_hours', 0.95, r"slept\s+(?:for\s+)?" + _QUALIFIER + r"{range}\s*" + _HOURS),
+    ('sleep_hours', 0.95, _QUALIFIER + r"{range}\s*" + _HOURS + r"\s+(?:of\s+)?(?:sleep|rest)\b"),
+    ('sleep_hours', 0.75, _QUALIFIER + r"{range}\s*" + _HOURS + r"\s+(?:last\s+)?night\b"),
+    ('sleep_hours', 0.7, r"got\s+" + _QUALIFIER + r"{range}\s*" + _HOURS),
+    ('sleep_hours', 0.6, r"(?:only|just|barely)\s+{range}\s*" + _HOURS),
+    ('no_sleep', 0.7, r"(?:didn't|did not|couldn't|could not)\s+sleep\s+at\s+all|all[-\s]nighter|no\s+sleep\s+(?:at\s+all|last\s+night)")
+]
+
+# Cue words with the direction they push a 1-5 scale and the confidence
+# one occurrence carries
+_CUES = {
+    'energy': [
+        (-1.0, 0.8, r"exhausted|drained|wiped\s+out|no\s+energy|running\s+on\s+empty"),
+        (-0.5, 0.6, r"tired|fatigued|sluggish|lethargic|sleepy|groggy|low\s+energy"),
+        (1.0, 0.7, r"energi[sz]ed|energetic|full\s+of\s+energy|pumped|buzzing"),
+        (0.5, 0.5, r"refreshed|well[-\s]rested|productive|motivated|alert")
+    ],
+    'stress': [
+        (1.5, 0.8, r"overwhelmed|panick(?:ing|ed)|freaking\s+out|breaking\s+point|burn(?:ed|t)?\s*out"),
+        (1.0, 0.7, r"stressed(?:\s+out)?|anxious|under\s+(?:a\s+lot\s+of\s+)?pressure|swamped|tense|on\s+edge"),
+        (0.5, 0.5, r"deadlines?|worried|nervous|behind\s+(?:on|schedule)"),
+        (-1.0, 0.7, r"calm|relaxed|peaceful|at\s+ease|stress[-\s]free|chilled|chill")
+    ]
+}
+
+_COUNTED = [
+    ('caffeine', r"(?:cups?\s+of\s+)?(?:coffees?|espressos?|lattes?|cappuccinos?|energy\s+drinks?|red\s*bulls?)|(?:cups?\s+of\s+)?(?:black\s+)?tea"),
+    ('alcohol', r"(?:glass(?:es)?\s+of\s+)?(?:beers?|wine|cocktails?|shots?)|drinks\b"),
+]
+
+_EXERCISE = (
+    r"went\s+(?:for\s+)?(?:a\s+)?(?:run|jog|swim|walk|hike|bike\s+ride)|went\s+(?:running|jogging|swimming|cycling|hiking)"
+    r"|worked\s+out|workout|gym|exercised|yoga|pilates|jogged|swam|cycled|hiked|lifted\s+weights"
+)
+
+_NAP = r"(?:took|had)\s+a\s+nap|napped"
+
+# A negator within the few words before a cue in the same clause ("not
+# stressed", "no coffee"); punctuation and conjunctions end the clause, so
+# "not stressed, just tired" still counts "tired"
+_NEGATION = re.compile(
+    r"\b(?:not|never|no|don't|didn't|wasn't|isn't|without|skipped)\s+"
+    r"(?:(?!(?:and|but|or|so|yet|though|although|because)\b)[\w']+\s+){0,2}$"
+)
+
+class JournalFeatureExtractor:
+    """Pulls sleep, energy, stress and lifestyle signals out of journal text
+
+    Every pattern is compiled into a single alternation, so extraction is
+    one left-to-right scan of the text regardless of how many signals exist.
+    """
+
+    def __init__(self):
+        parts = []
+        self._groups = {}
+
+        def add(kind, confidence, pattern, **extra):
+            name = f'g{len(self._groups)}'
+            pattern = pattern.replace(
+                '{range}', rf"(?P<{name}_a>{_NUMBER})(?:\s*(?:-|–|to|or)\s*(?P<{name}_b>{_NUMBER}))?"
+            )
+            pattern = pattern.replace('{count}', rf"(?P<{name}_a>{_NUMBER})")
+            pattern = pattern.replace('{unit}', rf"(?P<{name}_unit>min(?:ute)?s?|hours?|hrs?)")
+            self._groups[name] = dict(kind=kind, confidence=confidence, **extra)
+            parts.append(rf"(?P<{name}>{pattern})")
+
+        for kind, confidence, pattern in _SLEEP_PATTERNS:
+            add(kind, confidence, pattern)
+        for scale, cues in _CUES.items():
+            for weight, confidence, pattern in cues:
+                add(scale, confidence, pattern, weight=weight)
+        for kind, pattern in _COUNTED:
+            add(kind, 0.9, r"{count}\s+(?:" + pattern + ")", counted=True)
+            add(kind, 0.7, pattern)
+        add('exercise', 0.8, r"(?:" + _EXERCISE + r")\s+for\s+{count}\s*{unit}\b", counted=True)
+        add('exercise', 0.7, _EXERCISE)
+        add('nap', 0.8, _NAP)
+
+        self.patterns = parts
+        # Only try the alternation where a word starts; the lookarounds reject
+        # every other position before any branch is attempted
+        self._pattern = re.compile(r"(?<![\w'])(?=\w)(?:" + '|'.join(parts) + r")\b")
+
+    def extract(self, text):
+        """Signals found in the text; each is None or {value, confidence, evidence}"""
+        text = ' '.join(text.lower().replace('’', "'").split())
+        found = {
+            'sleep_hours': None, 'energy': [], 'stress': [],
+            'caffeine': [], 'alcohol': [], 'exercise': [], 'nap': []
+        }
+
+        for match in self._pattern.finditer(text):
+            name = match.lastgroup
+            info = self._groups[name]
+            kind = info['kind']
+            evidence = match.group(name)
+
+            if kind in ('sleep_hours', 'no_sleep'):
+                hours = 0.0 if kind == 'no_sleep' else self._hours(match, name)
+                best = found['sleep_hours']
+                if hours is not None and (best is None or info['confidence'] > best['confidence']):
+                    found['sleep_hours'] = {'value': hours, 'confidence': info['confidence'], 'evidence': evidence}
+                continue
+
+            if _NEGATION.search(text, max(0, match.start() - 30), match.start()):
+                continue
+
+            if kind in ('energy', 'stress'):
+                found[kind].append((info['weight'], info['confidence'], evidence))
+            elif kind == 'exercise':
+                minutes = None
+                if info.get('counted'):
+                    minutes = self._number(match.group(f'{name}_a'))
+                    if not match.group(f'{name}_unit').startswith('min'):
+                        minutes *= 60
+                found['exercise'].append((minutes, info['confidence'], evidence))
+            elif kind == 'nap':
+                found['nap'].append((True, info['confidence'], evidence))
+            else:
+                servings = self._number(match.group(f'{name}_a')) if info.get('counted') else 1
+                found[kind].append((servings, info['confidence'], evidence))
+
+        return {
+            'sleep_hours': found['sleep_hours'],
+            'energy': self._scale(found['energy']),
+            'stress': self._scale(found['stress']),
+            'caffeine': self._total(found['caffeine']),
+            'alcohol': self._total(found['alcohol']),
+            'exercise': self._exercise(found['exercise']),
+            'nap': self._combine(True, found['nap'])
+        }
+
+    def estimate_metrics(self, features, sentiment):
+        """1-5 mood/energy/stress and sleep hours suggested by a journal"""
+        mood = sentiment['mood_score'] if sentiment else 3.0
+
+        if features['energy'] is not None:
+            energy = features['energy']['value']
+        else:
+            energy = 3.0
+            sleep = features['sleep_hours']
+            if sleep is not None and sleep['value'] < 5:
+                energy = 2.0
+
+        if features['stress'] is not None:
+            stress = features['stress']['value']
+        else:
+            stress = 5 - mood if mood < 3 else 2
+
+        sleep_hours = features['sleep_hours']['value'] if features['sleep_hours'] else 7
+
+        return {
+            'mood': mood,
+            'energy': energy,
+            'stress': stress,
+            'sleep': sleep_hours
+        }
+
+    def _hours(self, match, name):
+        low = self._number(match.group(f'{name}_a'))
+        high = match.group(f'{name}_b')
+        hours = (low + self._number(high)) / 2 if high is not None else low
+        return hours if 0 <= hours <= 24 else None
+
+    @staticmethod
+    def _number(token):
+        return float(_NUMBER_WORDS.get(token, token))
+
+    @staticmethod
+    def _combine(value, hits):
+        """Noisy-OR confidence over independent cues"""
+        if not hits:
+            return None
+        miss = 1.0
+        for _, confidence, _ in hits:
+            miss *= 1.0 - confidence
+        return {
+            'value': value,
+            'confidence': round(1.0 - miss, 2),
+            'evidence': [evidence for _, _, evidence in hits]
+        }
+
+    def _scale(self, hits):
+        """Cues pushing a neutral 3 up or down, clamped to 1-5"""
+        if not hits:
+            return None
+        value = max(1.0, min(5.0, 3.0 + sum(weight for weight, _, _ in hits)))
+        return self._combine(round(value, 1), hits)
+
+    def _total(self, hits):
+        if not hits:
+            return None
+        return self._combine(sum(servings for servings, _, _ in hits), hits)
+
+    def _exercise(self, hits):
+        if not hits:
+            return None
+        minutes = [value for value, _, _ in hits if value is not None]
+        return self._combine(sum(minutes) if minutes else None, hits)
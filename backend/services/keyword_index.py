@@ -0,0 +1,199 @@
+from collections import Counter
+from datetime import datetime, timedelta
+import math
+import re
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+
+from models.database import db, DailyLog, KeywordTerm, KeywordDaily, KeywordIndexStats
+
+# Function words and journal filler that never make a useful keyword
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before
+being below between both but by can can't cannot could couldn't day did didn't do does doesn't doing
+don't down during each even ever every feel feeling felt few for from further get getting got had
+hadn't has hasn't have haven't having he her here hers herself him himself his how i i'd i'll i'm
+i've if in into is isn't it it's its itself just know let's like lot made make many me more most
+much must my myself need no nor not now of off on once one only or other ought our ours ourselves
+out over own really same she should shouldn't so some still such than that that's the their theirs
+them themselves then there there's these they they're thing things think this those through time
+to today too under until up very want was wasn't way we we're were weren't what when where which
+while who whom why will with won't would wouldn't yesterday yet you you're your yours yourself
+""".split())
+
+_TOKEN = re.compile(r"[a-z][a-z']{2,}")
+
+def tokenize(text):
+    """Lowercased content words of a journal, in order"""
+    terms = []
+    for token in _TOKEN.findall(text.lower().replace('’', "'")):
+        if token in STOP_WORDS:
+            continue
+        token = token.strip("'")
+        if token.endswith("'s"):
+            token = token[:-2]
+        if len(token) >= 3 and token not in STOP_WORDS:
+            terms.append(token[:64])
+
+    return terms
+
+# Rows per multi-row upsert, within SQLite's bound-parameter limit
+_UPSERT_CHUNK = 200
+
+def _dialect_insert():
+    """The dialect's INSERT supporting ON CONFLICT, or None where there is none"""
+    return {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}.get(db.session.get_bind().dialect.name)
+
+def _add_counts(model, keys, column, rows):
+    """Insert each row, or add its `column` to the existing row with the same `keys`
+
+    The increment happens in the database, so concurrent journals for the
+    same user neither lose counts nor collide on the unique constraint.
+    """
+    insert = _dialect_insert()
+    if insert is not None:
+        for start in range(0, len(rows), _UPSERT_CHUNK):
+            statement = insert(model).values(rows[start:start + _UPSERT_CHUNK])
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=keys,
+                set_={column: getattr(model, column) + getattr(statement.excluded, column)}
+            ))
+        return
+
+    for row in rows:
+        match = [getattr(model, key) == row[key] for key in keys]
+        increment = {column: getattr(model, column) + row[column]}
+        if model.query.filter(*match).update(increment, synchronize_session=False):
+            continue
+        try:
+            with db.session.begin_nested():
+                db.session.add(model(**row))
+        except IntegrityError:
+            # Another journal inserted it first
+            model.query.filter(*match).update(increment, synchronize_session=False)
+
+def _insert_if_missing(model, row):
+    """Insert the row unless its primary key exists; True if it was inserted"""
+    insert = _dialect_insert()
+    if insert is not None:
+        return db.session.execute(insert(model).values(row).on_conflict_do_nothing()).rowcount == 1
+    try:
+        with db.session.begin_nested():
+            db.session.add(model(**row))
+    except IntegrityError:
+        return False
+    return True
+
+class KeywordIndex:
+    """Incremental per-user TF-IDF index over journal entries
+
+    Each new journal updates its terms' document frequencies and the day's
+    term counts in O(tokens), so keyword scoring and theme queries never
+    rescan old journals. Counts are incremented in the database, so
+    concurrent journals are safe. Changes join the caller's session; commit
+    them in their own transaction, after the journal's DailyLog.
+    """
+
+    def add_document(self, user_id, text, day=None, log_id=None):
+        """Index one journal; `log_id` is its committed DailyLog, if any"""
+        counts = Counter(tokenize(text or ''))
+        self._ensure_user(user_id, exclude_log_id=log_id)
+        self._count_documents(user_id, 1)
+        if counts:
+            self._apply(user_id, counts, day or datetime.utcnow().date())
+
+    def keywords(self, user_id, text, top_k=5):
+        """The text's terms ranked by TF-IDF against the user's history"""
+        counts = Counter(tokenize(text or ''))
+        if not counts:
+            return []
+
+        stats = db.session.get(KeywordIndexStats, user_id)
+        doc_count = stats.doc_count if stats else 0
+        doc_freq = dict(
+            db.session.query(KeywordTerm.term, KeywordTerm.doc_freq)
+            .filter(KeywordTerm.user_id == user_id, KeywordTerm.term.in_(list(counts)))
+            .all()
+        )
+
+        scores = {
+            term: (1 + math.log(count)) * self._idf(doc_count, doc_freq.get(term, 0))
+            for term, count in counts.items()
+        }
+        return [term for term, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:top_k]]
+
+    def top_themes(self, user_id, days=7, top_k=10, today=None):
+        """Terms the user wrote most about in the last `days` days, TF-IDF weighted"""
+        today = today or datetime.utcnow().date()
+        since = today - timedelta(days=days - 1)
+
+        rows = (
+            db.session.query(
+                KeywordDaily.term,
+                func.sum(KeywordDaily.count),
+                func.count(KeywordDaily.day),
+                KeywordTerm.doc_freq
+            )
+            .join(KeywordTerm, (KeywordTerm.user_id == KeywordDaily.user_id) & (KeywordTerm.term == KeywordDaily.term))
+            .filter(KeywordDaily.user_id == user_id, KeywordDaily.day >= since, KeywordDaily.day <= today)
+            .group_by(KeywordDaily.term, KeywordTerm.doc_freq)
+            .all()
+        )
+        if not rows:
+            return []
+
+        stats = db.session.get(KeywordIndexStats, user_id)
+        doc_count = stats.doc_count if stats else 0
+        themes = [
+            {
+                'term': term,
+                'score': round((1 + math.log(count)) * self._idf(doc_count, doc_freq), 3),
+                'count': int(count),
+                'days': int(days_mentioned)
+            }
+            for term, count, days_mentioned, doc_freq in rows
+        ]
+        themes.sort(key=lambda theme: (-theme['score'], theme['term']))
+
+        return themes[:top_k]
+
+    def _ensure_user(self, user_id, exclude_log_id=None):
+        """Create the user's stats row, indexing their other journals the first time"""
+        if not _insert_if_missing(KeywordIndexStats, {'user_id': user_id, 'doc_count': 0}):
+            return
+
+        # One-off backfill so history written before the index existed counts;
+        # only logs with a journal are documents, as in add_document's callers
+        query = db.session.query(DailyLog.journal_text, DailyLog.timestamp).filter(
+            DailyLog.user_id == user_id, DailyLog.journal_text.isnot(None), DailyLog.journal_text != ''
+        )
+        if exclude_log_id is not None:
+            query = query.filter(DailyLog.id != exclude_log_id)
+        logs = query.all()
+        for journal_text, timestamp in logs:
+            counts = Counter(tokenize(journal_text))
+            if counts:
+                self._apply(user_id, counts, timestamp.date())
+        self._count_documents(user_id, len(logs))
+
+    def _count_documents(self, user_id, documents):
+        if documents:
+            KeywordIndexStats.query.filter_by(user_id=user_id).update(
+                {'doc_count': KeywordIndexStats.doc_count + documents}, synchronize_session=False
+            )
+
+    def _apply(self, user_id, counts, day):
+        _add_counts(KeywordTerm, ['user_id', 'term'], 'doc_freq', [
+            {'user_id': user_id, 'term': term, 'doc_freq': 1} for term in counts
+        ])
+        _add_counts(KeywordDaily, ['user_id', 'day', 'term'], 'count', [
+            {'user_id': user_id, 'day': day, 'term': term, 'count': count} for term, count in counts.items()
+        ])
+
+    @staticmethod
+    def _idf(doc_count, doc_freq):
+        """Smoothed inverse document frequency"""
+        return math.log((1 + doc_count) / (1 + doc_freq)) + 1
@@ -0,0 +1,155 @@
+"""Hierarchical taxonomy of context classification labels"""
+
+# Each group carries the hypothesis used to score the group as a whole
+# ("This example is {hypothesis}.") and the fine-grained labels inside it
+LABEL_TAXONOMY = [
+    {
+        'group': 'urgent_safety',
+        'name': 'Urgent Safety',
+        'hypothesis': "about violence, abuse or a threat to someone's safety",
+        'labels': [
+            "Medical Emergency", "Physical Assault", "Sexual Harassment", "Stalking",
+            "Blackmail", "Robbery", "Domestic Violence", "Child Abuse", "Ragging",
+            "Bullying", "Cyberbullying", "Suicidal Ideation", "Self-Harm"
+        ]
+    },
+    {
+        'group': 'health_urgent',
+        'name': 'Health - Urgent',
+        'hypothesis': "about a medical emergency or serious injury",
+        'labels': [
+            "Heart Attack", "Stroke", "Severe Allergic Reaction", "Seizure",
+            "Heavy Bleeding", "Head Injury", "Broken Bone", "Overdose"
+        ]
+    },
+    {
+        'group': 'health_common',
+        'name': 'Health - Common',
+        'hypothesis': "about a common physical illness, pain or tiredness",
+        'labels': [
+            "Menstrual Pain", "Headache", "Migraine", "Back Pain", "Stomach Ache",
+            "Food Poisoning", "Flu", "Fever", "Common Cold", "Insomnia",
+            "Fatigue", "Muscle Pain", "Skin Rash", "Toothache"
+        ]
+    },
+    {
+        'group': 'mental_health',
+        'name': 'Mental Health',
+        'hypothesis': "about mental health, anxiety or depression",
+        'labels': [
+            "Panic Attack", "High Anxiety", "Social Anxiety", "Depression",
+            "Burnout", "Imposter Syndrome", "ADHD", "Stress Overload",
+            "Grief", "Loneliness", "Heartbreak", "Existential Crisis"
+        ]
+    },
+    {
+        'group': 'emotions',
+        'name': 'Emotions',
+        'hypothesis': "about a strong emotion or feeling",
+        'labels': [
+            "Anger", "Frustration", "Jealousy", "Guilt", "Shame", "Confusion",
+            "Overwhelmed", "Excited", "Grateful", "Inspired", "Bored"
+        ]
+    },
+    {
+        'group': 'academic',
+        'name': 'Academic',
+        'hypothesis': "about school, university or studying",
+        'labels': [
+            "Exam Stress", "Thesis Writing", "Assignment Deadline", "Group Project",
+            "Academic Probation", "Teacher Conflict", "Study Abroad",
+            "College Application", "Graduation Anxiety"
+        ]
+    },
+    {
+        'group': 'work_career',
+        'name': 'Work & Career',
+        'hypothesis': "about a job, the workplace or a career",
+        'labels': [
+            "Job Interview", "Resume Writing", "Salary Negotiation", "Getting Fired",
+            "Toxic Boss", "Workplace Harassment", "Deadline Crunch", "Procrastination",
+            "Career Change", "Promotion", "Work-Life Balance", "Remote Work"
+        ]
+    },
+    {
+        'group': 'business_finance',
+        'name': 'Business & Finance',
+        'hypothesis': "about money, debt or running a business",
+        'labels': [
+            "Starting a Business", "Cash Flow Crisis", "Debt", "Investment Decision",
+            "Tax Issues", "Bankruptcy", "Budget Planning", "Credit Problems"
+        ]
+    },
+    {
+        'group': 'relationships',
+        'name': 'Relationships',
+        'hypothesis': "about a romantic partner, family member or friend",
+        'labels': [
+            "Breakup", "Divorce", "Cheating", "Trust Issues", "Toxic Relationship",
+            "Gaslighting", "Dating", "Marriage", "In-Law Conflict", "Friendship",
+            "Making Friends", "Family Conflict"
+        ]
+    },
+    {
+        'group': 'parenting',
+        'name': 'Parenting',
+        'hypothesis': "about pregnancy, children or parenting",
+        'labels': [
+            "Pregnancy", "Postpartum Depression", "Childcare", "Teenager Issues",
+            "Toddler Tantrum", "School Problems", "Parenting Stress"
+        ]
+    },
+    {
+        'group': 'lifestyle',
+        'name': 'Lifestyle',
+        'hypothesis': "about home life, fitness, food or daily routines",
+        'labels': [
+            "Moving House", "Home Renovation", "Cleaning", "Decluttering",
+            "Fitness Goals", "Weight Loss", "Nutrition", "Cooking",
+            "Travel Planning", "Hobby", "Time Management", "Sleep Schedule"
+        ]
+    },
+    {
+        'group': 'technology',
+        'name': 'Technology',
+        'hypothesis': "about computers, phones, games or social media",
+        'labels': [
+            "Device Issues", "Cybersecurity", "Social Media Addiction",
+            "Digital Detox", "Gaming", "Technical Problem"
+        ]
+    },
+    {
+        'group': 'general',
+        'name': 'General',
+        'hypothesis': "about productivity, goals or personal growth",
+        'labels': [
+            "General Productivity", "Personal Growth", "Skill Learning",
+            "Creative Block", "Decision Making", "Goal Setting"
+        ]
+    }
+]
+
+_GROUPS_BY_KEY = {entry['group']: entry for entry in LABEL_TAXONOMY}
+_GROUP_BY_LABEL = {
+    label: entry['group'] for entry in LABEL_TAXONOMY for label in entry['labels']
+}
+
+def all_labels():
+    """Flat list of every fine-grained label, in taxonomy order"""
+    return [label for entry in LABEL_TAXONOMY for label in entry['labels']]
+
+def group_keys():
+    """Group identifiers, in taxonomy order"""
+    return [entry['group'] for entry in LABEL_TAXONOMY]
+
+def group_hypotheses():
+    """Hypothesis text for each group, aligned with group_keys()"""
+    return [entry['hypothesis'] for entry in LABEL_TAXONOMY]
+
+def labels_in_group(group):
+    """Fine-grained labels belonging to a group"""
+    return list(_GROUPS_BY_KEY[group]['labels'])
+
+def group_of(label):
+    """Group a label belongs to, or None for labels outside the taxonomy"""
+    return _GROUP_BY_LABEL.get(label)
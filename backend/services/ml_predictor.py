@@ -1,53 +1,194 @@
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
+from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.preprocessing import StandardScaler
 from datetime import datetime, timedelta
-import joblib
-import os
+import copy
+
+from config.settings import get_config
+from .analytics_frame import AnalyticsFrame
+from .anomaly_engine import AnomalyEngine
+from .artifact_store import ArtifactStore, data_fingerprint
+from .prediction_grid import PredictionGrid
+from .training_pipeline import FORESTS, TrainingPipeline
+from .tree_ensemble import CompiledModels
 
 class MLPredictor:
     """Machine Learning Predictor for capacity and patterns"""
     
-    def __init__(self):
+    # Above this many rows sklearn's compiled tree walk beats the flat arrays
+    FLAT_MAX_ROWS = 256
+    
+    def __init__(self, settings=None):
+        settings = settings or get_config()
         self.capacity_model = None
         self.mode_classifier = None
         self.scaler = StandardScaler()
         self.is_trained = False
-        
-    def train_models(self, historical_data=None):
+        self.version = None
+        # Predictions precomputed over the input grid after training
+        self.grid = None
+        self.grid_enabled = settings.ML_PREDICTION_GRID_ENABLED
+        self.grid_metric_step = settings.ML_GRID_METRIC_STEP
+        self.grid_sleep_step = settings.ML_GRID_SLEEP_STEP
+        # Both ensembles flattened for fast exact inference on a few rows
+        self.compiled = None
+        self.compiled_enabled = settings.ML_FLAT_TREES_ENABLED
+        # Incremental updates: a reservoir sample of every observation the
+        # models have seen, and the newest DailyLog id they include
+        self.replay = None
+        self.seen = 0
+        self.last_log_id = None
+        self.replay_size = settings.ML_REPLAY_BUFFER_SIZE
+        self.replay_sample = settings.ML_REPLAY_SAMPLE
+        self.incremental_trees = settings.ML_INCREMENTAL_TREES
+        self.max_boosting_stages = settings.ML_MAX_BOOSTING_STAGES
+        self.random_state = settings.ML_RANDOM_STATE
+        # What the models were last fitted on, recorded in saved artifacts
+        self.data_fingerprint = None
+        self.training_samples = 0
+        self.artifacts = ArtifactStore(settings.ML_ARTIFACT_DIR, mmap=settings.ML_ARTIFACT_MMAP)
+        self.pipeline = TrainingPipeline(settings.ML_MODEL_FAMILY, settings.ML_TRAINING_JOBS, settings.ML_RANDOM_STATE)
+        self.anomaly_engine = AnomalyEngine(settings.ML_ANOMALY_METHOD, window=settings.ML_ANOMALY_WINDOW)
+        
+    def train_models(self, historical_data=None, last_log_id=None):
         """Train ML models on historical data or synthetic data"""
         print("🧠 Training ML Models...")
         
         if historical_data is None or len(historical_data) < 50:
             # Generate synthetic training data
             historical_data = self._generate_synthetic_data(1000)
+        elif 'capacity' not in historical_data or 'recommended_mode' not in historical_data:
+            # Logged days only carry the four metrics
+            historical_data = self._label_training_data(historical_data)
         
         # Prepare features
         X = historical_data[['mood', 'energy', 'stress', 'sleep']]
-        
-        # Train Capacity Predictor (Regression)
-        y_capacity = historical_data['capacity']
-        self.capacity_model = GradientBoostingRegressor(
-            n_estimators=100,
-            learning_rate=0.1,
-            max_depth=4,
-            random_state=42
-        )
         X_scaled = self.scaler.fit_transform(X)
-        self.capacity_model.fit(X_scaled, y_capacity)
-        
-        # Train Mode Classifier
-        y_mode = historical_data['recommended_mode']
-        self.mode_classifier = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42
+        
+        # Capacity regressor and mode classifier of the configured family
+        self.capacity_model, self.mode_classifier = self.pipeline.fit(
+            X_scaled, historical_data['capacity'], historical_data['recommended_mode']
         )
-        self.mode_classifier.fit(X_scaled, y_mode)
         
+        self.replay = None
+        self.seen = 0
+        self._remember(historical_data)
+        self.last_log_id = last_log_id
+        self.data_fingerprint = data_fingerprint(historical_data[['mood', 'energy', 'stress', 'sleep', 'capacity', 'recommended_mode']])
+        self.training_samples = len(historical_data)
+        
+        self.compile_models()
         self.is_trained = True
         print("✅ ML Models trained successfully")
+    
+    def updated(self, new_data, last_log_id=None):
+        """A copy of this predictor updated with only the new observations
+        
+        Both models are warm-started on the new rows plus a sample of the
+        replay buffer, so the cost depends on the batch and buffer sizes,
+        not on how much history the user has. Forests swap their oldest
+        trees for new ones; the boosted model gains stages until
+        ML_MAX_BOOSTING_STAGES, when it is refitted from the buffer alone.
+        Models that can't warm-start (the histogram-based family) are
+        refitted on the new rows and the buffer. The scaler stays as first
+        fitted, since every tree's thresholds are in its units.
+        """
+        if 'capacity' not in new_data or 'recommended_mode' not in new_data:
+            new_data = self._label_training_data(new_data)
+        
+        predictor = copy.copy(self)
+        predictor.capacity_model = copy.deepcopy(self.capacity_model)
+        predictor.mode_classifier = copy.deepcopy(self.mode_classifier)
+        predictor.replay = self.replay.copy()
+        
+        sample_size = min(self.replay_sample, len(self.replay))
+        rng = np.random.default_rng(self.random_state + self.seen)
+        replayed = self.replay.iloc[rng.choice(len(self.replay), sample_size, replace=False)]
+        window = pd.concat([new_data[replayed.columns], replayed], ignore_index=True)
+        X_scaled = self.scaler.transform(window[['mood', 'energy', 'stress', 'sleep']])
+        
+        predictor.capacity_model = predictor._updated_model('capacity', predictor.capacity_model, X_scaled, window['capacity'])
+        predictor.mode_classifier = predictor._updated_model('mode', predictor.mode_classifier, X_scaled, window['recommended_mode'])
+        
+        predictor._remember(new_data)
+        predictor.last_log_id = last_log_id if last_log_id is not None else self.last_log_id
+        predictor.compile_models()
+        return predictor
+    
+    def _updated_model(self, kind, model, X_scaled, y):
+        """`model` warm-started on the window, or a new one fitted on the window and the buffer"""
+        if isinstance(model, GradientBoostingRegressor):
+            stages = model.n_estimators + self.incremental_trees
+            if stages <= self.max_boosting_stages:
+                # New stages fit the residuals of the existing ones on the window
+                model.set_params(warm_start=True, n_estimators=stages)
+                model.fit(X_scaled, y)
+                return model
+        elif isinstance(model, FORESTS) and (
+            # Trees over different class sets can't be averaged together
+            kind == 'capacity' or set(np.unique(y)) == set(model.classes_)
+        ):
+            trees = len(model.estimators_)
+            model.set_params(warm_start=True, n_estimators=trees + self.incremental_trees)
+            model.fit(X_scaled, y)
+            # Keep the forest size fixed by retiring the oldest trees
+            model.estimators_ = model.estimators_[-trees:]
+            model.set_params(n_estimators=trees)
+            return model
+        
+        # Compact, or start over: a full-size model fitted on the buffer and the window
+        target = 'capacity' if kind == 'capacity' else 'recommended_mode'
+        replay_scaled = self.scaler.transform(self.replay[['mood', 'energy', 'stress', 'sleep']])
+        return self.pipeline.fit_model(kind, np.vstack([X_scaled, replay_scaled]), np.concatenate([y, self.replay[target]]))
+    
+    def _remember(self, data):
+        """Reservoir-sample observations into the replay buffer (Algorithm R)"""
+        rows = data[['mood', 'energy', 'stress', 'sleep', 'capacity', 'recommended_mode']].reset_index(drop=True)
+        buffered = len(self.replay) if self.replay is not None else 0
+        
+        rng = np.random.default_rng(self.random_state + self.seen)
+        keep = []
+        replace = {}
+        for i in range(len(rows)):
+            self.seen += 1
+            if buffered + len(keep) < self.replay_size:
+                keep.append(i)
+            else:
+                slot = int(rng.integers(self.seen))
+                if slot < self.replay_size:
+                    replace[slot] = i
+        
+        # Fill first: replacement slots may point at rows appended here
+        if keep:
+            kept = rows.iloc[keep]
+            self.replay = kept.reset_index(drop=True) if self.replay is None else pd.concat([self.replay, kept], ignore_index=True)
+        if replace:
+            slots = list(replace)
+            sources = list(replace.values())
+            for column in rows.columns:
+                self.replay.loc[slots, column] = rows[column].to_numpy()[sources]
+    
+    def compile_models(self, grid=True, arrays=None):
+        """Flatten the current models (or adopt the flat `arrays` saved with them) and, with `grid`, precompute the prediction grid, each if enabled"""
+        if not self.compiled_enabled:
+            self.compiled = None
+        elif arrays is not None:
+            self.compiled = CompiledModels.from_arrays(arrays)
+        else:
+            self.compiled = CompiledModels.from_predictor(self)
+        if grid:
+            self.grid = None
+            if self.grid_enabled:
+                self.grid = PredictionGrid.build(self, self.grid_metric_step, self.grid_sleep_step)
+        
+    def warmup(self):
+        """Make sure models are trained and run one dummy prediction"""
+        if not self.is_trained:
+            self.train_models()
+            # Later processes load these instead of fitting their own
+            self.save_models()
+        self.predict_mode(3, 3, 3, 7)
         
     def _generate_synthetic_data(self, n_samples):
         """Generate synthetic training data"""
@@ -58,6 +199,20 @@ class MLPredictor:
         stress = np.random.uniform(1, 5, n_samples)
         sleep = np.random.uniform(4, 10, n_samples)
         
+        return self._label_training_data(pd.DataFrame({
+            'mood': mood,
+            'energy': energy,
+            'stress': stress,
+            'sleep': sleep
+        }))
+    
+    def _label_training_data(self, data):
+        """Add capacity and recommended_mode targets derived from the metrics"""
+        mood = data['mood'].to_numpy(dtype=float)
+        energy = data['energy'].to_numpy(dtype=float)
+        stress = data['stress'].to_numpy(dtype=float)
+        sleep = data['sleep'].to_numpy(dtype=float)
+        
         # Calculate capacity (0-100)
         capacity = (
             (mood * 0.25) +
@@ -66,81 +221,89 @@ class MLPredictor:
             (np.minimum(sleep, 8) / 8 * 0.15)  # Optimal sleep is 8 hours
         ) * 20  # Scale to 0-100
         
-        # Determine recommended mode
-        modes = []
-        for m, e, s in zip(mood, energy, stress):
-            if s >= 4:
-                modes.append("Recovery")
-            elif e >= 4 and m >= 4:
-                modes.append("Peak Performance")
-            elif e <= 2:
-                modes.append("Rest")
-            else:
-                modes.append("Balanced Focus")
+        # Determine recommended mode; the first matching rule wins
+        modes = np.select(
+            [stress >= 4, (energy >= 4) & (mood >= 4), energy <= 2],
+            ["Recovery", "Peak Performance", "Rest"],
+            default="Balanced Focus"
+        )
         
-        return pd.DataFrame({
-            'mood': mood,
-            'energy': energy,
-            'stress': stress,
-            'sleep': sleep,
-            'capacity': capacity,
-            'recommended_mode': modes
-        })
+        return data.assign(capacity=capacity, recommended_mode=modes)
     
-    def predict_capacity(self, mood, energy, stress, sleep):
-        """Predict user's current capacity (0-100)"""
+    def predict_batch(self, rows):
+        """Capacity, mode, confidence and per-mode probabilities for each (mood, energy, stress, sleep) row"""
         if not self.is_trained:
             self.train_models()
         
-        features = np.array([[mood, energy, stress, sleep]])
-        features_scaled = self.scaler.transform(features)
-        capacity = self.capacity_model.predict(features_scaled)[0]
+        features = np.asarray(rows, dtype=float).reshape(-1, 4)
+        if self.grid is not None:
+            capacity, probabilities = self.grid.predict(features)
+            classes = self.grid.classes
+        elif self.compiled is not None and len(features) <= self.FLAT_MAX_ROWS:
+            capacity, probabilities = self.compiled.predict(features)
+            classes = self.compiled.classes
+        else:
+            # Scale once and walk each ensemble once; the forest's predicted
+            # mode is the argmax of its probabilities
+            features_scaled = self.scaler.transform(features)
+            capacity = np.clip(self.capacity_model.predict(features_scaled), 0, 100)
+            probabilities = self.mode_classifier.predict_proba(features_scaled)
+            classes = [str(label) for label in self.mode_classifier.classes_]
+        
+        # Rounded Python floats, so float32 artifacts of the grid and flat
+        # trees don't leak into responses
+        predictions = []
+        for row_capacity, row_probabilities in zip(capacity.tolist(), probabilities.tolist()):
+            best = max(range(len(classes)), key=row_probabilities.__getitem__)
+            predictions.append({
+                'capacity': round(row_capacity, 2),
+                'mode': classes[best],
+                'confidence': round(row_probabilities[best], 2),
+                'all_modes': {label: round(probability, 4) for label, probability in zip(classes, row_probabilities)}
+            })
         
-        return max(0, min(100, capacity))
+        return predictions
+    
+    def predict_capacity(self, mood, energy, stress, sleep):
+        """Predict user's current capacity (0-100)"""
+        return self.predict_batch([(mood, energy, stress, sleep)])[0]['capacity']
     
     def predict_mode(self, mood, energy, stress, sleep):
         """Predict recommended operational mode"""
-        if not self.is_trained:
-            self.train_models()
-        
-        features = np.array([[mood, energy, stress, sleep]])
-        features_scaled = self.scaler.transform(features)
-        mode = self.mode_classifier.predict(features_scaled)[0]
-        probabilities = self.mode_classifier.predict_proba(features_scaled)[0]
-        confidence = max(probabilities)
+        prediction = self.predict_batch([(mood, energy, stress, sleep)])[0]
         
         return {
-            'mode': mode,
-            'confidence': round(confidence, 2),
-            'all_modes': dict(zip(self.mode_classifier.classes_, probabilities))
+            'mode': prediction['mode'],
+            'confidence': prediction['confidence'],
+            'all_modes': prediction['all_modes']
         }
     
     def analyze_trends(self, logs_data):
-        """Analyze trends from historical logs"""
+        """Analyze trends from historical logs (an AnalyticsFrame or list of log dicts)"""
         if len(logs_data) < 3:
             return {
                 'status': 'insufficient_data',
                 'message': 'Need at least 3 days of data for trend analysis'
             }
         
-        df = pd.DataFrame(logs_data)
+        frame = AnalyticsFrame.of(logs_data)
         
         trends = {
-            'mood': self._calculate_trend(df['mood']),
-            'energy': self._calculate_trend(df['energy']),
-            'stress': self._calculate_trend(df['stress']),
-            'sleep': self._calculate_trend(df['sleep'])
+            'mood': self._calculate_trend(frame.mood),
+            'energy': self._calculate_trend(frame.energy),
+            'stress': self._calculate_trend(frame.stress),
+            'sleep': self._calculate_trend(frame.sleep)
         }
         
         # Detect patterns
-        patterns = self._detect_patterns(df)
+        patterns = self._detect_patterns(frame)
         
         # Calculate averages
         averages = {
-            'mood': round(df['mood'].mean(), 1),
-            'energy': round(df['energy'].mean(), 1),
-            'stress': round(df['stress'].mean(), 1),
-            'sleep': round(df['sleep'].mean(), 1)
+            'mood': round(frame.mood.mean(), 1),
+            'energy': round(frame.energy.mean(), 1),
+            'stress': round(frame.stress.mean(), 1),
+            'sleep': round(frame.sleep.mean(), 1)
         }
         
         return {
@@ -148,7 +311,7 @@ class MLPredictor:
             'trends': trends,
             'patterns': patterns,
             'averages': averages,
-            'data_points': len(df)
+            'data_points': len(frame)
         }
     
     def _calculate_trend(self, series):
@@ -177,12 +340,12 @@ class MLPredictor:
             'slope': round(slope, 3)
         }
     
-    def _detect_patterns(self, df):
+    def _detect_patterns(self, frame):
         """Detect behavioral patterns"""
         patterns = []
         
         # Pattern 1: Consistent low energy
-        if (df['energy'] <= 2).sum() >= len(df) * 0.4:
+        if (frame.energy <= 2).sum() >= len(frame) * 0.4:
             patterns.append({
                 'type': 'chronic_low_energy',
                 'severity': 'high',
@@ -190,7 +353,7 @@ class MLPredictor:
             })
         
         # Pattern 2: High stress periods
-        if (df['stress'] >= 4).sum() >= len(df) * 0.5:
+        if (frame.stress >= 4).sum() >= len(frame) * 0.5:
             patterns.append({
                 'type': 'elevated_stress',
                 'severity': 'high',
@@ -198,7 +361,7 @@ class MLPredictor:
             })
         
         # Pattern 3: Poor sleep
-        if (df['sleep'] < 6).sum() >= len(df) * 0.3:
+        if (frame.sleep < 6).sum() >= len(frame) * 0.3:
             patterns.append({
                 'type': 'sleep_deficiency',
                 'severity': 'medium',
@@ -206,10 +369,10 @@ class MLPredictor:
             })
         
         # Pattern 4: Weekend effect
-        if 'timestamp' in df.columns:
-            df['day_of_week'] = pd.to_datetime(df['timestamp']).dt.dayofweek
-            weekday_mood = df[df['day_of_week'] < 5]['mood'].mean()
-            weekend_mood = df[df['day_of_week'] >= 5]['mood'].mean()
+        weekday = frame.day_of_week < 5 if frame.day_of_week is not None else None
+        if weekday is not None and weekday.any() and not weekday.all():
+            weekday_mood = frame.mood[weekday].mean()
+            weekend_mood = frame.mood[~weekday].mean()
             
             if weekend_mood - weekday_mood > 0.5:
                 patterns.append({
@@ -222,15 +385,15 @@ class MLPredictor:
     
     def calculate_decision_capacity(self, recent_logs):
         """Calculate capacity for making strategic decisions"""
-        if len(recent_logs) < 3:
+        frame = AnalyticsFrame.of(recent_logs)
+        if len(frame) < 3:
             # Calculate partial context if some data exists
-            if len(recent_logs) > 0:
-                df = pd.DataFrame(recent_logs)
+            if len(frame) > 0:
                 context = {
-                    'avg_mood': round(df['mood'].mean(), 1),
-                    'avg_energy': round(df['energy'].mean(), 1),
-                    'avg_stress': round(df['stress'].mean(), 1),
-                    'avg_sleep': round(df['sleep'].mean(), 1)
+                    'avg_mood': round(frame.mood.mean(), 1),
+                    'avg_energy': round(frame.energy.mean(), 1),
+                    'avg_stress': round(frame.stress.mean(), 1),
+                    'avg_sleep': round(frame.sleep.mean(), 1)
                 }
             else:
                 context = {
@@ -247,21 +410,19 @@ class MLPredictor:
                 'context': context
             }
         
-        df = pd.DataFrame(recent_logs)
-        
         # Weight recent data more heavily
-        weights = np.linspace(0.5, 1.0, len(df))
+        weights = np.linspace(0.5, 1.0, len(frame))
         
-        avg_mood = np.average(df['mood'], weights=weights)
-        avg_energy = np.average(df['energy'], weights=weights)
-        avg_stress = np.average(df['stress'], weights=weights)
-        avg_sleep = np.average(df['sleep'], weights=weights)
+        avg_mood = np.average(frame.mood, weights=weights)
+        avg_energy = np.average(frame.energy, weights=weights)
+        avg_stress = np.average(frame.stress, weights=weights)
+        avg_sleep = np.average(frame.sleep, weights=weights)
         
         # Calculate capacity
         capacity = self.predict_capacity(avg_mood, avg_energy, avg_stress, avg_sleep)
         
         # Determine confidence
-        variability = df[['mood', 'energy', 'stress']].std().mean()
+        variability = self._variability(frame)
         if variability < 0.5:
             confidence = 'high'
         elif variability < 1.0:
@@ -289,36 +450,56 @@ class MLPredictor:
             }
         }
     
-    def save_models(self, directory='models'):
-        """Save trained models to disk"""
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        
-        if self.is_trained:
-            joblib.dump(self.capacity_model, f'{directory}/capacity_model.pkl')
-            joblib.dump(self.mode_classifier, f'{directory}/mode_classifier.pkl')
-            joblib.dump(self.scaler, f'{directory}/scaler.pkl')
-            print(f"✅ Models saved to {directory}/")
+    def _variability(self, frame):
+        """Mean sample standard deviation of mood, energy and stress"""
+        return np.mean([np.std(frame[metric], ddof=1) for metric in ('mood', 'energy', 'stress')])
+    
+    def save_models(self, name='default'):
+        """Save trained models (and their prediction grid) to the artifact store"""
+        if not self.is_trained:
+            return None
+        
+        manifest = self.artifacts.save(name, {
+            'capacity_model': self.capacity_model,
+            'mode_classifier': self.mode_classifier,
+            'scaler': self.scaler,
+            'grid': self.grid,
+            'compiled': self.compiled.to_arrays() if self.compiled is not None else None
+        }, {
+            'training_data': self.data_fingerprint,
+            'training_samples': self.training_samples,
+            'model_family': self.pipeline.family,
+            'grid_steps': [self.grid_metric_step, self.grid_sleep_step] if self.grid is not None else None
+        })
+        print(f"✅ Models saved as {name} {manifest['version']}")
+        return manifest
     
-    def load_models(self, directory='models'):
-        """Load trained models from disk"""
-        try:
-            self.capacity_model = joblib.load(f'{directory}/capacity_model.pkl')
-            self.mode_classifier = joblib.load(f'{directory}/mode_classifier.pkl')
-            self.scaler = joblib.load(f'{directory}/scaler.pkl')
-            self.is_trained = True
-            print(f"✅ Models loaded from {directory}/")
-            return True
-        except FileNotFoundError:
-            print(f"❌ Models not found in {directory}/. Will train on first use.")
+    def load_models(self, name='default'):
+        """Load trained models from the artifact store"""
+        saved, manifest = self.artifacts.load(name)
+        if saved is None:
+            print(f"❌ No {name} models in {self.artifacts.directory}/. Will train on first use.")
             return False
+        
+        self.capacity_model = saved['capacity_model']
+        self.mode_classifier = saved['mode_classifier']
+        self.scaler = saved['scaler']
+        self.grid = saved['grid']
+        self.compile_models(grid=self.grid_enabled != (self.grid is not None) or (
+            self.grid is not None and manifest['grid_steps'] != [self.grid_metric_step, self.grid_sleep_step]
+        ), arrays=saved.get('compiled'))
+        self.data_fingerprint = manifest['training_data']
+        self.training_samples = manifest['training_samples']
+        self.is_trained = True
+        print(f"✅ Models loaded: {name} {manifest['version']}")
+        return True
     
     def calculate_health_score(self, logs_data):
         """
         Calculate comprehensive health score (0-100) based on multiple factors
         
         Args:
-            logs_data: List of log dictionaries with mood, energy, stress, sleep
+            logs_data: AnalyticsFrame or list of log dictionaries with mood, energy, stress, sleep
             
         Returns:
             dict with score, grade, breakdown, and trend
@@ -331,15 +512,17 @@ class MLPredictor:
                 'message': 'Insufficient data for accurate health scoring'
             }
         
-        df = pd.DataFrame(logs_data)
+        frame = AnalyticsFrame.of(logs_data)
         
         # Recent weighted averages (last 7 days weighted more)
-        weights = np.linspace(0.5, 1.0, min(len(df), 30))[-len(df):]
+        # (the ramp covers the last 30 logs; anything older weighs 0.5)
+        ramp = np.linspace(0.5, 1.0, min(len(frame), 30))
+        weights = np.concatenate([np.full(len(frame) - len(ramp), 0.5), ramp])
         
-        avg_mood = np.average(df['mood'], weights=weights)
-        avg_energy = np.average(df['energy'], weights=weights)
-        avg_stress = np.average(df['stress'], weights=weights)
-        avg_sleep = np.average(df['sleep'], weights=weights)
+        avg_mood = np.average(frame.mood, weights=weights)
+        avg_energy = np.average(frame.energy, weights=weights)
+        avg_stress = np.average(frame.stress, weights=weights)
+        avg_sleep = np.average(frame.sleep, weights=weights)
         
         # Component scores (0-100 scale)
         mood_score = (avg_mood / 5.0) * 100
@@ -356,8 +539,8 @@ class MLPredictor:
         
         # Consistency bonus (reward stable metrics)
         consistency_factor = 1.0
-        if len(df) >= 7:
-            variability = df[['mood', 'energy', 'stress']].std().mean()
+        if len(frame) >= 7:
+            variability = self._variability(frame)
             if variability < 0.5:
                 consistency_factor = 1.1  # 10% bonus for consistency
             elif variability > 1.5:
@@ -395,9 +578,9 @@ class MLPredictor:
         
         # Calculate trend (comparing recent vs older data)
         trend = 'stable'
-        if len(df) >= 14:
-            recent_avg = df.tail(7)['mood'].mean()
-            older_avg = df.head(7)['mood'].mean()
+        if len(frame) >= 14:
+            recent_avg = frame.mood[-7:].mean()
+            older_avg = frame.mood[:7].mean()
             diff = recent_avg - older_avg
             if diff > 0.3:
                 trend = 'improving'
@@ -416,7 +599,7 @@ class MLPredictor:
                 'sleep_contribution': round(sleep_score * 0.10, 1),
                 'consistency_bonus': round((consistency_factor - 1.0) * 100, 1)
             },
-            'confidence': 'high' if len(df) >= 14 else 'medium' if len(df) >= 7 else 'low'
+            'confidence': 'high' if len(frame) >= 14 else 'medium' if len(frame) >= 7 else 'low'
         }
     
     def detect_correlations(self, logs_data):
@@ -432,11 +615,14 @@ class MLPredictor:
                 'message': 'Need at least 7 days of data for correlation analysis'
             }
         
-        df = pd.DataFrame(logs_data)
+        frame = AnalyticsFrame.of(logs_data)
         
         # Calculate correlation matrix
         metrics = ['mood', 'energy', 'stress', 'sleep']
-        corr_matrix = df[metrics].corr()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # A metric that never changes correlates as NaN, as in pandas
+            coefficients = np.corrcoef(np.vstack([frame[metric] for metric in metrics]))
+        corr_matrix = pd.DataFrame(coefficients, index=metrics, columns=metrics)
         
         # Extract meaningful correlations
         correlations = []
@@ -469,7 +655,7 @@ class MLPredictor:
         })
         
         if sleep_energy_corr > 0.4:
-            avg_sleep = df['sleep'].mean()
+            avg_sleep = frame.sleep.mean()
             if avg_sleep < 7:
                 insights.append({
                     'type': 'sleep_energy_link',
@@ -541,7 +727,7 @@ class MLPredictor:
                 'message': 'Need at least 7 days of data for forecasting'
             }
         
-        df = pd.DataFrame(logs_data)
+        frame = AnalyticsFrame.of(logs_data)
         
         forecast = {
             'status': 'success',
@@ -550,7 +736,7 @@ class MLPredictor:
         }
         
         for metric in ['mood', 'energy', 'stress', 'sleep']:
-            values = df[metric].values
+            values = frame[metric]
             
             # Simple linear trend + recent average
             x = np.arange(len(values))
@@ -605,42 +791,8 @@ class MLPredictor:
         if len(logs_data) < 7:
             return []
         
-        df = pd.DataFrame(logs_data)
-        anomalies = []
-        
-        for metric in ['mood', 'energy', 'stress', 'sleep']:
-            values = df[metric].values
-            mean = np.mean(values)
-            std = np.std(values)
-            
-            # Detect points beyond 2 standard deviations
-            for i, value in enumerate(values):
-                z_score = abs((value - mean) / std) if std > 0 else 0
-                
-                if z_score > 2:
-                    # This is an anomaly
-                    anomaly_type = 'spike' if value > mean else 'drop'
-                    severity = 'high' if z_score > 3 else 'medium'
-                    
-                    # Get date if available
-                    date = df.iloc[i].get('timestamp', f'Entry {i+1}')
-                    
-                    anomalies.append({
-                        'metric': metric,
-                        'type': anomaly_type,
-                        'value': round(value, 2),
-                        'expected_range': f"{round(mean - std, 2)} - {round(mean + std, 2)}",
-                        'severity': severity,
-                        'date': date,
-                        'z_score': round(z_score, 2),
-                        'message': f"Unusual {anomaly_type} in {metric}: {value:.1f} (normal range: {mean-std:.1f}-{mean+std:.1f})"
-                    })
-        
-        
-        # Sort by severity (high first)  
-        anomalies.sort(key=lambda x: x['severity'] == 'high', reverse=True)
-        
-        return anomalies[:5]  # Return top 5 anomalies
+        # Top 5 by the configured detector's score (ML_ANOMALY_METHOD), so high severity first
+        return self.anomaly_engine.detect(AnalyticsFrame.of(logs_data))
     
     def detect_cycles(self, logs_data):
         """
@@ -655,28 +807,27 @@ class MLPredictor:
                 'message': 'Need at least 14 days of data for cycle detection'
             }
         
-        df = pd.DataFrame(logs_data)
+        frame = AnalyticsFrame.of(logs_data)
         
-        # Add day of week if timestamp available
-        if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df['day_of_week'] = df['timestamp'].dt.dayofweek
-            df['week_of_month'] = (df['timestamp'].dt.day - 1) // 7 + 1
+        # Day of week if timestamp available
+        if frame.day_of_week is not None:
+            day_of_week = frame.day_of_week
+            week_of_month = (frame.day_of_month - 1) // 7 + 1
         else:
             # Assume consecutive days
-            df['day_of_week'] = range(len(df)) % 7
+            day_of_week = np.arange(len(frame)) % 7
+            week_of_month = None
         
         cycles = []
         
         # Weekly cycle detection
-        if len(df) >= 14:
-            weekday_data = df[df['day_of_week'] < 5]
-            weekend_data = df[df['day_of_week'] >= 5]
+        if len(frame) >= 14:
+            weekday = day_of_week < 5
             
-            if len(weekday_data) > 0 and len(weekend_data) > 0:
+            if weekday.any() and not weekday.all():
                 for metric in ['mood', 'energy', 'stress']:
-                    weekday_avg = weekday_data[metric].mean()
-                    weekend_avg = weekend_data[metric].mean()
+                    weekday_avg = frame[metric][weekday].mean()
+                    weekend_avg = frame[metric][~weekday].mean()
                     diff = weekend_avg - weekday_avg
                     
                     if abs(diff) > 0.5:
@@ -691,18 +842,20 @@ class MLPredictor:
                         })
         
         # Monthly cycle detection (if enough data)
-        if len(df) >= 28 and 'week_of_month' in df.columns:
+        if len(frame) >= 28 and week_of_month is not None:
+            weeks = np.unique(week_of_month)
+            counts = np.bincount(week_of_month)[weeks]
             for metric in ['mood', 'stress']:
-                weekly_avgs = df.groupby('week_of_month')[metric].mean()
+                weekly_avgs = np.bincount(week_of_month, weights=frame[metric])[weeks] / counts
                 
                 if len(weekly_avgs) >= 3:
                     # Check for consistent pattern
-                    if weekly_avgs.std() > 0.3:
+                    if np.std(weekly_avgs, ddof=1) > 0.3:
                         cycles.append({
                             'type': 'monthly',
                             'metric': metric,
                             'pattern': 'monthly_variation',
-                            'weekly_averages': weekly_avgs.to_dict(),
+                            'weekly_averages': dict(zip(weeks.tolist(), weekly_avgs.tolist())),
                             'message': f"{metric.capitalize()} shows variation across weeks of the month"
                         })
         
@@ -0,0 +1,156 @@
+"""Thin clients for the out-of-process model server (see model_server.py)"""
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+import itertools
+import os
+import socket
+import threading
+
+from .ai_engine import AIEngine
+from .model_protocol import recv_message, send_message
+
+
+class ModelServerError(RuntimeError):
+    """The model server is unreachable or a remote call failed"""
+
+
+class ModelClient:
+    """Pipelined RPC over one Unix socket connection per process
+    
+    Any number of threads may call concurrently: requests are written as they
+    come and a reader thread hands each response to the caller waiting on it.
+    """
+    
+    def __init__(self, socket_path, timeout=30.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock = None
+        self._pid = None
+        self._pending = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+    
+    def call(self, method, *args, **kwargs):
+        """Run `method` on the server and return its result"""
+        future = Future()
+        with self._lock:
+            sock = self._connect()
+            pending = self._pending
+            request_id = next(self._ids)
+            pending[request_id] = future
+            try:
+                send_message(sock, {'id': request_id, 'method': method, 'args': args, 'kwargs': kwargs})
+            except OSError as e:
+                pending.pop(request_id, None)
+                self._disconnect(sock, pending)
+                raise ModelServerError(f"Model server request failed: {e}") from e
+        
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                pending.pop(request_id, None)
+            raise ModelServerError(f"Model server did not answer {method} within {self.timeout}s")
+    
+    def ping(self):
+        """Server health, or None when it cannot be reached"""
+        try:
+            return self.call('health')
+        except ModelServerError:
+            return None
+    
+    def _connect(self):
+        # Workers forked from a preloaded app must open their own connection
+        if self._sock is not None and self._pid == os.getpid():
+            return self._sock
+        if self._sock is not None:
+            # Closing the inherited descriptor leaves the parent's connection alone
+            self._sock.close()
+        
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            raise ModelServerError(f"Model server unavailable at {self.socket_path}: {e}") from e
+        
+        self._sock = sock
+        self._pid = os.getpid()
+        self._pending = {}
+        threading.Thread(
+            target=self._read_loop, args=(sock, self._pending), name='model-client-reader', daemon=True
+        ).start()
+        
+        return sock
+    
+    def _read_loop(self, sock, pending):
+        try:
+            while True:
+                response = recv_message(sock)
+                if response is None:
+                    break
+                with self._lock:
+                    future = pending.pop(response['id'], None)
+                if future is None:
+                    # The caller already gave up waiting
+                    continue
+                if 'error' in response:
+                    future.set_exception(ModelServerError(response['error']))
+                else:
+                    future.set_result(response['result'])
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Lost connection to model server: {e}")
+        
+        with self._lock:
+            self._disconnect(sock, pending)
+    
+    def _disconnect(self, sock, pending):
+        """Drop a broken connection and fail whatever was waiting on it"""
+        if self._sock is sock:
+            self._sock = None
+        sock.close()
+        
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ModelServerError("Connection to model server lost"))
+        pending.clear()
+
+
+class RemoteContextClassifier:
+    """ContextClassifier interface backed by the model server"""
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def warmup(self):
+        """Fail unless the model server answers its health check"""
+        self.client.call('health')
+    
+    def classify(self, text):
+        return self.client.call('classify', text)
+    
+    def classify_batch(self, texts):
+        return self.client.call('classify_batch', list(texts))
+    
+    def get_safety_response(self, category, urgency):
+        return self.client.call('get_safety_response', category, urgency)
+
+
+class RemoteAIEngine(AIEngine):
+    """AIEngine whose model-backed calls run on the model server
+    
+    The template-driven methods need no model and still run locally.
+    """
+    
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+    
+    def initialize(self):
+        """The generator lives in the model server; nothing to load here"""
+    
+    def warmup(self):
+        """Fail unless the model server answers its health check"""
+        self.client.call('health')
+    
+    def generate_plan(self, context_category, urgency, mode, sentiment, group=None):
+        return self.client.call('generate_plan', context_category, urgency, mode, sentiment, group)
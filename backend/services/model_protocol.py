@@ -0,0 +1,50 @@
+"""Wire format shared by the model server and its clients
+
+Every message is a 4-byte big-endian length followed by a UTF-8 JSON body.
+Requests carry an id so several can be in flight on one connection; the
+server answers each as soon as it is done, in any order.
+"""
+import json
+import struct
+
+import numpy as np
+
+_HEADER = struct.Struct('>I')
+
+def _json_default(obj):
+    """Serialize the numpy scalars and arrays that model outputs contain"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+def send_message(sock, message):
+    """Write one framed message"""
+    payload = json.dumps(message, default=_json_default).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+def recv_message(sock):
+    """Read one framed message; None once the peer closed the connection"""
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+
+    (length,) = _HEADER.unpack(header)
+    payload = _recv_exactly(sock, length)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a message")
+
+    return json.loads(payload.decode('utf-8'))
+
+def _recv_exactly(sock, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 16))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+
+    return b''.join(chunks)
@@ -0,0 +1,237 @@
+from collections import OrderedDict
+from datetime import datetime
+import json
+import os
+import threading
+import time
+
+import joblib
+
+from .classifier_metrics import ClassifierMetrics
+from .ml_predictor import MLPredictor
+
+# Cached answer for users who have no model of their own yet
+_NO_MODEL = object()
+
+class ModelRegistry:
+    """Per-user ML predictors on disk, served from a bounded in-memory LRU
+
+    Users without a model of their own get the shared default, trained on
+    synthetic data. Each published user model is written as a versioned
+    artifact next to a small pointer file naming the current version, so
+    every worker process can pick it up. In memory, models are evicted least
+    recently used first once either the model count or their total artifact
+    size exceeds its bound.
+    """
+
+    KEEP_VERSIONS = 2
+
+    def __init__(self, default, directory, max_models=1000, max_memory_mb=512, refresh_seconds=30):
+        self.default = default
+        self.default.version = self.default.version or 'ml-v1'
+        self.directory = directory
+        self.max_models = max_models
+        self.max_bytes = max_memory_mb * 1024 * 1024
+        self.refresh_seconds = refresh_seconds
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._models = 0
+        self._lock = threading.Lock()
+        # Its own histograms, kept out of the request's Server-Timing header
+        self.metrics = ClassifierMetrics(server_timing=False)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id):
+        """The user's own predictor, or the shared default"""
+        return self.get_own(user_id) or self.default
+
+    def get_own(self, user_id):
+        """The user's own predictor, or None if they have none yet"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                if now - entry['checked_at'] < self.refresh_seconds:
+                    return None if entry['predictor'] is _NO_MODEL else entry['predictor']
+            else:
+                self.misses += 1
+
+        # A miss, or a hit due for a check that another process hasn't
+        # published a newer version meanwhile
+        pointer_mtime = self._pointer_mtime(user_id)
+        if entry is not None and pointer_mtime == entry['pointer_mtime']:
+            entry['checked_at'] = now
+            return None if entry['predictor'] is _NO_MODEL else entry['predictor']
+
+        predictor, size = _NO_MODEL, 0
+        if pointer_mtime is not None:
+            with self.metrics.stage('load'):
+                predictor, size = self._load(user_id)
+        self._store(user_id, predictor, size, pointer_mtime)
+
+        return None if predictor is _NO_MODEL else predictor
+
+    def publish(self, user_id, predictor, samples=None):
+        """Make a freshly trained predictor current; user_id None replaces the default"""
+        if user_id is None:
+            generation = int(self.default.version.rsplit('v', 1)[-1]) + 1
+            predictor.version = f"ml-v{generation}"
+            # One reference swap; requests holding the old default finish with it
+            self.default = predictor
+            return predictor.version
+
+        user_dir = self._user_dir(user_id)
+        os.makedirs(user_dir, exist_ok=True)
+        pointer = self._read_pointer(user_id)
+        generation = (pointer['generation'] if pointer else 0) + 1
+        predictor.version = f"user-{user_id}-v{generation}"
+
+        artifact = os.path.join(user_dir, f'v{generation}.joblib')
+        temp_path = f'{artifact}.tmp'
+        joblib.dump({
+            'capacity_model': predictor.capacity_model,
+            'mode_classifier': predictor.mode_classifier,
+            'scaler': predictor.scaler,
+            'grid': predictor.grid,
+            'compiled': predictor.compiled.to_arrays() if predictor.compiled is not None else None,
+            'replay': predictor.replay,
+            'seen': predictor.seen,
+            'last_log_id': predictor.last_log_id,
+            'version': predictor.version
+        }, temp_path)
+        os.replace(temp_path, artifact)
+
+        self._write_pointer(user_id, {
+            'generation': generation,
+            'version': predictor.version,
+            'artifact': os.path.basename(artifact),
+            'samples': samples,
+            'last_log_id': predictor.last_log_id,
+            'trained_at': datetime.utcnow().isoformat() + 'Z'
+        })
+        self._prune(user_dir, generation)
+        self._store(user_id, predictor, os.path.getsize(artifact), self._pointer_mtime(user_id))
+
+        return predictor.version
+
+    def stats(self):
+        """Occupancy, hit rate and artifact load latency"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'default_version': self.default.version,
+                'entries': len(self._entries),
+                'loaded_models': self._models,
+                'max_models': self.max_models,
+                'memory_mb': round(self._bytes / (1024 * 1024), 1),
+                'max_memory_mb': round(self.max_bytes / (1024 * 1024), 1),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+        stats['load'] = self.metrics.snapshot()['stages'].get('load')
+        return stats
+
+    def _store(self, user_id, predictor, size, pointer_mtime):
+        with self._lock:
+            previous = self._entries.pop(user_id, None)
+            if previous is not None:
+                self._bytes -= previous['size']
+
+            self._entries[user_id] = {
+                'predictor': predictor,
+                'size': size,
+                'pointer_mtime': pointer_mtime,
+                'checked_at': time.monotonic()
+            }
+            self._bytes += size
+
+            if previous is not None and previous['predictor'] is not _NO_MODEL:
+                self._models -= 1
+            if predictor is not _NO_MODEL:
+                self._models += 1
+
+            # Only loaded models count toward the bounds; the markers for
+            # users without one are tiny and capped separately
+            while self._models > 1 and (self._models > self.max_models or self._bytes > self.max_bytes):
+                self._evict(loaded=True)
+                self.evictions += 1
+            while len(self._entries) - self._models > self.max_models:
+                self._evict(loaded=False)
+
+    def _evict(self, loaded):
+        """Drop the least recently used entry with (or without) a model; caller holds _lock"""
+        for user_id, entry in self._entries.items():
+            if (entry['predictor'] is not _NO_MODEL) == loaded:
+                break
+        del self._entries[user_id]
+        self._bytes -= entry['size']
+        if loaded:
+            self._models -= 1
+
+    def _load(self, user_id):
+        pointer = self._read_pointer(user_id)
+        if pointer is None:
+            return _NO_MODEL, 0
+
+        artifact = os.path.join(self._user_dir(user_id), pointer['artifact'])
+        try:
+            # Memory-mapped, like the shared models' artifacts (ArtifactStore)
+            saved = joblib.load(artifact, mmap_mode='r')
+        except FileNotFoundError:
+            return _NO_MODEL, 0
+
+        predictor = MLPredictor()
+        predictor.capacity_model = saved['capacity_model']
+        predictor.mode_classifier = saved['mode_classifier']
+        predictor.scaler = saved['scaler']
+        # Saved with the artifact so loading doesn't re-evaluate the models;
+        # artifacts saved while the grid was enabled don't turn it back on
+        predictor.grid = saved.get('grid') if predictor.grid_enabled else None
+        predictor.replay = saved.get('replay')
+        predictor.seen = saved.get('seen', 0)
+        predictor.last_log_id = saved.get('last_log_id')
+        predictor.version = saved['version']
+        # Flat trees saved with the artifact predict from the mapped pages
+        predictor.compile_models(grid=False, arrays=saved.get('compiled'))
+        predictor.is_trained = True
+        # The artifact's size on disk stands in for the model's footprint
+        return predictor, os.path.getsize(artifact)
+
+    def _user_dir(self, user_id):
+        return os.path.join(self.directory, str(user_id))
+
+    def _pointer_path(self, user_id):
+        return os.path.join(self._user_dir(user_id), 'current.json')
+
+    def _pointer_mtime(self, user_id):
+        try:
+            return os.stat(self._pointer_path(user_id)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _read_pointer(self, user_id):
+        try:
+            with open(self._pointer_path(user_id), encoding='utf-8') as pointer_file:
+                return json.load(pointer_file)
+        except FileNotFoundError:
+            return None
+
+    def _write_pointer(self, user_id, pointer):
+        path = self._pointer_path(user_id)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as pointer_file:
+            json.dump(pointer, pointer_file)
+        os.replace(temp_path, path)
+
+    def _prune(self, user_dir, generation):
+        """Keep the newest KEEP_VERSIONS artifacts for rollback"""
+        for name in os.listdir(user_dir):
+            if name.startswith('v') and name.endswith('.joblib'):
+                if int(name[1:-len('.joblib')]) <= generation - self.KEEP_VERSIONS:
+                    os.remove(os.path.join(user_dir, name))
@@ -0,0 +1,168 @@
+"""Out-of-process model server shared by every web worker
+
+Hosts one ContextClassifier and one AIEngine behind a Unix socket, so web
+workers started with MODEL_SERVING_MODE=remote share a single copy of the
+models instead of loading their own. Start it before the web workers:
+
+    python -m services.model_server --socket /tmp/mindmesh-models.sock
+"""
+import argparse
+import functools
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config.settings import get_config
+from .ai_engine import AIEngine
+from .context_classifier import ContextClassifier
+from .model_protocol import recv_message, send_message
+from .model_warmup import ModelWarmup
+
+
+class ModelServer:
+    """Serves classifier and plan requests from many pipelined connections"""
+    
+    def __init__(self, socket_path, settings=None, workers=8):
+        settings = settings or get_config()
+        self.socket_path = socket_path
+        self.context_classifier = ContextClassifier(settings)
+        self.ai_engine = AIEngine()
+        self.warmup_enabled = settings.MODEL_WARMUP_ENABLED
+        self.model_warmup = ModelWarmup()
+        self.model_warmup.register('context_classifier', self.context_classifier.warmup)
+        self.model_warmup.register('ai_engine', self.ai_engine.warmup)
+        
+        # Requests from all connections share the pool, so concurrent classify
+        # calls still meet in the classifier's micro-batcher
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='model-server')
+        self._methods = {
+            'classify': self.context_classifier.classify,
+            'classify_batch': self.context_classifier.classify_batch,
+            'get_safety_response': self.context_classifier.get_safety_response,
+            'generate_plan': self.ai_engine.generate_plan,
+            'classifier_metrics': self.context_classifier.metrics.snapshot,
+            'health': self.health
+        }
+        self._listener = None
+    
+    def health(self):
+        """Readiness of the hosted models, for clients' health checks"""
+        warmup_status = self.model_warmup.status()
+        
+        return {
+            'status': 'healthy' if warmup_status['state'] in ('ready', 'not_started') else warmup_status['state'],
+            'pid': os.getpid(),
+            'models': warmup_status['models'],
+            'process_rss_mb': warmup_status['process_rss_mb'],
+            'classifier_cache': self.context_classifier.cache.stats()
+        }
+    
+    def serve_forever(self):
+        """Bind the socket, start warming the models and accept connections"""
+        self._bind()
+        if self.warmup_enabled:
+            self.model_warmup.start()
+        print(f"🧠 Model server listening on {self.socket_path}")
+        
+        try:
+            while True:
+                conn, _ = self._listener.accept()
+                threading.Thread(
+                    target=self._serve_connection, args=(conn,), name='model-server-conn', daemon=True
+                ).start()
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Stop accepting connections and remove the socket file"""
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        self._executor.shutdown(wait=False)
+    
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            # Only replace the socket file if no server is answering on it
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+            else:
+                raise RuntimeError(f"A model server is already listening on {self.socket_path}")
+            finally:
+                probe.close()
+        
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        self._listener.listen(128)
+    
+    def _serve_connection(self, conn):
+        """Read requests as they arrive and answer each one when it completes"""
+        write_lock = threading.Lock()
+        
+        def respond(request_id, future):
+            try:
+                response = {'id': request_id, 'result': future.result()}
+            except Exception as e:
+                response = {'id': request_id, 'error': f"{type(e).__name__}: {e}"}
+            with write_lock:
+                try:
+                    send_message(conn, response)
+                except OSError:
+                    # The client went away; its other answers are dropped too
+                    pass
+        
+        try:
+            while True:
+                request = recv_message(conn)
+                if request is None:
+                    break
+                
+                problem = self._malformed(request)
+                if problem is not None:
+                    # Answer on the connection instead of dropping it
+                    with write_lock:
+                        send_message(conn, {'id': request.get('id') if isinstance(request, dict) else None, 'error': problem})
+                    continue
+                
+                method = self._methods.get(request.get('method'))
+                if method is None:
+                    with write_lock:
+                        send_message(conn, {'id': request.get('id'), 'error': f"Unknown method: {request.get('method')}"})
+                    continue
+                
+                future = self._executor.submit(method, *request.get('args', []), **request.get('kwargs', {}))
+                future.add_done_callback(functools.partial(respond, request['id']))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Model server connection error: {e}")
+        finally:
+            conn.close()
+    
+    def _malformed(self, request):
+        """Why a decoded request can't be served, or None"""
+        if not isinstance(request, dict):
+            return f"Malformed request: expected an object, got {type(request).__name__}"
+        if 'id' not in request:
+            return "Malformed request: missing 'id'"
+        if not isinstance(request.get('args', []), list) or not isinstance(request.get('kwargs', {}), dict):
+            return "Malformed request: 'args' must be a list and 'kwargs' an object"
+        return None
+
+
+def main():
+    settings = get_config()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--socket', default=settings.MODEL_SERVER_SOCKET)
+    parser.add_argument('--workers', type=int, default=settings.MODEL_SERVER_WORKERS)
+    args = parser.parse_args()
+    
+    ModelServer(args.socket, settings, workers=args.workers).serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import os
+import resource
+import threading
+import time
+import weakref
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak RSS (KB on Linux) where /proc is unavailable
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def reset_after_fork(obj, reset):
+    """Call `reset(obj)` in forked children (e.g. gunicorn --preload workers)
+
+    Threads don't survive fork, but locks they held and flags they set do;
+    `reset` replaces that state. Only a weak reference is kept, so the hook
+    doesn't keep `obj` alive.
+    """
+    ref = weakref.ref(obj)
+
+    def after_in_child():
+        target = ref()
+        if target is not None:
+            reset(target)
+
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=after_in_child)
+
+class ModelWarmup:
+    """Loads and warms models on a background thread, tracking per-model readiness"""
+
+    def __init__(self):
+        self._loaders = []
+        self._status = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._done = threading.Event()
+        reset_after_fork(self, ModelWarmup._restart_after_fork)
+
+    def register(self, name, loader):
+        """Add a model; `loader` must load it and run a dummy inference"""
+        self._loaders.append((name, loader))
+        self._status[name] = {
+            'state': 'pending',
+            'load_seconds': None,
+            'memory_mb': None,
+            'error': None
+        }
+
+    def start(self):
+        """Start loading every registered model in registration order"""
+        if self._thread is not None:
+            return
+
+        for name, _ in self._loaders:
+            self._update(name, state='loading')
+
+        self._thread = threading.Thread(target=self._run, name='model-warmup', daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Block until every model finished loading (or failed)"""
+        return self._done.wait(timeout)
+
+    def is_ready(self, name):
+        with self._lock:
+            return self._status.get(name, {}).get('state') == 'ready'
+
+    def record(self, name, ready, error=None):
+        """Set a model's state from a check made after warm-up (e.g. a remote model's live health)"""
+        self._update(name, state='ready' if ready else 'failed', error=None if ready else error)
+
+    def status(self):
+        """Per-model state, load duration and memory"""
+        with self._lock:
+            models = {name: dict(info) for name, info in self._status.items()}
+
+        states = {info['state'] for info in models.values()}
+        if self._thread is None:
+            overall = 'not_started'
+        elif states <= {'ready'}:
+            overall = 'ready'
+        elif states & {'pending', 'loading'}:
+            overall = 'loading'
+        else:
+            overall = 'degraded'
+
+        return {
+            'state': overall,
+            'models': models,
+            'process_rss_mb': round(current_rss_mb(), 1)
+        }
+
+    def _run(self):
+        for name, loader in self._loaders:
+            # Models load one at a time, so the RSS delta is attributable to this one
+            rss_before = current_rss_mb()
+            start = time.perf_counter()
+            try:
+                loader()
+            except Exception as e:
+                print(f"⚠️ Warm-up failed for {name}: {e}")
+                self._update(
+                    name,
+                    state='failed',
+                    load_seconds=round(time.perf_counter() - start, 2),
+                    error=str(e)
+                )
+            else:
+                self._update(
+                    name,
+                    state='ready',
+                    load_seconds=round(time.perf_counter() - start, 2),
+                    memory_mb=round(current_rss_mb() - rss_before, 1)
+                )
+
+        self._done.set()
+
+    def _restart_after_fork(self):
+        """Warm up again in a child forked while warm-up was running in the parent"""
+        self._lock = threading.Lock()
+        if self._thread is None or self._done.is_set():
+            return
+        self._done = threading.Event()
+        self._thread = None
+        for name, _ in self._loaders:
+            self._status[name].update(state='pending', load_seconds=None, memory_mb=None, error=None)
+        self.start()
+
+    def _update(self, name, **fields):
+        with self._lock:
+            self._status[name].update(fields)
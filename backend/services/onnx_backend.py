@@ -0,0 +1,116 @@
+import os
+import numpy as np
+
+class OnnxNLIBackend:
+    """Dynamic int8 quantized ONNX Runtime backend for the zero-shot NLI model"""
+
+    def __init__(self, model_name, cache_dir, intra_op_threads=0):
+        self.model_name = model_name
+        self.cache_dir = os.path.join(cache_dir, 'onnx', model_name.replace('/', '__'))
+        self.intra_op_threads = intra_op_threads
+        self.tokenizer = None
+        self.session = None
+        self.entailment_id = None
+
+    @property
+    def model_path(self):
+        return os.path.join(self.cache_dir, 'model.int8.onnx')
+
+    def load(self):
+        """Load the quantized model, exporting it on first use"""
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        if not os.path.exists(self.model_path):
+            self._export()
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.entailment_id = self._find_entailment_id(AutoConfig.from_pretrained(self.model_name))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        # Web workers already run requests in parallel, so keep each session to
+        # its share of the cores instead of letting every session grab them all
+        options.intra_op_num_threads = self.intra_op_threads or max(1, (os.cpu_count() or 2) // 2)
+        options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(
+            self.model_path, options, providers=['CPUExecutionProvider']
+        )
+
+    def entailment_logits(self, premises, hypotheses):
+        """Entailment logit for every (premise, hypothesis) pair"""
+        return self.run(self.tokenize(premises, hypotheses))
+
+    def tokenize(self, premises, hypotheses):
+        """Padded numpy model inputs for the pairs"""
+        return self.tokenizer(
+            premises,
+            hypotheses,
+            padding=True,
+            truncation='only_first',
+            return_tensors='np'
+        )
+
+    def run(self, inputs):
+        """Entailment logits for already tokenized pairs"""
+        logits = self.session.run(['logits'], {
+            'input_ids': inputs['input_ids'].astype(np.int64),
+            'attention_mask': inputs['attention_mask'].astype(np.int64)
+        })[0]
+
+        return logits[:, self.entailment_id]
+
+    def _export(self):
+        """Export the PyTorch model to ONNX and quantize its weights to int8"""
+        import torch
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        print(f"📦 Exporting {self.model_name} to quantized ONNX...")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+        model.eval()
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        dummy = tokenizer(["A journal entry."], ["This example is a label."], return_tensors='pt')
+
+        class LogitsOnly(torch.nn.Module):
+            def __init__(self, wrapped):
+                super().__init__()
+                self.wrapped = wrapped
+
+            def forward(self, input_ids, attention_mask):
+                return self.wrapped(input_ids=input_ids, attention_mask=attention_mask).logits
+
+        fp32_path = os.path.join(self.cache_dir, f'model.fp32.{os.getpid()}.onnx')
+        int8_path = os.path.join(self.cache_dir, f'model.int8.{os.getpid()}.onnx')
+        with torch.no_grad():
+            torch.onnx.export(
+                LogitsOnly(model),
+                (dummy['input_ids'], dummy['attention_mask']),
+                fp32_path,
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['logits'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'logits': {0: 'batch'}
+                },
+                opset_version=14
+            )
+
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+        # Atomic rename so concurrent workers never load a half-written file
+        os.replace(int8_path, self.model_path)
+        print(f"✅ Quantized model cached at {self.model_path}")
+
+    @staticmethod
+    def _find_entailment_id(config):
+        """Same lookup the transformers zero-shot pipeline uses"""
+        for label, index in config.label2id.items():
+            if label.lower().startswith('entail'):
+                return index
+        return -1
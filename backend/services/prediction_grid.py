@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+FEATURES = ('mood', 'energy', 'stress', 'sleep')
+
+# Validated input ranges (utils/validators.validate_metrics)
+FEATURE_RANGES = {'mood': (1.0, 5.0), 'energy': (1.0, 5.0), 'stress': (1.0, 5.0), 'sleep': (0.0, 24.0)}
+
+# Offsets of a cell's lower and upper corner along one axis
+_CORNER = np.array([0, 1], dtype=np.intp)
+
+class PredictionGrid:
+    """Capacity and mode predictions precomputed over a dense input grid
+
+    Both models are evaluated once at every grid point after training;
+    queries then interpolate multilinearly between the 16 surrounding points
+    instead of running the scaler and 200 trees, for any number of rows in
+    a handful of array operations. Capacity is stored as
+    float32 and mode probabilities as uint8 (1/255 resolution).
+    """
+
+    def __init__(self, axes, capacity, mode_probabilities, classes):
+        # (start, step, points) per feature; the axes are uniform
+        self.axes = axes
+        self.capacity = capacity
+        self.mode_probabilities = mode_probabilities
+        self.classes = classes
+
+    @classmethod
+    def build(cls, predictor, metric_step=0.25, sleep_step=0.5):
+        """Evaluate the predictor's trained models over the whole grid"""
+        axes = []
+        points = []
+        for feature in FEATURES:
+            low, high = FEATURE_RANGES[feature]
+            step = sleep_step if feature == 'sleep' else metric_step
+            count = int(round((high - low) / step)) + 1
+            axes.append((low, step, count))
+            points.append(low + step * np.arange(count))
+
+        shape = tuple(count for _, _, count in axes)
+        mesh = np.stack(np.meshgrid(*points, indexing='ij'), axis=-1).reshape(-1, len(FEATURES))
+        scaled = predictor.scaler.transform(pd.DataFrame(mesh, columns=list(FEATURES)))
+
+        capacity = np.clip(predictor.capacity_model.predict(scaled), 0, 100).astype(np.float32).reshape(shape)
+        probabilities = predictor.mode_classifier.predict_proba(scaled)
+        mode_probabilities = np.round(probabilities * 255).astype(np.uint8).reshape(shape + (probabilities.shape[1],))
+
+        return cls(axes, capacity, mode_probabilities, [str(label) for label in predictor.mode_classifier.classes_])
+
+    @property
+    def nbytes(self):
+        return self.capacity.nbytes + self.mode_probabilities.nbytes
+
+    def predict(self, inputs):
+        """Capacity and per-class mode probabilities for an (n, 4) input array"""
+        inputs = np.asarray(inputs, dtype=float)
+        rows = len(inputs)
+        if rows == 1:
+            return self._predict_row(inputs[0].tolist())
+        shape = self.capacity.shape
+
+        # Flat index and weight of each of the 16 corners of every row's cell
+        flat = np.zeros((rows, 1), dtype=np.intp)
+        weights = np.ones((rows, 1), dtype=np.float32)
+        for axis, (start, step, count) in enumerate(self.axes):
+            position = (np.clip(inputs[:, axis], start, start + step * (count - 1)) - start) / step
+            index = np.minimum(position.astype(np.intp), count - 2)
+            fraction = (position - index).astype(np.float32)
+            stride = int(np.prod(shape[axis + 1:]))
+            flat = (flat[:, :, None] + ((index[:, None] + _CORNER) * stride)[:, None, :]).reshape(rows, -1)
+            weights = (weights[:, :, None] * np.stack([1 - fraction, fraction], axis=1)[:, None, :]).reshape(rows, -1)
+
+        capacity = (self.capacity.reshape(-1)[flat] * weights).sum(axis=1)
+        corner_probabilities = self.mode_probabilities.reshape(-1, len(self.classes))[flat]
+        probabilities = np.einsum('nk,nkc->nc', weights, corner_probabilities.astype(np.float32))
+        return capacity, probabilities / probabilities.sum(axis=1, keepdims=True)
+
+    def _predict_row(self, values):
+        """predict() for a single row: fewer, smaller array operations"""
+        corners = []
+        weights = [1.0]
+        for value, (start, step, count) in zip(values, self.axes):
+            position = (min(max(value, start), start + step * (count - 1)) - start) / step
+            index = min(int(position), count - 2)
+            fraction = position - index
+            corners.append(slice(index, index + 2))
+            # Corner weights in the cell's C order: this axis varies fastest
+            weights = [weight * share for weight in weights for share in (1.0 - fraction, fraction)]
+
+        corners = tuple(corners)
+        weights = np.array(weights, dtype=np.float32)
+        capacity = weights @ self.capacity[corners].reshape(16)
+        probabilities = weights @ self.mode_probabilities[corners].reshape(16, -1)
+        return capacity.reshape(1), (probabilities / probabilities.sum()).reshape(1, -1)
@@ -0,0 +1,171 @@
+import re
+
+# Curated phrases per critical category. Each category lists concepts, and
+# each concept its phrasings with the confidence a hit carries; a journal
+# counts at most once per concept, so "seizure" and "seizures" together are
+# no stronger than either. Only categories that _determine_urgency treats as
+# critical belong here. Bare terms ("unconscious", "stalker", "seizure") have
+# everyday or third-party uses and carry BARE_WEIGHT, below the fast-path
+# threshold; only first-person or otherwise qualified phrasings carry more.
+BARE_WEIGHT = 0.6
+
+SAFETY_LEXICON = {
+    'Suicidal Ideation': [
+        [("kill myself", 0.95), ("killing myself", 0.95)],
+        [("end my life", 0.95), ("ending my life", 0.95), ("take my own life", 0.95)],
+        [("want to die", 0.9), ("wanna die", 0.9)],
+        [("better off dead", 0.95)],
+        [("no reason to live", 0.9), ("don't want to live", 0.9), ("dont want to live", 0.9),
+         ("don't want to be alive", 0.9)],
+        [("suicidal", BARE_WEIGHT), ("i'm suicidal", 0.9), ("im suicidal", 0.9), ("i am suicidal", 0.9),
+         ("feel suicidal", 0.9), ("feeling suicidal", 0.9), ("felt suicidal", 0.9), ("been suicidal", 0.9),
+         ("having suicidal thoughts", 0.9), ("my suicidal thoughts", 0.9)],
+        [("suicide", BARE_WEIGHT), ("wrote a suicide note", 0.95), ("writing a suicide note", 0.95),
+         ("my suicide note", 0.95), ("been thinking about suicide", 0.95), ("i'm thinking about suicide", 0.95),
+         ("keep thinking about suicide", 0.95), ("want to commit suicide", 0.95),
+         ("going to commit suicide", 0.95)]
+    ],
+    'Self-Harm': [
+        [("cut myself", 0.95), ("cutting myself", 0.95)],
+        [("hurt myself", BARE_WEIGHT), ("hurting myself", BARE_WEIGHT), ("want to hurt myself", 0.95),
+         ("going to hurt myself", 0.95), ("hurt myself on purpose", 0.95), ("start hurting myself", 0.9),
+         ("been hurting myself", 0.9)],
+        [("harm myself", 0.95), ("harming myself", 0.95)],
+        [("burn myself", BARE_WEIGHT), ("burn myself on purpose", 0.95), ("burned myself on purpose", 0.95)],
+        [("self harm", BARE_WEIGHT), ("self-harm", BARE_WEIGHT), ("self harming", BARE_WEIGHT),
+         ("i self harm", 0.9), ("i self-harm", 0.9), ("been self harming", 0.9),
+         ("urge to self harm", 0.9), ("urge to self-harm", 0.9)]
+    ],
+    'Medical Emergency': [
+        [("not breathing", 0.95), ("can't breathe", BARE_WEIGHT), ("cannot breathe", BARE_WEIGHT),
+         ("struggling to breathe", 0.9)],
+        [("turning blue", BARE_WEIGHT), ("lips are turning blue", 0.95), ("lips turning blue", 0.95)],
+        [("unconscious", BARE_WEIGHT), ("unconscious on the floor", 0.95), ("found unconscious", 0.9),
+         ("knocked unconscious", 0.9), ("lying unconscious", 0.9), ("he's unconscious", 0.9),
+         ("she's unconscious", 0.9), ("he is unconscious", 0.9), ("she is unconscious", 0.9)],
+        [("ambulance", BARE_WEIGHT), ("call an ambulance", 0.95), ("called an ambulance", 0.9)],
+        [("passed out", BARE_WEIGHT)]
+    ],
+    'Physical Assault': [
+        [("beat me", BARE_WEIGHT), ("beat me up", 0.95)],
+        [("punched me", 0.95)],
+        [("kicked me", BARE_WEIGHT)],
+        [("attacked me", 0.95), ("assaulted me", 0.95)],
+        [("choked me", 0.95)],
+        [("slapped me", 0.9)],
+        [("threatened to kill me", 0.95)]
+    ],
+    'Sexual Harassment': [
+        [("groped me", 0.95)],
+        [("sexual harassment", BARE_WEIGHT), ("sexually harassed", BARE_WEIGHT),
+         ("sexually harassed me", 0.95), ("was sexually harassed", 0.95), ("been sexually harassed", 0.95)],
+        [("touched me inappropriately", 0.95)],
+        [("molested", BARE_WEIGHT), ("molested me", 0.95), ("was molested", 0.9), ("been molested", 0.9)],
+        [("flashed me", BARE_WEIGHT), ("exposed himself to me", 0.95)]
+    ],
+    'Stalking': [
+        [("stalking me", 0.95), ("being stalked", 0.95)],
+        [("stalker", BARE_WEIGHT), ("have a stalker", 0.9)],
+        [("following me home", 0.9), ("followed me home", 0.9)]
+    ],
+    'Heart Attack': [
+        [("heart attack", BARE_WEIGHT), ("having a heart attack", 0.95), ("had a heart attack", 0.9)],
+        [("crushing chest pain", 0.95), ("chest pain spreading", 0.95)]
+    ],
+    'Stroke': [
+        [("having a stroke", 0.95)],
+        [("face is drooping", 0.95), ("face drooping", 0.9)],
+        [("slurred speech", BARE_WEIGHT), ("sudden slurred speech", 0.9)]
+    ],
+    'Seizure': [
+        [("seizure", BARE_WEIGHT), ("seizures", BARE_WEIGHT), ("having a seizure", 0.95), ("had a seizure", 0.9)]
+    ],
+    'Heavy Bleeding': [
+        [("won't stop bleeding", 0.95), ("wont stop bleeding", 0.95)],
+        [("bleeding heavily", 0.95), ("bleeding a lot", 0.9)],
+        [("lost a lot of blood", 0.95)]
+    ],
+    'Overdose': [
+        [("overdose", BARE_WEIGHT), ("overdosed", BARE_WEIGHT), ("i overdosed", 0.95), ("he overdosed", 0.95),
+         ("she overdosed", 0.95), ("they overdosed", 0.95), ("friend overdosed", 0.95)],
+        [("took too many pills", 0.95), ("swallowed a bottle of pills", 0.95), ("swallowed all the pills", 0.95)]
+    ]
+}
+
+# A negator within the few words before a phrase in the same clause ("I'm
+# not suicidal", "I don't think I will ever hurt myself"). Punctuation and
+# conjunctions end the clause, so "I'm not okay, I want to die" still matches.
+_CLAUSE_BREAK = r"(?:and|but|or|so|because|cause|though|although|yet|when|why|if|that|since|until|unless|then|while|how|what)"
+_NEGATION = re.compile(
+    r"\b(?:not|never|no|don't|dont|didn't|didnt|isn't|wasn't|nothing like)\s+"
+    r"(?:(?!" + _CLAUSE_BREAK + r"\b)[\w']+\s+){0,4}$"
+)
+
+class SafetyMatcher:
+    """Model-free detector for critical safety categories"""
+
+    def __init__(self, lexicon=None):
+        self.lexicon = lexicon or SAFETY_LEXICON
+        self._phrases = {
+            phrase: (category, concept, weight)
+            for category, concepts in self.lexicon.items()
+            for concept, entries in enumerate(concepts)
+            for phrase, weight in entries
+        }
+        # One alternation, longest phrase first, so the scan runs once in the
+        # regex engine and "had a seizure" wins over the bare "seizure"
+        alternation = '|'.join(
+            re.escape(phrase) for phrase in sorted(self._phrases, key=len, reverse=True)
+        )
+        self._pattern = re.compile(r"(?<!\w)(?:" + alternation + r")(?!\w)")
+        self._priority = {category: rank for rank, category in enumerate(self.lexicon)}
+
+    @staticmethod
+    def normalize(text):
+        return ' '.join(text.lower().replace('’', "'").split())
+
+    def match(self, text):
+        """Best critical category for the text, or None when nothing matched"""
+        text = self.normalize(text)
+        hits = {}
+
+        for found in self._pattern.finditer(text):
+            # Skip negated mentions ("I'm not suicidal")
+            if _NEGATION.search(text, max(0, found.start() - 80), found.start()):
+                continue
+            phrase = found.group()
+            category, concept, weight = self._phrases[phrase]
+            hits.setdefault(category, {}).setdefault(concept, {})[phrase] = weight
+
+        if not hits:
+            return None
+
+        # Noisy-OR over the best phrase of each concept. Bare mentions all
+        # count as one, so "passed out" and "ambulance" in the same journal
+        # never add up to an emergency
+        scored = []
+        for category, concepts in hits.items():
+            miss = 1.0
+            bare = False
+            for phrases in concepts.values():
+                weight = max(phrases.values())
+                if weight <= BARE_WEIGHT:
+                    bare = True
+                else:
+                    miss *= 1.0 - weight
+            if bare:
+                miss *= 1.0 - BARE_WEIGHT
+            found_phrases = sorted(phrase for phrases in concepts.values() for phrase in phrases)
+            scored.append((round(1.0 - miss, 3), -self._priority[category], category, found_phrases))
+        scored.sort(reverse=True)
+
+        confidence, _, category, phrases = scored[0]
+        return {
+            'category': category,
+            'confidence': confidence,
+            'phrases': phrases,
+            'alternates': [
+                {'category': other, 'confidence': other_confidence}
+                for other_confidence, _, other, _ in scored[1:]
+            ]
+        }
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import os
+import threading
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import numpy as np
+
+# Column order of a VADER score tuple
+SENTIMENT_COLUMNS = ('compound', 'pos', 'neg', 'neu')
+
+_worker_analyzer = None
+
+def _score_chunk(texts):
+    """Process-pool task: VADER scores for a list of texts"""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = SentimentIntensityAnalyzer()
+    return [_scores(_worker_analyzer, text) for text in texts]
+
+def _scores(analyzer, text):
+    scores = analyzer.polarity_scores(text)
+    return tuple(scores[column] for column in SENTIMENT_COLUMNS)
+
+class _LRU:
+    """Bounded mapping that forgets the least recently used entry first"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class SentimentBatchScorer:
+    """Columnar VADER sentiment over many texts
+
+    Identical texts are scored once per call and remembered across calls.
+    Batches with at least `parallel_threshold` unseen texts are spread over
+    a process pool; smaller ones are scored in-process, where the pool's
+    pickling would cost more than it saves.
+    """
+
+    def __init__(self, cache_size=8192, workers=0, parallel_threshold=2000, chunk_size=256):
+        self.analyzer = SentimentIntensityAnalyzer()
+        # A text's sentiment never changes, so scores only leave by LRU
+        self.cache = _LRU(cache_size)
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def score(self, texts):
+        """Dict of float arrays (compound, pos, neg, neu) aligned with `texts`"""
+        # Deduplicate first; None and empty journals score as all zeros
+        unique = {}
+        positions = np.empty(len(texts), dtype=np.intp)
+        for i, text in enumerate(texts):
+            positions[i] = unique.setdefault(text or '', len(unique))
+
+        unique_texts = list(unique)
+        table = np.zeros((len(unique_texts), len(SENTIMENT_COLUMNS)))
+        missing = []
+        for row, text in enumerate(unique_texts):
+            if not text:
+                continue
+            cached = self.cache.get(text)
+            if cached is None:
+                missing.append(row)
+            else:
+                table[row] = cached
+
+        if missing:
+            scored = self._score_texts([unique_texts[row] for row in missing])
+            for row, scores in zip(missing, scored):
+                table[row] = scores
+                self.cache.set(unique_texts[row], scores)
+
+        columns = table[positions]
+        return {column: columns[:, i] for i, column in enumerate(SENTIMENT_COLUMNS)}
+
+    def close(self):
+        """Shut the process pool down, if one was started"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+    def _score_texts(self, texts):
+        if len(texts) < self.parallel_threshold or self.workers <= 1:
+            return [_scores(self.analyzer, text) for text in texts]
+
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        scored = []
+        for chunk_scores in self._executor().map(_score_chunk, chunks):
+            scored.extend(chunk_scores)
+        return scored
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self._pool
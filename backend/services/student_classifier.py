@@ -0,0 +1,178 @@
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from datetime import datetime
+import hashlib
+import json
+import os
+import threading
+import joblib
+import numpy as np
+
+class TeacherLog:
+    """Append-only JSONL log of the zero-shot model's classifications
+
+    Each line holds the journal text with the teacher's top label and
+    confidence; the student is trained from it with scripts/train_student.py.
+    Once the file reaches `max_bytes` it is rotated to `<path>.1`, replacing
+    the previous one, so at most two files' worth of journals are kept.
+    """
+
+    def __init__(self, path, max_bytes=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def append(self, text, category, confidence, teacher_version):
+        record = {
+            'text': text,
+            'category': category,
+            'confidence': round(float(confidence), 4),
+            'teacher_version': teacher_version,
+            'logged_at': datetime.utcnow().isoformat() + 'Z'
+        }
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as log:
+                log.write(line)
+                size = log.tell()
+            if self.max_bytes and size >= self.max_bytes:
+                os.replace(self.path, self.path + '.1')
+
+    def load(self, min_confidence=0.0):
+        """Latest teacher label per distinct journal text, rotated file first"""
+        examples = {}
+        for path in (self.path + '.1', self.path):
+            if not os.path.exists(path):
+                continue
+
+            with open(path, encoding='utf-8') as log:
+                for line in log:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A partially written last line after a crash
+                        continue
+                    if record['confidence'] >= min_confidence:
+                        examples[record['text']] = record
+                    else:
+                        examples.pop(record['text'], None)
+
+        return list(examples.values())
+
+class StudentClassifier:
+    """TF-IDF + logistic regression student distilled from the NLI teacher"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pipeline = None
+        self.version = None
+        self.metadata = {}
+        self._compiled = None
+
+    @property
+    def is_trained(self):
+        return self.pipeline is not None
+
+    def train(self, texts, labels, teacher_version=None):
+        """Fit the student on teacher-labelled journals"""
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(
+                ngram_range=(1, 2),
+                sublinear_tf=True,
+                min_df=1,
+                max_features=50000,
+                strip_accents='unicode'
+            )),
+            ('clf', LogisticRegression(C=10.0, max_iter=2000))
+        ])
+        pipeline.fit(texts, labels)
+        self._compiled = self._compile(pipeline)
+
+        digest = hashlib.sha1('\x00'.join(sorted(f'{t}\x01{l}' for t, l in zip(texts, labels))).encode('utf-8'))
+        self.pipeline = pipeline
+        self.version = f"student-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{digest.hexdigest()[:8]}"
+        self.metadata = {
+            'version': self.version,
+            'trained_at': datetime.utcnow().isoformat() + 'Z',
+            'samples': len(texts),
+            'labels': sorted(set(labels)),
+            'teacher_version': teacher_version
+        }
+
+    def predict(self, texts, top_k=3):
+        """Top-k (labels, probabilities) for each text"""
+        analyzer, vocabulary, idf, weights, intercept, classes = self._compiled
+        rankings = []
+        for text in texts:
+            # Same maths as pipeline.predict_proba (sublinear tf-idf, l2 norm,
+            # softmax over the linear scores) minus sklearn's per-call checks
+            counts = {}
+            for term in analyzer(text):
+                index = vocabulary.get(term)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+
+            logits = intercept.copy()
+            if counts:
+                indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+                values = (1.0 + np.log(np.fromiter(counts.values(), dtype=float, count=len(counts)))) * idf[indices]
+                values /= np.linalg.norm(values)
+                logits += values @ weights[indices]
+
+            probabilities = np.exp(logits - logits.max())
+            probabilities /= probabilities.sum()
+            order = np.argsort(-probabilities)[:top_k]
+            rankings.append(([classes[i] for i in order], [float(probabilities[i]) for i in order]))
+
+        return rankings
+
+    def save(self):
+        """Write the student and its metadata atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f'{self.path}.tmp'
+        joblib.dump({'pipeline': self.pipeline, 'metadata': self.metadata}, temp_path)
+        os.replace(temp_path, self.path)
+        print(f"✅ Student classifier {self.version} saved to {self.path}")
+
+    def load(self):
+        """Load a saved student; False when none has been trained yet"""
+        try:
+            saved = joblib.load(self.path)
+        except FileNotFoundError:
+            return False
+
+        self.pipeline = saved['pipeline']
+        self._compiled = self._compile(self.pipeline)
+        self.metadata = saved['metadata']
+        self.version = self.metadata['version']
+        print(f"✅ Student classifier {self.version} loaded")
+        return True
+
+    @staticmethod
+    def _compile(pipeline):
+        """Pull the fitted vocabulary, idf and weights out of the pipeline"""
+        vectorizer = pipeline.named_steps['tfidf']
+        model = pipeline.named_steps['clf']
+        weights = model.coef_.T
+        intercept = model.intercept_
+        if weights.shape[1] == 1:
+            # Binary models keep one weight vector; softmax([0, z]) == sigmoid(z)
+            weights = np.hstack([np.zeros_like(weights), weights])
+            intercept = np.concatenate([[0.0], intercept])
+
+        return (
+            vectorizer.build_analyzer(),
+            vectorizer.vocabulary_,
+            vectorizer.idf_,
+            np.ascontiguousarray(weights),
+            intercept.astype(float),
+            [str(label) for label in model.classes_]
+        )
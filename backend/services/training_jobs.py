@@ -0,0 +1,136 @@
+from collections import OrderedDict, deque
+from datetime import datetime
+import itertools
+import threading
+import time
+
+from .ml_predictor import MLPredictor
+
+class TrainingJobQueue:
+    """Retrains ML predictors off the request path
+
+    A worker thread fits a fresh MLPredictor for each job and publishes it
+    through the model registry, which makes it current with a single
+    reference swap. Requests fetch a predictor once and keep using that
+    snapshot, so they never see a scaler or model halfway through being
+    refitted. A job queued for a user who already has one waiting replaces
+    it (only the newest training data matters), except that an incremental
+    update never displaces a queued full retrain.
+    """
+
+    def __init__(self, registry, history=20):
+        self.registry = registry
+        self._job_ids = itertools.count(1)
+        self._pending = OrderedDict()
+        self._running = None
+        self._history = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread = None
+        self._stopping = False
+
+    def submit(self, training_data, user_id=None, reason=None, incremental=False, last_log_id=None):
+        """Queue a retrain of the user's model (None: the default); returns the job's status
+
+        Incremental jobs update the user's current model with `training_data`
+        holding only the logs after its last_log_id; full jobs refit from
+        scratch. `last_log_id` is the newest log in `training_data`.
+        """
+        job = {
+            'id': next(self._job_ids),
+            'user_id': user_id,
+            'kind': 'incremental' if incremental else 'full',
+            'last_log_id': last_log_id,
+            'state': 'queued',
+            'reason': reason,
+            'samples': len(training_data),
+            'queued_at': datetime.utcnow().isoformat() + 'Z',
+            'train_seconds': None,
+            'version': None,
+            'error': None
+        }
+
+        with self._wakeup:
+            queued = self._pending.get(user_id)
+            if queued is not None and incremental and queued[0]['kind'] == 'full':
+                # The full retrain runs first; later logs get the next update
+                job['state'] = 'superseded'
+                self._history.append(job)
+                return dict(job)
+            if queued is not None:
+                superseded, _ = self._pending.pop(user_id)
+                superseded['state'] = 'superseded'
+                self._history.append(superseded)
+            self._pending[user_id] = (job, training_data)
+            self._ensure_started()
+            self._wakeup.notify()
+            return dict(job)
+
+    def status(self):
+        """Queued, running and recent jobs"""
+        with self._lock:
+            return {
+                'queued': [dict(job) for job, _ in self._pending.values()],
+                'running': dict(self._running) if self._running else None,
+                'recent': [dict(job) for job in reversed(self._history)]
+            }
+
+    def stop(self):
+        """Let the worker finish its current job and exit"""
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='ml-training', daemon=True)
+            self._thread.start()
+
+    def _train(self, job, training_data):
+        """A newly trained predictor, or None when there is nothing to learn"""
+        if job['kind'] == 'full':
+            predictor = MLPredictor()
+            predictor.train_models(training_data, last_log_id=job['last_log_id'])
+            return predictor
+
+        base = self.registry.get_own(job['user_id'])
+        if base is None or base.replay is None:
+            raise ValueError(f"user {job['user_id']} has no model to update")
+        # Drop logs the current model already includes, in case another
+        # update published after this one was queued
+        if base.last_log_id is not None:
+            training_data = training_data[training_data['id'] > base.last_log_id]
+        if len(training_data) == 0:
+            return None
+        return base.updated(training_data, last_log_id=job['last_log_id'])
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._stopping:
+                    self._wakeup.wait()
+                if self._stopping:
+                    return
+                _, (job, training_data) = self._pending.popitem(last=False)
+                job['state'] = 'running'
+                self._running = job
+
+            start = time.perf_counter()
+            try:
+                predictor = self._train(job, training_data)
+                if predictor is not None:
+                    version = self.registry.publish(job['user_id'], predictor, samples=job['samples'])
+            except Exception as e:
+                print(f"⚠️ ML training job {job['id']} failed: {e}")
+                job.update(state='failed', error=str(e))
+            else:
+                if predictor is None:
+                    job['state'] = 'skipped'
+                else:
+                    print(f"✅ ML models {version} published (job {job['id']}, {job['samples']} samples)")
+                    job.update(state='succeeded', version=version)
+
+            with self._lock:
+                job['train_seconds'] = round(time.perf_counter() - start, 2)
+                self._running = None
+                self._history.append(job)
@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import inspect
+import os
+
+from sklearn.ensemble import (
+    ExtraTreesClassifier, ExtraTreesRegressor, GradientBoostingRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor,
+    RandomForestClassifier, RandomForestRegressor
+)
+from threadpoolctl import threadpool_limits
+
+# Capacity regressor and mode classifier of each model family, without
+# random_state / n_jobs (the pipeline supplies them)
+MODEL_FAMILIES = {
+    'gradient_boosting': {
+        'capacity': partial(GradientBoostingRegressor, n_estimators=100, learning_rate=0.1, max_depth=4),
+        'mode': partial(RandomForestClassifier, n_estimators=100, max_depth=10)
+    },
+    'hist_gradient_boosting': {
+        'capacity': partial(HistGradientBoostingRegressor, max_iter=100, learning_rate=0.1, max_depth=4),
+        'mode': partial(HistGradientBoostingClassifier, max_iter=100, learning_rate=0.1, max_depth=6)
+    },
+    'random_forest': {
+        'capacity': partial(RandomForestRegressor, n_estimators=100, max_depth=10),
+        'mode': partial(RandomForestClassifier, n_estimators=100, max_depth=10)
+    },
+    'extra_trees': {
+        'capacity': partial(ExtraTreesRegressor, n_estimators=100, max_depth=10),
+        'mode': partial(ExtraTreesClassifier, n_estimators=100, max_depth=10)
+    }
+}
+
+# Families whose fitted models are lists of independent trees
+FORESTS = (RandomForestRegressor, RandomForestClassifier, ExtraTreesRegressor, ExtraTreesClassifier)
+
+class TrainingPipeline:
+    """Builds and fits the capacity and mode models of one model family
+
+    `n_jobs` is passed to estimators that take it (the forests), caps the
+    OpenMP threads of the histogram-based ones, and lets the two models fit
+    side by side. Fitted models are switched back to n_jobs=None, so
+    serving a few rows at a time never goes through a worker pool.
+    """
+
+    def __init__(self, family='gradient_boosting', n_jobs=1, random_state=42):
+        if family not in MODEL_FAMILIES:
+            raise ValueError(f"Unknown model family {family!r}; choose from {', '.join(MODEL_FAMILIES)}")
+        self.family = family
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def new_model(self, kind):
+        """An unfitted 'capacity' or 'mode' model of this family"""
+        factory = MODEL_FAMILIES[self.family][kind]
+        params = {'random_state': self.random_state}
+        if 'n_jobs' in inspect.signature(factory.func).parameters:
+            params['n_jobs'] = self.n_jobs
+        return factory(**params)
+
+    def fit_model(self, kind, X, y):
+        """A new 'capacity' or 'mode' model fitted on X, y"""
+        model = self.new_model(kind)
+        threads = os.cpu_count() if self.n_jobs == -1 else max(self.n_jobs or 1, 1)
+        with threadpool_limits(limits=threads, user_api='openmp'):
+            model.fit(X, y)
+        if 'n_jobs' in model.get_params():
+            model.set_params(n_jobs=None)
+        return model
+
+    def fit(self, X, y_capacity, y_mode):
+        """Fitted (capacity_model, mode_classifier)"""
+        if self.n_jobs == 1:
+            return self.fit_model('capacity', X, y_capacity), self.fit_model('mode', X, y_mode)
+
+        # Tree building releases the GIL, so the two fits overlap in threads
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            capacity = executor.submit(self.fit_model, 'capacity', X, y_capacity)
+            mode = executor.submit(self.fit_model, 'mode', X, y_mode)
+            return capacity.result(), mode.result()
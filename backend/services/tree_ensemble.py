@@ -0,0 +1,176 @@
+import numpy as np
+from sklearn.ensemble import ExtraTreesClassifier, GradientBoostingRegressor, RandomForestClassifier
+
+from .training_pipeline import FORESTS
+
+class FlatEnsemble:
+    """The trees of a fitted sklearn ensemble in contiguous node arrays
+
+    Every tree's nodes sit back to back in shared feature/threshold arrays,
+    with node i's children at children[2i] (left) and children[2i + 1]. Each
+    leaf is its own left child and never fails its test, so a batch of rows
+    walks all trees at once in `depth` array steps with no per-tree or
+    per-node Python. Leaf values are stored pre-scaled
+    (learning rate, 1/trees), so a prediction is their sum.
+    """
+
+    __slots__ = ('feature', 'threshold', 'children', 'value', 'roots', 'depth')
+
+    def __init__(self, feature, threshold, children, value, roots, depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+
+    @classmethod
+    def from_trees(cls, trees, leaf_values):
+        """Flatten sklearn Tree objects; leaf_values maps each tree to its (nodes, outputs) values"""
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees[:-1]]).astype(np.intp)
+        feature, threshold, children, value = [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count, dtype=np.intp) + offset
+            leaf = tree.children_left == -1
+            feature.append(np.where(leaf, 0, tree.feature).astype(np.intp))
+            threshold.append(np.where(leaf, np.inf, tree.threshold))
+            children.append(np.column_stack([
+                np.where(leaf, nodes, tree.children_left + offset),
+                np.where(leaf, nodes, tree.children_right + offset)
+            ]).reshape(-1))
+            value.append(leaf_values(tree))
+
+        return cls(
+            np.concatenate(feature),
+            np.concatenate(threshold),
+            np.concatenate(children),
+            np.ascontiguousarray(np.concatenate(value)),
+            offsets,
+            max(tree.max_depth for tree in trees)
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild from to_arrays() output without copying (memory-mapped arrays stay mapped)"""
+        return cls(*(np.asarray(arrays[name]) for name in ('feature', 'threshold', 'children', 'value', 'roots')), int(arrays['depth']))
+
+    def to_arrays(self):
+        """The node arrays as plain ndarrays, for saving with a model artifact"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ('feature', 'threshold', 'children', 'value'))
+
+    def predict(self, inputs):
+        """Summed leaf values, (n, outputs), for float32 inputs as sklearn's trees see them"""
+        if len(inputs) == 1:
+            # One row: plain 1-d indexing instead of the (rows, trees) gather
+            row = inputs[0]
+            nodes = self.roots
+            for _ in range(self.depth):
+                nodes = self.children[2 * nodes + (row[self.feature[nodes]] > self.threshold[nodes])]
+            return self.value[nodes].sum(axis=0, keepdims=True)
+
+        rows = np.arange(len(inputs))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(inputs), len(self.roots)))
+        for _ in range(self.depth):
+            nodes = self.children[2 * nodes + (inputs[rows, self.feature[nodes]] > self.threshold[nodes])]
+        return self.value[nodes].sum(axis=1)
+
+class CompiledModels:
+    """An MLPredictor's scaler and both ensembles, ready for numpy-only inference
+
+    Matches the sklearn models' predict/predict_proba to floating point
+    rounding: inputs are scaled in float64 like StandardScaler and compared
+    as float32 like sklearn's trees.
+    """
+
+    __slots__ = ('mean', 'scale', 'baseline', 'capacity', 'mode', 'classes')
+
+    def __init__(self, mean, scale, baseline, capacity, mode, classes):
+        self.mean = mean
+        self.scale = scale
+        self.baseline = baseline
+        self.capacity = capacity
+        self.mode = mode
+        self.classes = classes
+
+    @classmethod
+    def from_predictor(cls, predictor):
+        """Flatten the predictor's models, or None for a family without sklearn trees"""
+        regressor = predictor.capacity_model
+        forest = predictor.mode_classifier
+        if not isinstance(forest, (RandomForestClassifier, ExtraTreesClassifier)):
+            return None
+
+        if isinstance(regressor, GradientBoostingRegressor):
+            learning_rate = regressor.learning_rate
+            capacity = FlatEnsemble.from_trees(
+                [estimator.tree_ for estimator in regressor.estimators_[:, 0]],
+                lambda tree: tree.value[:, 0, :] * learning_rate
+            )
+            # The model's starting prediction before any stage (the training
+            # mean): init_ is the fitted estimator the stages boost from
+            baseline = 0.0 if regressor.init_ == 'zero' else float(
+                np.ravel(regressor.init_.predict(np.zeros((1, regressor.n_features_in_))))[0]
+            )
+        elif isinstance(regressor, FORESTS):
+            regressor_trees = len(regressor.estimators_)
+            capacity = FlatEnsemble.from_trees(
+                [estimator.tree_ for estimator in regressor.estimators_],
+                lambda tree: tree.value[:, 0, :] / regressor_trees
+            )
+            baseline = 0.0
+        else:
+            return None
+
+        trees = len(forest.estimators_)
+
+        def class_shares(tree):
+            counts = tree.value[:, 0, :]
+            totals = counts.sum(axis=1, keepdims=True)
+            return counts / np.where(totals == 0, 1, totals) / trees
+
+        mode = FlatEnsemble.from_trees([estimator.tree_ for estimator in forest.estimators_], class_shares)
+
+        scaler = predictor.scaler
+        return cls(
+            scaler.mean_.copy(), scaler.scale_.copy(), baseline, capacity, mode,
+            [str(label) for label in forest.classes_]
+        )
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """Rebuild from to_arrays() output, predicting straight from its (possibly memory-mapped) arrays"""
+        return cls(
+            np.asarray(arrays['mean']), np.asarray(arrays['scale']), float(arrays['baseline']),
+            FlatEnsemble.from_arrays(arrays['capacity']), FlatEnsemble.from_arrays(arrays['mode']),
+            list(arrays['classes'])
+        )
+
+    def to_arrays(self):
+        """Plain ndarrays (and the class labels) for saving with a model artifact
+
+        Loaded with memory mapping, these arrays stay in the page cache and
+        every worker predicts from the same pages; sklearn's own trees copy
+        their nodes into private memory when unpickled.
+        """
+        return {
+            'mean': self.mean,
+            'scale': self.scale,
+            'baseline': self.baseline,
+            'capacity': self.capacity.to_arrays(),
+            'mode': self.mode.to_arrays(),
+            'classes': self.classes
+        }
+
+    @property
+    def nbytes(self):
+        return self.capacity.nbytes + self.mode.nbytes
+
+    def predict(self, inputs):
+        """Capacity and per-class mode probabilities for an (n, 4) input array"""
+        scaled = ((np.asarray(inputs, dtype=float) - self.mean) / self.scale).astype(np.float32)
+        capacity = np.clip(self.baseline + self.capacity.predict(scaled)[:, 0], 0, 100)
+        return capacity, self.mode.predict(scaled)
@@ -0,0 +1,25 @@
+from flask import Flask
+import pytest
+
+from models.database import db, User
+
+
+@pytest.fixture
+def app_db(tmp_path):
+    """An app context over a fresh SQLite database file"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def user(app_db):
+    user = User(username='tester', email='tester@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
@@ -0,0 +1,53 @@
+import pytest
+
+from services.ai_engine import AIEngine
+from services.label_taxonomy import all_labels, group_of
+
+GROUP_TEMPLATES = {
+    'health_urgent': 'health_physical',
+    'health_common': 'health_physical',
+    'mental_health': 'mental_health',
+    'academic': 'academic_work',
+    'work_career': 'academic_work'
+}
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return AIEngine()
+
+
+@pytest.mark.parametrize('category, template', [
+    # Named in the original keyword mapping: unchanged
+    ('Overwhelmed', 'mental_health'),
+    ('Postpartum Depression', 'mental_health'),
+    ('Graduation Anxiety', 'mental_health'),
+    ('Exam Stress', 'mental_health'),
+    ('Parenting Stress', 'mental_health'),
+    ('Migraine', 'health_physical'),
+    ('Thesis Writing', 'academic_work'),
+    # Previously 'general'; now their taxonomy group's template
+    ('Insomnia', 'health_physical'),
+    ('Loneliness', 'mental_health'),
+    ('Toxic Boss', 'academic_work'),
+    ('General Productivity', 'general'),
+])
+def test_template_per_category(engine, category, template):
+    assert engine._map_to_template(category, 'low', 'Balanced Focus') == template
+
+
+def test_critical_urgency_uses_the_critical_template(engine):
+    assert engine._map_to_template('Exam Stress', 'critical', 'Recovery') == 'critical'
+
+
+def test_every_taxonomy_label_has_a_template(engine):
+    overridden = {'Overwhelmed', 'Exam Stress', 'Graduation Anxiety', 'Postpartum Depression', 'Parenting Stress'}
+    for label in all_labels():
+        template = engine._map_to_template(label, 'low', 'Balanced Focus')
+        expected = 'mental_health' if label in overridden else GROUP_TEMPLATES.get(group_of(label), 'general')
+        assert template == expected, label
+
+
+def test_labels_only_match_exactly(engine):
+    # No substring matching: an unknown label with a mapped word in it is general
+    assert engine._map_to_template('Stress Ball Collecting', 'low', 'Balanced Focus') == 'general'
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from scripts.benchmark_analytics_frame import analyze, as_records, generated_logs
+from services.ai_engine import AIEngine
+from services.analytics_frame import AnalyticsFrame
+from services.ml_predictor import MLPredictor
+
+
+@pytest.fixture(scope='module')
+def predictor(tmp_path_factory):
+    settings = type('TestSettings', (get_config(),), {'ML_ARTIFACT_DIR': str(tmp_path_factory.mktemp('ml'))})
+    predictor = MLPredictor(settings)
+    predictor.train_models()
+    return predictor
+
+
+@pytest.mark.parametrize('days', [7, 90])
+def test_frame_gives_the_same_analytics_as_log_dicts(predictor, days):
+    logs = generated_logs(days, seed=days)
+    ai_engine = AIEngine()
+
+    from_records = analyze(predictor, ai_engine, as_records(logs))
+    from_logs = analyze(predictor, ai_engine, AnalyticsFrame.from_logs(logs))
+
+    assert repr(from_records) == repr(from_logs)
+
+
+def test_columns_are_read_only_and_days_are_derived():
+    frame = AnalyticsFrame.from_records([
+        {'mood': 3, 'energy': 2, 'stress': 4, 'sleep': 7.5, 'timestamp': '2024-03-04T08:00:00Z'},
+        {'mood': 4, 'energy': 3, 'stress': 2, 'sleep': 8.0, 'timestamp': '2024-03-10T23:30:00Z'},
+    ])
+
+    assert len(frame) == 2
+    assert frame['sleep'].tolist() == [7.5, 8.0]
+    assert frame.day_of_week.tolist() == [0, 6]
+    assert frame.day_of_month.tolist() == [4, 10]
+    assert frame.label(1) == '2024-03-10T23:30:00Z'
+    with pytest.raises(ValueError):
+        frame.mood[0] = 5
+    with pytest.raises(KeyError):
+        frame['timestamp']
+
+
+def test_labels_from_rows_and_without_timestamps():
+    row = generated_logs(1)[0]
+    row.timestamp = datetime(2024, 3, 4, 8, 0, 0)
+    assert AnalyticsFrame.from_logs([row]).label(0) == '2024-03-04T08:00:00Z'
+
+    frame = AnalyticsFrame.of([{'mood': 3, 'energy': 3, 'stress': 3, 'sleep': 7}])
+    assert frame.timestamp is None
+    assert frame.label(0, 'Entry 1') == 'Entry 1'
+    assert AnalyticsFrame.of(frame) is frame
+    assert np.array_equal(frame.energy, [3.0])
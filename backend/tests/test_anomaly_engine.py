@@ -0,0 +1,71 @@
+import pytest
+
+from scripts.benchmark_analytics_frame import as_records
+from scripts.benchmark_anomaly_engine import logs_with_anomalies, per_value_loop, same_anomalies
+from services.analytics_frame import METRICS, AnalyticsFrame
+from services.anomaly_engine import AnomalyEngine
+
+
+@pytest.mark.parametrize('rows', [3, 30, 365])
+def test_zscore_matches_the_per_value_loop(rows):
+    records = as_records(logs_with_anomalies(rows, seed=rows))
+    found = AnomalyEngine(limit=None).detect(AnalyticsFrame.of(records))
+
+    assert same_anomalies(per_value_loop(records), found)
+
+
+def test_constant_metrics_have_no_anomalies():
+    frame = AnalyticsFrame([3.0] * 20, [3.0] * 20, [3.0] * 20, [7.0] * 20)
+    for method in AnomalyEngine.METHODS:
+        assert AnomalyEngine(method, min_periods=3).detect(frame) == []
+
+
+def test_results_are_ranked_and_limited():
+    records = as_records(logs_with_anomalies(365))
+    found = AnomalyEngine(limit=3).detect(AnalyticsFrame.of(records))
+
+    assert len(found) == 3
+    assert [anomaly['z_score'] for anomaly in found] == sorted((anomaly['z_score'] for anomaly in found), reverse=True)
+
+
+def test_mad_sees_each_of_several_extreme_days():
+    # Two extreme days inflate the standard deviation enough to hide each other
+    mood = [3.0, 3.2, 2.8, 3.1, 2.9, 3.0, 3.1, 2.9, 10.0, 10.0]
+    frame = AnalyticsFrame(mood, [3.0] * 10, [3.0] * 10, [7.0] * 10)
+
+    assert AnomalyEngine('zscore').detect(frame) == []
+    found = AnomalyEngine('mad', limit=None).detect(frame)
+    assert [(anomaly['metric'], anomaly['type'], anomaly['value']) for anomaly in found] == [('mood', 'spike', 10.0)] * 2
+
+
+def test_rolling_scores_each_log_against_the_logs_before_it():
+    engine = AnomalyEngine('rolling', threshold=0.0, window=5, min_periods=3, limit=None)
+    frame = AnalyticsFrame.from_logs(logs_with_anomalies(40))
+    found = {(anomaly['metric'], anomaly['date']): anomaly['z_score'] for anomaly in engine.detect(frame)}
+
+    expected = {}
+    for metric in METRICS:
+        values = frame[metric]
+        for row in range(len(values)):
+            window = values[max(0, row - engine.window):row]
+            if len(window) >= engine.min_periods and window.std() > 1e-9:
+                expected[(metric, frame.label(row))] = round(float(abs(values[row] - window.mean()) / window.std()), 2)
+    expected = {key: score for key, score in expected.items() if score > 0}
+
+    assert found.keys() == expected.keys()
+    for key, score in expected.items():
+        assert found[key] == pytest.approx(score, abs=0.011)
+
+
+@pytest.mark.parametrize('method', AnomalyEngine.METHODS)
+def test_batches_of_users_match_one_at_a_time(method):
+    engine = AnomalyEngine(method)
+    frames = [AnalyticsFrame.from_logs(logs_with_anomalies(rows, seed)) for seed, rows in enumerate([10, 60, 30, 1])]
+
+    assert engine.detect_many(frames) == [engine.detect(frame) for frame in frames]
+    assert engine.detect_many([]) == []
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        AnomalyEngine('iforest')
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+
+import services.artifact_store as artifact_store
+from services.artifact_store import ArtifactStore
+
+
+def test_round_trip_and_identical_payload_reuses_the_file(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    payload = {'weights': np.arange(10.0)}
+
+    first = store.save('model', payload, {'trained_on': 'sha256:abc'})
+    second = store.save('model', payload)
+    loaded, manifest = store.load('model')
+
+    assert first['version'] == second['version']
+    assert manifest['version'] == first['version']
+    assert np.array_equal(loaded['weights'], payload['weights'])
+    assert [name for name in os.listdir(tmp_path / 'model') if name.endswith('.joblib')] == [first['artifact']]
+
+
+def test_load_only_rehashes_files_that_changed_on_disk(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    manifest = store.save('model', {'weights': np.arange(10.0)})
+    path = tmp_path / 'model' / manifest['artifact']
+
+    hashed = []
+    real_sha256 = artifact_store._file_sha256
+    monkeypatch.setattr(artifact_store, '_file_sha256', lambda p: hashed.append(p) or real_sha256(p))
+
+    assert store.load('model')[0] is not None
+    assert hashed == []
+
+    # Same bytes with a new modification time (e.g. copied): hashed, still loads
+    os.utime(path, ns=(manifest['mtime_ns'] + 10**9, manifest['mtime_ns'] + 10**9))
+    assert store.load('model')[0] is not None
+    assert len(hashed) == 1
+
+    path.write_bytes(path.read_bytes()[:-8] + b'\0' * 8)
+    assert store.load('model') == (None, None)
+
+
+def test_other_library_versions_count_as_missing(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path))
+    store.save('model', {'weights': np.arange(10.0)})
+
+    monkeypatch.setattr(artifact_store, '_library_versions', lambda: {'sklearn': '0.0'})
+    assert store.load('model') == (None, None)
+
+
+def test_keeps_the_newest_versions(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    manifests = []
+    for i in range(5):
+        manifests.append(store.save('model', {'weights': np.full(10, float(i))}))
+        path = tmp_path / 'model' / manifests[-1]['artifact']
+        os.utime(path, (i * 10, i * 10))
+
+    kept = sorted(name for name in os.listdir(tmp_path / 'model') if name.endswith('.joblib'))
+    assert kept == sorted(manifest['artifact'] for manifest in manifests[-ArtifactStore.KEEP_VERSIONS:])
+    assert store.manifest('model')['version'] == manifests[-1]['version']
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.classification_cache import ClassificationCache
+from services.context_classifier import ContextClassifier
+
+
+def test_key_ignores_whitespace_and_unicode_form_but_not_version():
+    key = ClassificationCache.make_key("Café deadline  stress\n", 'v1')
+
+    assert ClassificationCache.make_key(" Café deadline stress", 'v1') == key
+    assert ClassificationCache.make_key("Café deadline stress", 'v2') != key
+    assert ClassificationCache.make_key("café deadline stress", 'v1') != key
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ClassificationCache(max_entries=2)
+    cache.set('a', {'category': 'A'})
+    cache.set('b', {'category': 'B'})
+    cache.get('a')
+    cache.set('c', {'category': 'C'})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'category': 'A'}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('services.classification_cache.time.monotonic', lambda: now[0])
+    cache = ClassificationCache(ttl_seconds=60)
+    cache.set('a', {'category': 'A'})
+
+    now[0] += 59
+    assert cache.get('a') == {'category': 'A'}
+    now[0] += 2
+    assert cache.get('a') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_results_are_copied_in_and_out():
+    cache = ClassificationCache()
+    result = {'category': 'A', 'keywords': ['x']}
+    cache.set('a', result)
+    result['keywords'].append('y')
+    cache.get('a')['keywords'].append('z')
+
+    assert cache.get('a') == {'category': 'A', 'keywords': ['x']}
+    assert cache.stats()['hit_rate'] == 1.0
+
+
+def test_zero_size_disables_the_cache():
+    cache = ClassificationCache(max_entries=0)
+    cache.set('a', {'category': 'A'})
+    assert cache.get('a') is None
+
+
+class CachingSettings(get_config()):
+    CLASSIFIER_STRATEGY = 'full'
+    CLASSIFIER_CACHE_SIZE = 16
+    CLASSIFIER_BATCHING_ENABLED = False
+    CLASSIFIER_STUDENT_ENABLED = False
+    CLASSIFIER_TEACHER_LOG = ''
+
+
+@pytest.fixture
+def classifier():
+    classifier = ContextClassifier(CachingSettings)
+    classifier.is_initialized = True
+    classifier.ranked = []
+
+    def entailment_logits(premises, hypotheses):
+        classifier.ranked.extend(sorted(set(premises), key=premises.index))
+        return np.array([1.0 if 'Burnout' in hypothesis else 0.0 for hypothesis in hypotheses])
+
+    classifier._entailment_logits = entailment_logits
+    return classifier
+
+
+def test_repeated_journals_are_answered_from_the_cache(classifier):
+    text = "Long day at the office with too many meetings"
+    first = classifier.classify(text)
+    first['keywords'] = None
+
+    assert classifier.classify(text + '  ')['category'] == 'Burnout'
+    assert classifier.classify(text)['keywords'] is not None
+    assert classifier.classify_batch([text, "Another week of deadlines at work"])[0]['category'] == 'Burnout'
+    assert classifier.ranked == [text, "Another week of deadlines at work"]
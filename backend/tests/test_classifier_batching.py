@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.context_classifier import BatchingInferenceService, ContextClassifier
+
+class RecordingRanker:
+    """Ranks each text as itself; waits for `release` before the first batch returns"""
+
+    def __init__(self):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, texts):
+        self.started.set()
+        self.release.wait(10)
+        self.batches.append(list(texts))
+        return [([text], [1.0]) for text in texts]
+
+
+def test_requests_arriving_together_share_a_batch():
+    ranker = RecordingRanker()
+    ranker.release.clear()
+    service = BatchingInferenceService(ranker, window_ms=50, max_batch=4)
+
+    first = service.submit('first')
+    ranker.started.wait(10)
+    # Queued while the first batch runs: the next batches are full, then the rest
+    futures = [service.submit(f'text {i}') for i in range(6)]
+    ranker.release.set()
+
+    assert first.result(10) == (['first'], [1.0])
+    assert [future.result(10) for future in futures] == [([f'text {i}'], [1.0]) for i in range(6)]
+    assert ranker.batches == [['first'], ['text 0', 'text 1', 'text 2', 'text 3'], ['text 4', 'text 5']]
+    assert service.stats() == {'batches': 3, 'items': 7, 'avg_batch_size': 2.33}
+    service.stop()
+
+
+def test_concurrent_callers_get_their_own_results():
+    ranker = RecordingRanker()
+    service = BatchingInferenceService(ranker, window_ms=20, max_batch=8)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda i: service.submit(f'text {i}').result(10), range(64)))
+
+    assert results == [([f'text {i}'], [1.0]) for i in range(64)]
+    assert all(len(batch) <= 8 for batch in ranker.batches)
+    assert sum(len(batch) for batch in ranker.batches) == 64
+    service.stop()
+
+
+def test_a_failed_batch_fails_each_of_its_requests():
+    def failing(texts):
+        raise RuntimeError('out of memory')
+
+    service = BatchingInferenceService(failing, window_ms=20)
+    futures = [service.submit('a'), service.submit('b')]
+
+    for future in futures:
+        with pytest.raises(RuntimeError, match='out of memory'):
+            future.result(10)
+    service.stop()
+
+
+def test_stop_serves_queued_requests_first():
+    ranker = RecordingRanker()
+    service = BatchingInferenceService(ranker, window_ms=1000)
+    future = service.submit('queued')
+    service.stop()
+
+    assert future.result(0) == (['queued'], [1.0])
+
+
+class BatchingSettings(get_config()):
+    CLASSIFIER_STRATEGY = 'full'
+    CLASSIFIER_BATCHING_ENABLED = True
+    CLASSIFIER_BATCH_WINDOW_MS = 50
+    CLASSIFIER_STUDENT_ENABLED = False
+    CLASSIFIER_TEACHER_LOG = ''
+
+
+def test_classifier_requests_share_nli_passes():
+    classifier = ContextClassifier(BatchingSettings)
+    classifier.is_initialized = True
+    passes = []
+
+    def entailment_logits(premises, hypotheses):
+        passes.append(sorted(set(premises)))
+        return np.array([1.0 if 'Burnout' in hypothesis else 0.0 for hypothesis in hypotheses])
+
+    classifier._entailment_logits = entailment_logits
+
+    texts = [f"Long day {i} at the office with too many meetings" for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(classifier.classify, texts))
+
+    assert [result['category'] for result in results] == ['Burnout'] * 8
+    assert sorted(text for premises in passes for text in premises) == sorted(texts)
+    assert len(passes) < len(texts)
+    # classify_batch scores its texts in one pass without the batcher
+    others = [f"Short night {i} before a deadline" for i in range(3)]
+    classifier.classify_batch(others)
+    assert passes[-1] == sorted(others)
+    classifier.batcher.stop()
+
+
+def test_forked_children_start_their_own_dispatcher():
+    service = BatchingInferenceService(RecordingRanker(), window_ms=1)
+    assert service.submit('parent').result(10) == (['parent'], [1.0])
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # The parent's dispatcher thread doesn't exist in the child
+        try:
+            ok = service.submit('child').result(5) == (['child'], [1.0])
+        except BaseException:
+            ok = False
+        os.write(write_fd, b'1' if ok else b'0')
+        os._exit(0)
+
+    os.close(write_fd)
+    assert os.read(read_fd, 1) == b'1'
+    os.waitpid(pid, 0)
+    os.close(read_fd)
+    service.stop()
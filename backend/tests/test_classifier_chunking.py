@@ -0,0 +1,83 @@
+import re
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.context_classifier import ContextClassifier
+
+
+class WordTokenizer:
+    """One token per word, with character offsets like a fast tokenizer"""
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=True):
+        return {'offset_mapping': [match.span() for match in re.finditer(r"\S+", text)]}
+
+
+def make_classifier(**overrides):
+    settings = type('ChunkingSettings', (get_config(),), {
+        'MODEL_WARMUP_ENABLED': False,
+        'CLASSIFIER_STUDENT_ENABLED': False,
+        'CLASSIFIER_TEACHER_LOG': '',
+        'CLASSIFIER_BATCHING_ENABLED': False,
+        'SAFETY_REFINE_ASYNC': False,
+        'CLASSIFIER_CHUNK_TOKENS': 10,
+        'CLASSIFIER_CHUNK_OVERLAP': 2,
+        'CLASSIFIER_MAX_TOKENS': 30,
+        **overrides
+    })
+    classifier = ContextClassifier(settings)
+    classifier.nli_backend = SimpleNamespace(tokenizer=WordTokenizer())
+    return classifier
+
+
+def words(count):
+    return ' '.join(f'w{i}' for i in range(count))
+
+
+def test_short_journals_are_not_tokenized():
+    classifier = make_classifier()
+    classifier.nli_backend = None  # no tokenizer to call
+
+    assert classifier._chunk_text('w1 w2 w3') == ['w1 w2 w3']
+
+
+def test_long_journals_split_into_overlapping_windows():
+    classifier = make_classifier()
+
+    chunks = classifier._chunk_text(words(26))
+
+    # Windows of 10 tokens stepping by 8; the last one reaches the end
+    tokens = words(26).split()
+    assert chunks == [' '.join(tokens[start:start + 10]) for start in (0, 8, 16)]
+
+
+def test_tokens_past_the_budget_are_not_scored():
+    classifier = make_classifier()
+
+    chunks = classifier._chunk_text(words(100))
+
+    assert len(chunks) == 4
+    assert chunks[-1].split()[-1] == 'w29'
+
+
+def test_chunking_can_be_turned_off():
+    classifier = make_classifier(CLASSIFIER_CHUNKING_ENABLED=False)
+    assert classifier._chunk_text(words(100)) == [words(100)]
+
+
+@pytest.mark.parametrize('aggregation, expected', [('max', ['Burnout', 'Work Stress']), ('mean', ['Work Stress', 'Burnout'])])
+def test_chunk_scores_are_aggregated(monkeypatch, aggregation, expected):
+    classifier = make_classifier(CLASSIFIER_CHUNK_AGGREGATION=aggregation)
+    # Per chunk, entailment for (Work Stress, Burnout): one chunk is strongly
+    # Burnout, two lean Work Stress
+    logits = {'a': (1.0, 0.0), 'b': (1.0, 0.0), 'c': (0.0, 2.0)}
+    monkeypatch.setattr(classifier, '_entailment_logits', lambda premises, hypotheses: np.array(
+        [logits[premise][0 if 'Work Stress' in hypothesis else 1] for premise, hypothesis in zip(premises, hypotheses)]
+    ))
+
+    [(labels, scores)] = classifier._rank_labels([['a', 'b', 'c']], [['Work Stress', 'Burnout']])
+
+    assert labels == expected
+    assert sum(scores) == pytest.approx(1.0)
@@ -0,0 +1,121 @@
+from flask import Flask
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.classifier_metrics import (
+    ClassifierMetrics, begin_request_timing, end_request_timing, server_timing_header
+)
+from services.context_classifier import ContextClassifier
+
+
+def test_percentiles_report_bucket_bounds():
+    metrics = ClassifierMetrics()
+    for ms in range(1, 101):
+        metrics.observe('inference', float(ms))
+
+    stage = metrics.snapshot()['stages']['inference']
+
+    assert stage['count'] == 100
+    assert (stage['p50_ms'], stage['p95_ms'], stage['p99_ms'], stage['max_ms']) == (50, 100, 100, 100.0)
+    assert stage['buckets']['le_50'] == 25
+    assert stage['mean_ms'] == pytest.approx(50.5)
+
+
+def test_percentiles_never_exceed_the_slowest_observation():
+    metrics = ClassifierMetrics()
+    for _ in range(3):
+        metrics.observe('keywords', 0.3)
+
+    assert metrics.snapshot()['stages']['keywords']['p99_ms'] == 0.3
+
+
+def test_stages_are_filed_by_text_length_and_events_give_rates():
+    metrics = ClassifierMetrics()
+    with metrics.stage('classify', length=300):
+        pass
+    for event in ('cache_hit', 'cache_hit', 'cache_hit', 'cache_miss', 'fast_path'):
+        metrics.event(event)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot['length_buckets']['256-1k']['count'] == 1
+    assert snapshot['length_buckets']['<256']['count'] == 0
+    assert (snapshot['cache_hit_rate'], snapshot['fast_path_rate']) == (0.75, 0.2)
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = ClassifierMetrics(enabled=False)
+    begin_request_timing()
+    with metrics.stage('classify', length=10):
+        pass
+    metrics.event('cache_hit')
+
+    assert metrics.stage('inference') is metrics.stage('keywords')
+    assert end_request_timing() == []
+    snapshot = metrics.snapshot()
+    assert (snapshot['stages'], snapshot['events']) == ({}, {})
+
+
+def test_server_timing_header_sums_repeated_stages():
+    timings = [('tokenize', 0.5), ('nli_forward', 2.0), ('tokenize', 1.0)]
+
+    assert server_timing_header(timings) == 'tokenize;dur=1.50, nli_forward;dur=2.00'
+
+
+def test_request_timing_hooks_add_the_header_per_request():
+    metrics = ClassifierMetrics()
+    app = Flask(__name__)
+
+    @app.before_request
+    def start_server_timing():
+        begin_request_timing()
+
+    @app.after_request
+    def add_server_timing(response):
+        timings = end_request_timing()
+        if timings:
+            response.headers['Server-Timing'] = server_timing_header(timings)
+        return response
+
+    @app.route('/timed')
+    def timed():
+        metrics.observe('inference', 12.0)
+        return 'ok'
+
+    @app.route('/untimed')
+    def untimed():
+        return 'ok'
+
+    client = app.test_client()
+    assert client.get('/timed').headers['Server-Timing'] == 'inference;dur=12.00'
+    assert 'Server-Timing' not in client.get('/untimed').headers
+    # Outside a request nothing is collected
+    metrics.observe('inference', 1.0)
+    assert end_request_timing() == []
+
+
+class MetricsSettings(get_config()):
+    CLASSIFIER_STRATEGY = 'full'
+    CLASSIFIER_BATCHING_ENABLED = False
+    CLASSIFIER_METRICS_ENABLED = True
+    CLASSIFIER_STUDENT_ENABLED = False
+    CLASSIFIER_TEACHER_LOG = ''
+
+
+def test_classifier_records_its_stages():
+    classifier = ContextClassifier(MetricsSettings)
+    classifier.is_initialized = True
+    classifier._entailment_logits = lambda premises, hypotheses: np.array(
+        [1.0 if 'Burnout' in hypothesis else 0.0 for hypothesis in hypotheses]
+    )
+    text = "Long day at the office with too many meetings"
+
+    classifier.classify(text)
+    classifier.classify(text)
+
+    snapshot = classifier.metrics.snapshot()
+    assert {'classify', 'cache_lookup', 'inference', 'sentiment', 'keywords'} <= set(snapshot['stages'])
+    assert snapshot['stages']['classify']['count'] == 2
+    assert snapshot['stages']['inference']['count'] == 1
+    assert snapshot['events'] == {'cache_miss': 1, 'cache_hit': 1}
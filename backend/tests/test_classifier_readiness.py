@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+
+import pytest
+
+from config.settings import get_config
+from services.context_classifier import ContextClassifier
+from services.model_warmup import ModelWarmup
+
+
+class DegradingSettings(get_config()):
+    MODEL_WARMUP_ENABLED = True
+    CLASSIFIER_INIT_RETRY_SECONDS = 60
+    CLASSIFIER_STUDENT_ENABLED = False
+    CLASSIFIER_TEACHER_LOG = ''
+    CLASSIFIER_BATCHING_ENABLED = False
+    SAFETY_REFINE_ASYNC = False
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    classifier = ContextClassifier(DegradingSettings)
+    classifier.loads = 0
+
+    def initialize():
+        classifier.loads += 1
+        if classifier.fail_loads:
+            raise RuntimeError('model download failed')
+        classifier.is_initialized = True
+
+    classifier.fail_loads = False
+    monkeypatch.setattr(classifier, 'initialize', initialize)
+    monkeypatch.setattr(classifier, '_rank_texts', lambda texts: [(['Work Stress'], [0.9]) for _ in texts])
+    return classifier
+
+
+TEXT = "Long day at the office with too many meetings"
+
+
+def test_degrades_while_warm_up_is_loading(classifier):
+    classifier._warming.set()
+    assert classifier.classify(TEXT)['category'] == 'General Productivity'
+    assert classifier.loads == 0
+    assert classifier.readiness() == {'state': 'warming', 'degraded': True, 'error': None}
+
+
+def test_loads_on_demand_when_warm_up_never_started(classifier):
+    assert classifier.classify(TEXT)['category'] == 'Work Stress'
+    assert classifier.loads == 1
+    assert classifier.readiness()['state'] == 'ready'
+
+
+def test_failed_warm_up_is_retried_after_the_interval(classifier, monkeypatch):
+    classifier.fail_loads = True
+    with pytest.raises(RuntimeError):
+        classifier.warmup()
+    assert classifier.readiness() == {'state': 'failed', 'degraded': True, 'error': 'model download failed'}
+
+    # Within the retry interval requests are degraded without reloading
+    assert classifier.classify(TEXT)['category'] == 'General Productivity'
+    assert classifier.loads == 1
+
+    classifier.fail_loads = False
+    monkeypatch.setattr(classifier, '_retry_at', 0.0)
+    assert classifier.classify("Another long day of meetings at the office")['category'] == 'Work Stress'
+    assert classifier.loads == 2
+    assert classifier.readiness() == {'state': 'ready', 'degraded': False, 'error': None}
+
+
+def in_forked_child(check):
+    """Run `check` in a forked child; whether it returned True"""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ok = check()
+        except BaseException:
+            ok = False
+        os.write(write_fd, b'1' if ok else b'0')
+        os._exit(0)
+
+    os.close(write_fd)
+    result = os.read(read_fd, 1)
+    os.waitpid(pid, 0)
+    os.close(read_fd)
+    return result == b'1'
+
+
+def test_a_worker_forked_mid_warm_up_warms_up_itself(classifier):
+    parent = os.getpid()
+    release = threading.Event()
+
+    def load():
+        if os.getpid() == parent:
+            # The parent's warm-up is still loading when the worker forks
+            release.wait(5)
+        classifier.warmup()
+
+    warmup = ModelWarmup()
+    warmup.register('context_classifier', load)
+    warmup.start()
+    time.sleep(0.05)
+    classifier._warming.set()
+    classifier._init_lock.acquire()
+    try:
+        def check():
+            return warmup.wait(5) and warmup.status()['state'] == 'ready' and classifier.readiness()['state'] == 'ready'
+
+        assert in_forked_child(check)
+    finally:
+        classifier._init_lock.release()
+        release.set()
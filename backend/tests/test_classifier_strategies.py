@@ -0,0 +1,115 @@
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.context_classifier import ContextClassifier
+from services.label_taxonomy import group_hypotheses, labels_in_group
+
+
+class KeywordEmbedder:
+    """Feature-extraction stand-in: one axis per label, set when a text names it"""
+
+    def __init__(self, labels):
+        self.labels = [label.lower() for label in labels]
+
+    def __call__(self, texts, truncation=True):
+        outputs = []
+        for text in texts:
+            vector = np.array([1.0 if label in text.lower() else 0.0 for label in self.labels]) + 1e-3
+            # (batch, tokens, dim) like the pipeline; two identical tokens
+            outputs.append([[vector.tolist(), vector.tolist()]])
+        return outputs
+
+
+class KeywordNLI:
+    """Entailment stand-in preferring labels the text names, earliest first; records what it scored"""
+
+    def __init__(self, aliases=None):
+        self.scored = {}
+        # Hypotheses counted as named when the text contains their alias
+        self.aliases = aliases or {}
+
+    def __call__(self, premises, hypotheses):
+        logits = []
+        for premise, hypothesis in zip(premises, hypotheses):
+            label = hypothesis[len("This example is "):-1]
+            self.scored.setdefault(premise, []).append(label)
+            position = premise.lower().find(self.aliases.get(label, label).lower())
+            logits.append(4.0 + 1.0 / (1 + position) if position >= 0 else 0.0)
+        return np.array(logits)
+
+
+def make_classifier(strategy, k=5):
+    settings = type('StrategySettings', (get_config(),), {
+        'CLASSIFIER_STRATEGY': strategy,
+        'CLASSIFIER_SHORTLIST_K': k,
+        'CLASSIFIER_STUDENT_ENABLED': False,
+        'CLASSIFIER_TEACHER_LOG': ''
+    })
+    classifier = ContextClassifier(settings)
+    classifier.is_initialized = True
+    classifier.nli = classifier._entailment_logits = KeywordNLI()
+    if strategy == 'shortlist':
+        classifier.embedder = KeywordEmbedder(classifier.labels)
+        classifier.label_embeddings = classifier._embed(classifier.labels)
+    return classifier
+
+
+TEXT = "Exam stress again, and the group project is going nowhere"
+
+
+def test_full_strategy_scores_every_label():
+    classifier = make_classifier('full')
+
+    assert classifier.classify(TEXT)['category'] == 'Exam Stress'
+    assert classifier.nli.scored == {TEXT: classifier.labels}
+
+
+def test_shortlist_scores_only_the_closest_labels():
+    classifier = make_classifier('shortlist', k=5)
+
+    result = classifier.classify(TEXT)
+
+    scored = classifier.nli.scored[TEXT]
+    assert len(set(scored) - set(ContextClassifier.CRITICAL_CATEGORIES)) <= 5
+    assert {'Exam Stress', 'Group Project'} | set(ContextClassifier.CRITICAL_CATEGORIES) <= set(scored)
+    assert result['category'] == 'Exam Stress'
+    assert result['alternate_categories'][0]['category'] == 'Group Project'
+
+
+def test_shortlist_larger_than_the_label_set_scores_everything():
+    classifier = make_classifier('shortlist', k=1000)
+    classifier.classify(TEXT)
+
+    assert classifier.nli.scored == {TEXT: classifier.labels}
+
+
+def test_hierarchical_scores_the_groups_then_the_best_groups_labels():
+    classifier = make_classifier('hierarchical')
+    classifier.nli.aliases = {"about school, university or studying": "exam"}
+
+    result = classifier.classify(TEXT)
+
+    assert classifier.nli.scored[TEXT] == group_hypotheses() + labels_in_group('academic') + ContextClassifier.CRITICAL_CATEGORIES
+    assert result['category'] == 'Exam Stress'
+    assert result['group'] == 'academic'
+
+
+CRISIS = "Swallowed too many pills after finishing the group project"
+
+
+@pytest.mark.parametrize('strategy', ['shortlist', 'hierarchical'])
+def test_cheaper_strategies_always_score_the_critical_categories(strategy):
+    # Neither the embeddings nor the groups point at the crisis here
+    classifier = make_classifier(strategy, k=3)
+    classifier.nli.aliases = {"about school, university or studying": "group project", "Overdose": "too many pills"}
+
+    result = classifier.classify(CRISIS)
+
+    assert set(ContextClassifier.CRITICAL_CATEGORIES) <= set(classifier.nli.scored[CRISIS])
+    assert result['category'] == 'Overdose'
+    assert result['urgency'] == 'critical'
+
+
+def test_full_is_the_default_strategy():
+    assert get_config().CLASSIFIER_STRATEGY == 'full'
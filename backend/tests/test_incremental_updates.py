@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.settings import get_config
+from services.ml_predictor import MLPredictor
+
+
+def make_predictor(tmp_path, family='gradient_boosting', **overrides):
+    settings = type('TestSettings', (get_config(),), {
+        'ML_ARTIFACT_DIR': str(tmp_path),
+        'ML_MODEL_FAMILY': family,
+        'ML_PREDICTION_GRID_ENABLED': False,
+        'ML_REPLAY_BUFFER_SIZE': 100,
+        'ML_REPLAY_SAMPLE': 50,
+        'ML_INCREMENTAL_TREES': 5,
+        **overrides
+    })
+    return MLPredictor(settings)
+
+
+def new_logs(count, seed):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'mood': rng.integers(1, 6, count).astype(float),
+        'energy': rng.integers(1, 6, count).astype(float),
+        'stress': rng.integers(1, 6, count).astype(float),
+        'sleep': np.round(rng.uniform(4, 10, count), 1)
+    })
+
+
+def test_replay_buffer_is_a_bounded_uniform_sample(tmp_path):
+    predictor = make_predictor(tmp_path)
+    stream = new_logs(5000, 0)
+    stream['mood'] = np.arange(len(stream), dtype=float)  # each row's position in the stream
+    labeled = predictor._label_training_data(stream)
+
+    for start in range(0, len(labeled), 250):
+        predictor._remember(labeled.iloc[start:start + 250])
+
+    assert predictor.seen == 5000
+    assert len(predictor.replay) == 100
+    assert predictor.replay['mood'].is_unique
+    # A uniform sample of 0..4999 averages about 2500, not the newest rows
+    assert 2000 < predictor.replay['mood'].mean() < 3000
+
+
+def test_update_leaves_the_original_and_advances_the_cursor(tmp_path):
+    predictor = make_predictor(tmp_path)
+    predictor.train_models(last_log_id=10)
+    before = predictor.predict_batch([(3, 3, 3, 7)])
+
+    updated = predictor.updated(new_logs(20, 1), last_log_id=30)
+
+    assert predictor.capacity_model.n_estimators == 100
+    assert updated.capacity_model.n_estimators == 105
+    assert (predictor.last_log_id, updated.last_log_id) == (10, 30)
+    assert (predictor.seen, updated.seen) == (1000, 1020)
+    assert len(updated.mode_classifier.estimators_) == len(predictor.mode_classifier.estimators_)
+    assert predictor.predict_batch([(3, 3, 3, 7)]) == before
+    assert updated.compiled is not None
+
+
+def test_boosting_is_compacted_at_the_stage_limit(tmp_path):
+    predictor = make_predictor(tmp_path, ML_MAX_BOOSTING_STAGES=104)
+    predictor.train_models()
+
+    updated = predictor.updated(new_logs(20, 2))
+
+    assert updated.capacity_model.n_estimators == 100
+    assert len(updated.capacity_model.estimators_) == 100
+
+
+@pytest.mark.parametrize('family', ['random_forest', 'hist_gradient_boosting'])
+def test_other_families_update(tmp_path, family):
+    predictor = make_predictor(tmp_path, family)
+    predictor.train_models()
+
+    updated = predictor.updated(new_logs(20, 3))
+
+    prediction = updated.predict_batch([(3, 3, 3, 7)])[0]
+    assert 0 <= prediction['capacity'] <= 100
+    if family == 'random_forest':
+        assert len(updated.capacity_model.estimators_) == len(predictor.capacity_model.estimators_)
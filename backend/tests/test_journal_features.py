@@ -0,0 +1,44 @@
+import pytest
+
+from services.journal_features import JournalFeatureExtractor
+
+
+@pytest.fixture(scope='module')
+def extractor():
+    return JournalFeatureExtractor()
+
+
+@pytest.mark.parametrize('text, hours', [
+    ("slept 6-7 hours", 6.5),
+    ("Only got five to six hrs of sleep", 5.5),
+    ("Slept for 7.5 hours last night", 7.5),
+    ("pulled an all-nighter for the exam", 0.0),
+])
+def test_sleep_hours(extractor, text, hours):
+    assert extractor.extract(text)['sleep_hours']['value'] == hours
+
+
+def test_counted_signals(extractor):
+    features = extractor.extract("Two coffees, a glass of wine and went for a run for 30 minutes. Took a nap.")
+    assert features['caffeine']['value'] == 2
+    assert features['alcohol']['value'] == 1
+    assert features['exercise']['value'] == 30
+    assert features['nap']['value'] is True
+
+
+@pytest.mark.parametrize('text', ["not stressed today", "no coffee", "skipped the gym"])
+def test_negated_cues_are_skipped(extractor, text):
+    features = extractor.extract(text)
+    assert features['stress'] is None and features['caffeine'] is None and features['exercise'] is None
+
+
+@pytest.mark.parametrize('text', ["not stressed, just tired", "not stressed but tired", "never stressed; tired"])
+def test_negation_stops_at_the_clause(extractor, text):
+    features = extractor.extract(text)
+    assert features['stress'] is None
+    assert features['energy']['evidence'] == ['tired']
+
+
+def test_estimate_metrics_falls_back_without_cues(extractor):
+    features = extractor.extract("slept 4 hours")
+    assert extractor.estimate_metrics(features, {'mood_score': 2}) == {'mood': 2, 'energy': 2.0, 'stress': 3, 'sleep': 4.0}
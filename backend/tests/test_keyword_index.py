@@ -0,0 +1,84 @@
+from datetime import date, datetime
+import threading
+
+from models.database import db, DailyLog, KeywordDaily, KeywordIndexStats, KeywordTerm
+from services.keyword_index import KeywordIndex, tokenize
+
+
+def doc_freq(user_id, term):
+    return db.session.query(KeywordTerm.doc_freq).filter_by(user_id=user_id, term=term).scalar()
+
+
+def test_tokenize_drops_stop_words_and_possessives():
+    assert tokenize("My manager's deadline, and the project's review!") == ['manager', 'deadline', 'project', 'review']
+
+
+def test_backfill_skips_the_committed_log_being_added(app_db, user):
+    index = KeywordIndex()
+    for text in ("deadline stress at work", "gym session after work"):
+        db.session.add(DailyLog(user_id=user.id, mood=3, energy=3, stress=3, sleep=7, journal_text=text,
+                                timestamp=datetime(2026, 10, 1)))
+    db.session.commit()
+    log = DailyLog.query.filter_by(journal_text="gym session after work").one()
+
+    index.add_document(user.id, log.journal_text, date(2026, 10, 1), log_id=log.id)
+    db.session.commit()
+
+    assert db.session.get(KeywordIndexStats, user.id).doc_count == 2
+    assert doc_freq(user.id, 'work') == 2
+    assert doc_freq(user.id, 'gym') == 1
+    daily = KeywordDaily.query.filter_by(user_id=user.id, term='work', day=date(2026, 10, 1)).one()
+    assert daily.count == 2
+
+
+def test_backfill_counts_only_logs_with_a_journal(app_db, user):
+    for text in ("deadline stress at work", "", None):
+        db.session.add(DailyLog(user_id=user.id, mood=3, energy=3, stress=3, sleep=7, journal_text=text,
+                                timestamp=datetime(2026, 10, 1)))
+    db.session.commit()
+
+    KeywordIndex().add_document(user.id, "gym session after work", date(2026, 10, 2))
+    db.session.commit()
+
+    assert db.session.get(KeywordIndexStats, user.id).doc_count == 2
+    assert doc_freq(user.id, 'work') == 2
+
+
+def test_keywords_and_themes_weight_rare_terms(app_db, user):
+    index = KeywordIndex()
+    for text in ("work meeting", "work lunch", "work deadline", "dentist appointment"):
+        index.add_document(user.id, text, date(2026, 10, 1))
+    db.session.commit()
+
+    assert index.keywords(user.id, "work dentist", top_k=1) == ['dentist']
+    themes = index.top_themes(user.id, days=7, today=date(2026, 10, 2))
+    assert themes[0]['term'] == 'work' and themes[0]['count'] == 3
+
+
+def test_concurrent_journals_keep_every_count(app_db, user):
+    index = KeywordIndex()
+    index.add_document(user.id, "first journal about work", date(2026, 10, 1))
+    db.session.commit()
+    user_id = user.id
+    errors = []
+
+    def add(text):
+        with app_db.app_context():
+            try:
+                index.add_document(user_id, text, date(2026, 10, 1))
+                db.session.commit()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=add, args=(f"work entry number {i}",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert db.session.get(KeywordIndexStats, user_id).doc_count == 9
+    assert doc_freq(user_id, 'work') == 9
+    assert KeywordDaily.query.filter_by(user_id=user_id, term='entry').one().count == 8
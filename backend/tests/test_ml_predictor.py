@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.ml_predictor import MLPredictor
+
+ROWS = np.column_stack([
+    np.random.default_rng(3).uniform(1, 5, (40, 3)),
+    np.random.default_rng(4).uniform(4, 10, 40)
+]).round(2).tolist()
+
+
+def train(**overrides):
+    predictor = MLPredictor(type('TestSettings', (get_config(),), overrides))
+    predictor.train_models()
+    return predictor
+
+
+@pytest.fixture(scope='module')
+def live():
+    return train(ML_PREDICTION_GRID_ENABLED=False, ML_FLAT_TREES_ENABLED=False)
+
+
+@pytest.fixture(scope='module')
+def flat():
+    return train(ML_PREDICTION_GRID_ENABLED=False, ML_FLAT_TREES_ENABLED=True)
+
+
+@pytest.fixture(scope='module')
+def gridded():
+    return train(ML_PREDICTION_GRID_ENABLED=True)
+
+
+@pytest.mark.parametrize('variant', ['live', 'flat', 'gridded'])
+def test_batch_matches_one_row_at_a_time(request, variant):
+    predictor = request.getfixturevalue(variant)
+
+    batch = predictor.predict_batch(ROWS)
+
+    assert len(batch) == len(ROWS)
+    for row, prediction in zip(ROWS, batch):
+        mode = predictor.predict_mode(*row)
+        assert prediction['capacity'] == pytest.approx(predictor.predict_capacity(*row))
+        assert (prediction['mode'], prediction['confidence']) == (mode['mode'], mode['confidence'])
+
+
+@pytest.mark.parametrize('variant', ['live', 'flat'])
+def test_batch_matches_the_fitted_models(request, variant):
+    predictor = request.getfixturevalue(variant)
+    features = predictor.scaler.transform(np.array(ROWS))
+
+    batch = predictor.predict_batch(ROWS)
+
+    if variant == 'flat':
+        assert predictor.compiled is not None
+    np.testing.assert_allclose(
+        [p['capacity'] for p in batch], np.clip(predictor.capacity_model.predict(features), 0, 100), atol=0.005
+    )
+    assert [p['mode'] for p in batch] == predictor.mode_classifier.predict(features).tolist()
+    np.testing.assert_allclose(
+        [list(p['all_modes'].values()) for p in batch], predictor.mode_classifier.predict_proba(features), atol=5e-5
+    )
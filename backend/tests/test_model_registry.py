@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.classifier_metrics import begin_request_timing, end_request_timing
+from services.ml_predictor import MLPredictor
+from services.model_registry import ModelRegistry
+
+
+@pytest.fixture(scope='module')
+def trained():
+    settings = type('TestSettings', (get_config(),), {
+        'ML_PREDICTION_GRID_ENABLED': False
+    })
+    predictor = MLPredictor(settings)
+    predictor.train_models(last_log_id=42)
+    return predictor
+
+
+def test_users_without_a_model_get_the_default(tmp_path, trained):
+    registry = ModelRegistry(trained, str(tmp_path))
+
+    assert registry.get_own(1) is None
+    assert registry.get(1) is trained
+    assert registry.get_own(1) is None
+    assert (registry.misses, registry.hits) == (1, 2)
+
+
+def test_published_models_load_in_another_process(tmp_path, trained):
+    registry = ModelRegistry(trained, str(tmp_path))
+    version = registry.publish(7, trained, samples=60)
+    # A second registry over the same directory stands in for another worker
+    loaded = ModelRegistry(MLPredictor(), str(tmp_path)).get_own(7)
+
+    assert version == 'user-7-v1'
+    assert loaded.version == version
+    assert loaded.last_log_id == 42
+    assert loaded.seen == trained.seen
+    assert len(loaded.replay) == len(trained.replay)
+    # The flat trees come from the artifact's mapped arrays, not a recompile
+    assert isinstance(loaded.compiled.mode.value.base, np.memmap)
+    assert loaded.predict_batch([(3, 3, 3, 7), (1, 2, 5, 4)]) == trained.predict_batch([(3, 3, 3, 7), (1, 2, 5, 4)])
+
+
+def test_newer_versions_replace_cached_ones_and_old_artifacts_are_pruned(tmp_path, trained):
+    registry = ModelRegistry(trained, str(tmp_path), refresh_seconds=0)
+    reader = ModelRegistry(MLPredictor(), str(tmp_path), refresh_seconds=0)
+
+    registry.publish(7, trained)
+    assert reader.get_own(7).version == 'user-7-v1'
+    registry.publish(7, trained)
+    registry.publish(7, trained)
+
+    assert reader.get_own(7).version == 'user-7-v3'
+    assert sorted(name for name in os.listdir(tmp_path / '7') if name.endswith('.joblib')) == ['v2.joblib', 'v3.joblib']
+
+
+def test_least_recently_used_models_are_evicted(tmp_path, trained):
+    registry = ModelRegistry(trained, str(tmp_path), max_models=2)
+    for user_id in (1, 2, 3):
+        registry.publish(user_id, trained)
+    registry.get_own(2)
+    registry.publish(4, trained)
+
+    stats = registry.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 2
+    assert list(registry._entries) == [2, 4]
+    # An evicted model is loaded again from disk
+    assert registry.get_own(1).version == 'user-1-v1'
+
+
+def test_publishing_the_default_swaps_it(tmp_path, trained):
+    default = MLPredictor()
+    registry = ModelRegistry(default, str(tmp_path))
+
+    assert registry.publish(None, trained) == 'ml-v2'
+    assert registry.default is trained
+    assert registry.get(5) is trained
+
+
+def test_users_without_a_model_do_not_take_model_slots(tmp_path, trained):
+    registry = ModelRegistry(trained, str(tmp_path), max_models=2)
+    registry.publish(1, trained)
+    registry.publish(2, trained)
+    for user_id in range(100, 103):
+        assert registry.get_own(user_id) is None
+
+    stats = registry.stats()
+    assert (stats['loaded_models'], stats['evictions']) == (2, 0)
+    # Their markers are capped on their own, oldest first
+    assert list(registry._entries) == [1, 2, 101, 102]
+
+
+def test_registry_loads_stay_out_of_server_timing(tmp_path, trained):
+    ModelRegistry(trained, str(tmp_path)).publish(7, trained)
+    begin_request_timing()
+    registry = ModelRegistry(MLPredictor(), str(tmp_path))
+    registry.get_own(7)
+
+    assert end_request_timing() == []
+    assert registry.stats()['load']['count'] == 1
@@ -0,0 +1,198 @@
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import os
+import socket
+import time
+
+import pytest
+
+from config.settings import get_config
+from services import model_server
+from services.classification_cache import ClassificationCache
+from services.classifier_metrics import ClassifierMetrics
+from services.model_client import ModelClient, ModelServerError
+from services.model_protocol import recv_message, send_message
+from services.model_warmup import ModelWarmup
+
+
+class StubClassifier:
+    """Echoes each text back; 'slow' texts take a while and 'boom' fails"""
+
+    def __init__(self, settings):
+        self.cache = ClassificationCache()
+        self.metrics = ClassifierMetrics(enabled=False)
+
+    def warmup(self):
+        pass
+
+    def classify(self, text):
+        if text.startswith('slow'):
+            time.sleep(0.5)
+        if text == 'boom':
+            raise ValueError('bad journal')
+        return {'category': text, 'server_pid': os.getpid()}
+
+    def classify_batch(self, texts):
+        return [self.classify(text) for text in texts]
+
+    def get_safety_response(self, category, urgency):
+        return None
+
+
+class StubEngine:
+    def warmup(self):
+        pass
+
+    def generate_plan(self, context_category, urgency, mode, sentiment, group=None):
+        return {'title': context_category}
+
+
+class ServerSettings(get_config()):
+    MODEL_WARMUP_ENABLED = False
+
+
+def serve(socket_path):
+    model_server.ContextClassifier = StubClassifier
+    model_server.AIEngine = StubEngine
+    model_server.ModelServer(socket_path, ServerSettings).serve_forever()
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / 'models.sock')
+
+
+@pytest.fixture
+def start_server(socket_path):
+    processes = []
+
+    def start():
+        process = multiprocessing.get_context('fork').Process(target=serve, args=(socket_path,), daemon=True)
+        process.start()
+        processes.append(process)
+        deadline = time.monotonic() + 10
+        # The socket file appears at bind(), slightly before the server listens
+        while ModelClient(socket_path).ping() is None:
+            assert process.is_alive() and time.monotonic() < deadline, 'model server did not start'
+            time.sleep(0.01)
+        return process
+
+    yield start
+    for process in processes:
+        process.kill()
+        process.join()
+
+
+def test_concurrent_calls_are_pipelined_on_one_connection(start_server, socket_path):
+    start_server()
+    client = ModelClient(socket_path, timeout=10)
+    client.call('health')
+    sock = client._sock
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda i: client.call('classify', f'journal {i}')['category'], range(64)))
+
+    assert results == [f'journal {i}' for i in range(64)]
+    assert client._sock is sock
+
+
+def test_fast_answers_overtake_slow_ones(start_server, socket_path):
+    start_server()
+    client = ModelClient(socket_path, timeout=10)
+    finished = []
+
+    def classify(text):
+        client.call('classify', text)
+        finished.append(text)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pool.submit(classify, 'slow journal')
+        time.sleep(0.1)
+        pool.submit(classify, 'quick journal')
+
+    assert finished == ['quick journal', 'slow journal']
+
+
+def test_remote_errors_are_raised_to_the_caller(start_server, socket_path):
+    start_server()
+    client = ModelClient(socket_path, timeout=10)
+
+    with pytest.raises(ModelServerError, match='ValueError: bad journal'):
+        client.call('classify', 'boom')
+    with pytest.raises(ModelServerError, match='Unknown method'):
+        client.call('train')
+    assert client.call('classify_batch', ['a', 'b'])[1]['category'] == 'b'
+
+
+def test_forked_workers_open_their_own_connection(start_server, socket_path):
+    start_server()
+    client = ModelClient(socket_path, timeout=10)
+    client.call('health')
+    sock = client._sock
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: the inherited connection has no reader thread here
+        try:
+            ok = client.call('classify', 'from the child')['category'] == 'from the child' and client._sock is not sock
+        except BaseException:
+            ok = False
+        os.write(write_fd, b'1' if ok else b'0')
+        os._exit(0)
+
+    os.close(write_fd)
+    assert os.read(read_fd, 1) == b'1'
+    os.waitpid(pid, 0)
+    os.close(read_fd)
+    assert client.call('classify', 'from the parent')['category'] == 'from the parent'
+    assert client._sock is sock
+
+
+def test_client_reconnects_after_the_server_restarts(start_server, socket_path):
+    first = start_server()
+    client = ModelClient(socket_path, timeout=10)
+    assert client.call('classify', 'before')['server_pid'] == first.pid
+
+    first.kill()
+    first.join()
+    os.unlink(socket_path)
+    with pytest.raises(ModelServerError):
+        client.call('classify', 'while down')
+    assert client.ping() is None
+
+    second = start_server()
+    assert client.call('classify', 'after')['server_pid'] == second.pid
+
+
+def test_malformed_requests_get_an_error_and_keep_the_connection(start_server, socket_path):
+    start_server()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    try:
+        for request, problem in [
+            ({'method': 'health'}, "missing 'id'"),
+            (['health'], 'expected an object'),
+            ({'id': 1, 'method': 'classify', 'args': 'journal'}, "'args' must be a list")
+        ]:
+            send_message(sock, request)
+            assert problem in recv_message(sock)['error']
+
+        send_message(sock, {'id': 2, 'method': 'classify', 'args': ['still here']})
+        response = recv_message(sock)
+        assert (response['id'], response['result']['category']) == (2, 'still here')
+    finally:
+        sock.close()
+
+
+def test_a_live_check_replaces_a_failed_warm_up():
+    warmup = ModelWarmup()
+    warmup.register('context_classifier', lambda: ModelClient('/nonexistent.sock').call('health'))
+    warmup.start()
+    warmup.wait(5)
+    assert warmup.status()['state'] == 'degraded'
+
+    warmup.record('context_classifier', True)
+    assert warmup.status()['state'] == 'ready'
+    warmup.record('context_classifier', False, error='model server unreachable')
+    assert warmup.status()['models']['context_classifier']['error'] == 'model server unreachable'
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.context_classifier import ContextClassifier
+from services.onnx_backend import OnnxNLIBackend
+
+
+def make_classifier(backend):
+    settings = type('BackendSettings', (get_config(),), {
+        'CLASSIFIER_STRATEGY': 'full',
+        'CLASSIFIER_BACKEND': backend,
+        'CLASSIFIER_BATCHING_ENABLED': False,
+        'CLASSIFIER_STUDENT_ENABLED': False,
+        'CLASSIFIER_TEACHER_LOG': ''
+    })
+    return ContextClassifier(settings)
+
+
+class StubBackend:
+    def __init__(self):
+        self.calls = []
+
+    def tokenize(self, premises, hypotheses):
+        self.calls.append(list(premises))
+        return hypotheses
+
+    def run(self, hypotheses):
+        return np.array([1.0 if 'Burnout' in hypothesis else 0.0 for hypothesis in hypotheses])
+
+
+def test_onnx_backend_is_selected_by_setting():
+    classifier = make_classifier('onnx')
+
+    assert isinstance(classifier.nli_backend, OnnxNLIBackend)
+    assert classifier.nli_backend.model_path.endswith('model.int8.onnx')
+    # Results from the two backends never share cache entries
+    assert classifier.cache_version != make_classifier('torch').cache_version
+
+
+def test_torch_backend_uses_the_pipeline(monkeypatch):
+    classifier = make_classifier('torch')
+    classifier.is_initialized = True
+    monkeypatch.setattr(classifier, '_torch_entailment_logits', lambda premises, hypotheses: np.array(
+        [1.0 if 'Burnout' in hypothesis else 0.0 for hypothesis in hypotheses]
+    ))
+
+    assert classifier.nli_backend is None
+    assert classifier.classify("Long day at the office with too many meetings")['category'] == 'Burnout'
+
+
+def test_missing_onnxruntime_falls_back_to_the_pipeline(monkeypatch):
+    import services.context_classifier as context_classifier
+
+    def missing():
+        raise ImportError("No module named 'onnxruntime'")
+
+    classifier = make_classifier('onnx')
+    monkeypatch.setattr(classifier.nli_backend, 'load', missing)
+    monkeypatch.setattr(context_classifier, 'pipeline', lambda task, model, device: task)
+    classifier.initialize()
+
+    assert (classifier.nli_backend, classifier.backend) == (None, 'torch')
+    assert classifier.cache_version == make_classifier('torch').cache_version
+    assert classifier.classifier == 'zero-shot-classification'
+
+
+def test_onnx_backend_scores_every_pair():
+    classifier = make_classifier('onnx')
+    classifier.is_initialized = True
+    classifier.nli_backend = StubBackend()
+
+    result = classifier.classify("Long day at the office with too many meetings")
+
+    assert result['category'] == 'Burnout'
+    assert sum(len(call) for call in classifier.nli_backend.calls) == len(classifier.labels)
+
+
+def test_entailment_id_follows_the_model_config():
+    config = type('Config', (), {'label2id': {'contradiction': 0, 'neutral': 1, 'entailment': 2}})
+    assert OnnxNLIBackend._find_entailment_id(config) == 2
+
+
+def test_quantized_model_runs_when_cached():
+    pytest.importorskip('onnxruntime')
+    settings = get_config()
+    backend = OnnxNLIBackend(settings.AI_MODELS['classifier'], settings.AI_MODEL_CACHE_DIR)
+    if not os.path.exists(backend.model_path):
+        pytest.skip('quantized model has not been exported')
+    backend.load()
+
+    logits = backend.entailment_logits(["I failed my exam"] * 2, ["This example is Exam Stress.", "This example is Flu."])
+
+    assert logits.shape == (2,)
+    assert logits[0] > logits[1]
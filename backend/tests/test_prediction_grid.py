@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.ml_predictor import MLPredictor
+from services.prediction_grid import PredictionGrid
+
+
+@pytest.fixture(scope='module')
+def predictor(tmp_path_factory):
+    settings = type('TestSettings', (get_config(),), {
+        'ML_ARTIFACT_DIR': str(tmp_path_factory.mktemp('ml')),
+        'ML_PREDICTION_GRID_ENABLED': False
+    })
+    predictor = MLPredictor(settings)
+    predictor.train_models()
+    return predictor
+
+
+def random_inputs(samples, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(1, 5, (samples, 3)), rng.uniform(4, 10, samples)])
+
+
+def sklearn_predictions(predictor, inputs):
+    scaled = predictor.scaler.transform(inputs)
+    return np.clip(predictor.capacity_model.predict(scaled), 0, 100), predictor.mode_classifier.predict_proba(scaled)
+
+
+def test_grid_is_off_by_default(predictor):
+    assert get_config().ML_PREDICTION_GRID_ENABLED is False
+    assert predictor.grid is None
+
+
+def test_predictions_are_rounded_python_floats(predictor):
+    prediction = predictor.predict_batch([(3, 3, 3, 7)])[0]
+    assert type(prediction['capacity']) is float and prediction['capacity'] == round(prediction['capacity'], 2)
+    assert all(type(value) is float and value == round(value, 4) for value in prediction['all_modes'].values())
+    assert prediction['mode'] == max(prediction['all_modes'], key=prediction['all_modes'].get)
+
+
+@pytest.mark.filterwarnings('ignore:X does not have valid feature names')
+def test_grid_stays_close_to_the_models(predictor):
+    grid = PredictionGrid.build(predictor)
+    inputs = random_inputs(2000, 0)
+    capacity, probabilities = sklearn_predictions(predictor, inputs)
+    grid_capacity, grid_probabilities = grid.predict(inputs)
+
+    # Approximate by design, hence off by default
+    assert np.abs(grid_capacity - capacity).mean() < 1.0
+    assert np.abs(grid_capacity - capacity).max() < 6.0
+    assert np.abs(grid_probabilities - probabilities).mean() < 0.05
+    assert (grid_probabilities.argmax(axis=1) == probabilities.argmax(axis=1)).mean() > 0.9
+    # One-row lookups take their own path
+    single = np.array([grid.predict(inputs[i:i + 1])[0][0] for i in range(50)])
+    np.testing.assert_allclose(single, grid_capacity[:50], atol=1e-4)
@@ -0,0 +1,80 @@
+import json
+import sys
+
+import pytest
+
+from config.settings import get_config
+from models.database import db, DailyLog
+import scripts.reclassify_logs as reclassify_logs
+
+
+class CountingClassifier:
+    """Labels every journal 'Work Stress', failing once `fail_after` batches are done"""
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.seen = []
+
+    def classify_batch(self, texts):
+        if self.fail_after is not None and len(self.seen) >= self.fail_after:
+            raise KeyboardInterrupt
+        self.seen.append(list(texts))
+        return [{'category': 'Work Stress', 'confidence': 0.9, 'model_version': 'test'} for _ in texts]
+
+
+@pytest.fixture
+def journals(app_db, user):
+    for i in range(25):
+        db.session.add(DailyLog(user_id=user.id, mood=3, energy=3, stress=3, sleep=7,
+                                journal_text=f"journal {i}" if i % 5 else None))
+    db.session.commit()
+    return [log.id for log in DailyLog.query.filter(DailyLog.journal_text.isnot(None)).order_by(DailyLog.id)]
+
+
+def run(monkeypatch, app_db, checkpoint, classifier, *args):
+    settings = type('TestSettings', (get_config(),), {
+        'SQLALCHEMY_DATABASE_URI': app_db.config['SQLALCHEMY_DATABASE_URI']
+    })
+    monkeypatch.setattr(reclassify_logs, 'get_config', lambda: settings)
+    monkeypatch.setattr(reclassify_logs, 'init_worker', lambda args: setattr(reclassify_logs, '_classifier', classifier))
+    monkeypatch.setattr(sys, 'argv', ['reclassify_logs', '--no-student', '--checkpoint', str(checkpoint),
+                                      '--batch-size', '2', '--page-size', '5', '--commit-every', '4', *args])
+    reclassify_logs.main()
+
+
+def test_interrupted_run_resumes_after_the_last_commit(monkeypatch, app_db, journals, tmp_path):
+    checkpoint = tmp_path / 'checkpoint.json'
+
+    with pytest.raises(KeyboardInterrupt):
+        run(monkeypatch, app_db, checkpoint, CountingClassifier(fail_after=5))
+    saved = json.loads(checkpoint.read_text())
+    # Pages of five split into batches of 2, 2, 1; commits once four rows are pending
+    assert (saved['last_id'], saved['processed']) == (journals[8], 9)
+    db.session.remove()
+    assert DailyLog.query.filter(DailyLog.detected_context.isnot(None)).count() == 9
+
+    resumed = CountingClassifier()
+    run(monkeypatch, app_db, checkpoint, resumed)
+
+    assert [text for batch in resumed.seen for text in batch] == [f"journal {i}" for i in range(25) if i % 5][9:]
+    assert json.loads(checkpoint.read_text())['processed'] == len(journals)
+    db.session.remove()
+    assert DailyLog.query.filter(DailyLog.detected_context == 'Work Stress').count() == len(journals)
+    assert DailyLog.query.filter(DailyLog.journal_text.is_(None), DailyLog.detected_context.isnot(None)).count() == 0
+
+
+def test_restart_and_a_new_classifier_start_over(monkeypatch, app_db, journals, tmp_path):
+    checkpoint = tmp_path / 'checkpoint.json'
+    run(monkeypatch, app_db, checkpoint, CountingClassifier())
+
+    again = CountingClassifier()
+    run(monkeypatch, app_db, checkpoint, again)
+    assert again.seen == []
+
+    run(monkeypatch, app_db, checkpoint, again, '--restart')
+    assert sum(len(batch) for batch in again.seen) == len(journals)
+
+    saved = json.loads(checkpoint.read_text())
+    assert reclassify_logs.load_checkpoint(str(checkpoint), saved['classifier_version']) == (journals[-1], len(journals))
+    assert reclassify_logs.load_checkpoint(str(checkpoint), 'other') == (0, 0)
+    assert reclassify_logs.load_checkpoint(str(tmp_path / 'missing.json'), saved['classifier_version']) == (0, 0)
@@ -0,0 +1,96 @@
+import pytest
+
+from config.settings import get_config
+from scripts.safety_eval_set import SAFETY_EVAL_SET
+from services.safety_matcher import SAFETY_LEXICON, SafetyMatcher
+
+MIN_CONFIDENCE = get_config().SAFETY_FAST_PATH_MIN_CONFIDENCE
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SafetyMatcher()
+
+
+def fast_path_category(matcher, text):
+    """The category the fast path would answer with, or None to defer to the model"""
+    match = matcher.match(text)
+    return match['category'] if match and match['confidence'] >= MIN_CONFIDENCE else None
+
+
+@pytest.mark.parametrize('text, expected', SAFETY_EVAL_SET)
+def test_labeled_set(matcher, text, expected):
+    assert fast_path_category(matcher, text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    "hurt myself at the gym",
+    "the baby kicked me",
+    "my brother beat me at chess",
+    "can't breathe lol this meme",
+    "coffee overdose",
+    "unconscious bias at work training",
+    "my dog has seizures, picked up her seizure meds",
+    "my drunk friend had slurred speech",
+    "instagram stalker lol",
+    "the camera flashed me",
+    "passed out on the couch after the ambulance drama on Grey's Anatomy",
+    "a documentary about suicide prevention and suicidal teens",
+])
+def test_everyday_phrases_defer_to_the_model(matcher, text):
+    assert fast_path_category(matcher, text) is None
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("I want to hurt myself again tonight", 'Self-Harm'),
+    ("He beat me up outside the bar", 'Physical Assault'),
+    ("I can't breathe and my lips are turning blue", 'Medical Emergency'),
+    ("She overdosed on her pills", 'Overdose'),
+])
+def test_qualified_phrases_take_the_fast_path(matcher, text, expected):
+    assert fast_path_category(matcher, text) == expected
+
+
+@pytest.mark.parametrize('text', [
+    "I am not okay, I want to die",
+    "I'm not fine. I want to kill myself",
+    "I don't know why but I want to die",
+    "Nothing helps and I want to end my life",
+])
+def test_negation_stops_at_the_clause(matcher, text):
+    assert fast_path_category(matcher, text) == 'Suicidal Ideation'
+
+
+@pytest.mark.parametrize('text', [
+    "I don't think I will ever hurt myself",
+    "I'm not suicidal",
+    "I would never cut myself",
+])
+def test_negated_mentions_do_not_match(matcher, text):
+    assert matcher.match(text) is None
+
+
+def test_noisy_or_combines_phrases_and_ranks_alternates(matcher):
+    match = matcher.match("I cut myself and then I overdosed")
+    assert match['category'] == 'Self-Harm'
+    assert match['alternates'] == [{'category': 'Overdose', 'confidence': 0.95}]
+    assert matcher.match("I want to kill myself, I want to die")['confidence'] == pytest.approx(1 - 0.05 * 0.1, abs=1e-3)
+
+
+def test_a_concept_counts_once(matcher):
+    assert matcher.match("I cut myself, I keep cutting myself")['confidence'] == 0.95
+    assert matcher.match("I had a seizure, my seizures are back")['confidence'] == 0.9
+
+
+def test_bare_mentions_never_add_up(matcher):
+    match = matcher.match("passed out, someone called the ambulance, still unconscious")
+    assert (match['category'], match['confidence']) == ('Medical Emergency', 0.6)
+
+
+def test_single_words_stay_below_the_fast_path():
+    single_words = [
+        (phrase, weight) for concepts in SAFETY_LEXICON.values()
+        for entries in concepts for phrase, weight in entries if ' ' not in phrase
+    ]
+    assert single_words
+    assert all(weight < MIN_CONFIDENCE for _, weight in single_words)
@@ -0,0 +1,63 @@
+import numpy as np
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from services.sentiment_batch import SENTIMENT_COLUMNS, SentimentBatchScorer
+
+JOURNALS = [
+    "Great day, finally finished the project and celebrated with friends!",
+    "Terrible sleep, anxious about the exam tomorrow.",
+    "Nothing much happened.",
+    "I hate how tired I am all the time",
+    "Grateful for a calm, quiet weekend"
+]
+
+
+def expected_columns(texts):
+    analyzer = SentimentIntensityAnalyzer()
+    scores = [analyzer.polarity_scores(text) if text else dict.fromkeys(SENTIMENT_COLUMNS, 0.0) for text in texts]
+    return {column: np.array([score[column] for score in scores]) for column in SENTIMENT_COLUMNS}
+
+
+def test_columns_match_per_text_vader():
+    texts = JOURNALS + [None, '']
+
+    columns = SentimentBatchScorer().score(texts)
+
+    for column, values in expected_columns(texts).items():
+        np.testing.assert_allclose(columns[column], values)
+
+
+def test_repeated_texts_are_scored_once():
+    scorer = SentimentBatchScorer()
+    calls = []
+    polarity_scores = scorer.analyzer.polarity_scores
+    scorer.analyzer.polarity_scores = lambda text: calls.append(text) or polarity_scores(text)
+
+    columns = scorer.score(JOURNALS * 3)
+    scorer.score(JOURNALS[:2])
+
+    assert sorted(calls) == sorted(JOURNALS)
+    np.testing.assert_allclose(columns['compound'], expected_columns(JOURNALS * 3)['compound'])
+
+
+def test_least_recently_used_scores_are_forgotten():
+    scorer = SentimentBatchScorer(cache_size=2)
+    scorer.score(JOURNALS[:3])
+
+    assert len(scorer.cache) == 2
+    assert scorer.cache.get(JOURNALS[0]) is None
+
+
+def test_parallel_scoring_matches_serial():
+    texts = [f"{journal} (day {i})" for i in range(40) for journal in JOURNALS]
+    serial = SentimentBatchScorer().score(texts)
+    scorer = SentimentBatchScorer(workers=2, parallel_threshold=1, chunk_size=16)
+
+    try:
+        parallel = scorer.score(texts)
+        assert scorer._pool is not None
+    finally:
+        scorer.close()
+
+    for column in SENTIMENT_COLUMNS:
+        np.testing.assert_array_equal(parallel[column], serial[column])
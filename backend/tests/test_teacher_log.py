@@ -0,0 +1,30 @@
+import os
+
+from services.student_classifier import TeacherLog
+
+
+def test_rotates_at_max_bytes_and_loads_both_files(tmp_path):
+    sizing = TeacherLog(str(tmp_path / 'sizing.jsonl'))
+    sizing.append("journal 0 " + 'x' * 60, 'Work Stress', 0.9, 'nli-test')
+    line_bytes = os.path.getsize(sizing.path)
+
+    # Three lines fill a file; the oldest rotated file is dropped
+    log = TeacherLog(str(tmp_path / 'logs' / 'teacher.jsonl'), max_bytes=3 * line_bytes)
+    for i in range(7):
+        log.append(f"journal {i} " + 'x' * 60, 'Work Stress', 0.9, 'nli-test')
+
+    assert os.path.getsize(log.path + '.1') == 3 * line_bytes
+    assert os.path.getsize(log.path) == line_bytes
+    assert [example['text'][:9] for example in log.load()] == [f"journal {i}" for i in range(3, 7)]
+
+
+def test_latest_label_wins_and_low_confidence_drops_it(tmp_path):
+    log = TeacherLog(str(tmp_path / 'teacher.jsonl'))
+    log.append("same journal", 'Work Stress', 0.9, 'nli-test')
+    log.append("same journal", 'Burnout', 0.8, 'nli-test')
+    log.append("other journal", 'Burnout', 0.9, 'nli-test')
+    log.append("other journal", 'Work Stress', 0.1, 'nli-test')
+
+    assert [(example['text'], example['category']) for example in log.load(min_confidence=0.5)] == [
+        ("same journal", 'Burnout')
+    ]
@@ -0,0 +1,116 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from services.ml_predictor import MLPredictor
+from services.training_jobs import TrainingJobQueue
+
+
+class BlockingRegistry:
+    """Records publications; the first waits until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.publishing = threading.Event()
+        self.published = []
+        self.models = {}
+
+    def publish(self, user_id, predictor, samples=None):
+        self.publishing.set()
+        self.release.wait(10)
+        self.models[user_id] = predictor
+        self.published.append((user_id, samples))
+        return f'v{len(self.published)}'
+
+    def get_own(self, user_id):
+        return self.models.get(user_id)
+
+
+def logs(count, first_id=1):
+    rng = np.random.default_rng(first_id)
+    return pd.DataFrame({
+        'id': np.arange(first_id, first_id + count),
+        'mood': rng.integers(1, 6, count).astype(float),
+        'energy': rng.integers(1, 6, count).astype(float),
+        'stress': rng.integers(1, 6, count).astype(float),
+        'sleep': np.round(rng.uniform(4, 10, count), 1)
+    })
+
+
+def wait_until_idle(queue, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = queue.status()
+        if not status['queued'] and status['running'] is None:
+            return status
+        time.sleep(0.05)
+    pytest.fail('training jobs did not finish')
+
+
+@pytest.fixture
+def queue():
+    registry = BlockingRegistry()
+    queue = TrainingJobQueue(registry)
+    yield queue
+    registry.release.set()
+    queue.stop()
+
+
+def test_newer_jobs_replace_queued_ones_for_the_same_user(queue):
+    registry = queue.registry
+    first = queue.submit(logs(60), user_id=1, last_log_id=60)
+    registry.publishing.wait(30)
+
+    replaced = queue.submit(logs(70), user_id=1, last_log_id=70)
+    newest = queue.submit(logs(80), user_id=1, last_log_id=80)
+    # An update never displaces a queued full retrain
+    update = queue.submit(logs(5, 81), user_id=1, incremental=True, last_log_id=85)
+    assert update['state'] == 'superseded'
+    assert [job['id'] for job in queue.status()['queued']] == [newest['id']]
+
+    registry.release.set()
+    status = wait_until_idle(queue)
+
+    states = {job['id']: job['state'] for job in status['recent']}
+    assert states == {first['id']: 'succeeded', replaced['id']: 'superseded',
+                      newest['id']: 'succeeded', update['id']: 'superseded'}
+    assert registry.published == [(1, 60), (1, 80)]
+    assert registry.models[1].last_log_id == 80
+
+
+def test_updates_skip_logs_the_model_already_has(queue):
+    registry = queue.registry
+    registry.release.set()
+    queue.submit(logs(60), user_id=1, last_log_id=60)
+    wait_until_idle(queue)
+
+    stale = queue.submit(logs(10, 51), user_id=1, incremental=True, last_log_id=60)
+    wait_until_idle(queue)
+    fresh = queue.submit(logs(10, 55), user_id=1, incremental=True, last_log_id=64)
+    status = wait_until_idle(queue)
+
+    states = {job['id']: job['state'] for job in status['recent']}
+    assert (states[stale['id']], states[fresh['id']]) == ('skipped', 'succeeded')
+    assert registry.models[1].last_log_id == 64
+    assert registry.models[1].seen == 60 + 4
+
+
+def test_failed_jobs_are_reported(queue):
+    queue.registry.release.set()
+    job = queue.submit(logs(5), user_id=2, incremental=True, last_log_id=5)
+    status = wait_until_idle(queue)
+
+    failed = next(recent for recent in status['recent'] if recent['id'] == job['id'])
+    assert failed['state'] == 'failed'
+    assert 'no model to update' in failed['error']
+
+
+def test_logged_days_get_derived_targets():
+    predictor = MLPredictor()
+    predictor.train_models(logs(60))
+
+    assert predictor.is_trained
+    assert 0 <= predictor.predict_capacity(4, 4, 2, 8) <= 100
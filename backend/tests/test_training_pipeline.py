@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from services.training_pipeline import MODEL_FAMILIES, TrainingPipeline
+
+
+def training_data(samples=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(samples, 4))
+    y_capacity = 50 + 10 * X[:, 0] - 5 * X[:, 2] + rng.normal(size=samples)
+    y_mode = np.where(X[:, 0] > 0.5, 'peak', np.where(X[:, 2] > 0.5, 'recovery', 'steady'))
+    return X, y_capacity, y_mode
+
+
+@pytest.mark.parametrize('family', sorted(MODEL_FAMILIES))
+def test_each_family_fits_the_same_in_threads(family):
+    X, y_capacity, y_mode = training_data()
+
+    capacity, mode = TrainingPipeline(family, n_jobs=1).fit(X, y_capacity, y_mode)
+    threaded_capacity, threaded_mode = TrainingPipeline(family, n_jobs=2).fit(X, y_capacity, y_mode)
+
+    np.testing.assert_allclose(capacity.predict(X), threaded_capacity.predict(X))
+    np.testing.assert_allclose(mode.predict_proba(X), threaded_mode.predict_proba(X))
+    assert sorted(mode.classes_) == ['peak', 'recovery', 'steady']
+    # Fitted models serve without a worker pool
+    for model in (threaded_capacity, threaded_mode):
+        assert model.get_params().get('n_jobs') is None
+
+
+def test_random_state_and_jobs_are_passed_where_taken():
+    forest = TrainingPipeline('random_forest', n_jobs=4, random_state=7).new_model('mode')
+    boosting = TrainingPipeline('gradient_boosting', n_jobs=4, random_state=7).new_model('capacity')
+
+    assert (forest.n_jobs, forest.random_state) == (4, 7)
+    assert boosting.random_state == 7 and 'n_jobs' not in boosting.get_params()
+
+
+def test_unknown_family_is_rejected():
+    with pytest.raises(ValueError):
+        TrainingPipeline('xgboost')
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from config.settings import get_config
+from services.ml_predictor import MLPredictor
+from services.training_pipeline import MODEL_FAMILIES
+from services.tree_ensemble import CompiledModels
+
+
+def trained(tmp_path, family, **overrides):
+    settings = type('TestSettings', (get_config(),), {
+        'ML_ARTIFACT_DIR': str(tmp_path),
+        'ML_MODEL_FAMILY': family,
+        'ML_PREDICTION_GRID_ENABLED': False,
+        **overrides
+    })
+    predictor = MLPredictor(settings)
+    predictor.train_models()
+    return predictor
+
+
+def random_inputs(samples, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([rng.uniform(1, 5, (samples, 3)), rng.uniform(4, 10, samples)])
+
+
+@pytest.mark.parametrize('family', sorted(MODEL_FAMILIES))
+def test_flat_trees_match_sklearn(tmp_path, family):
+    predictor = trained(tmp_path, family)
+    compiled = CompiledModels.from_predictor(predictor)
+    if family == 'hist_gradient_boosting':
+        assert compiled is None
+        return
+
+    inputs = random_inputs(500)
+    scaled = predictor.scaler.transform(inputs)
+    capacity, probabilities = compiled.predict(inputs)
+
+    np.testing.assert_allclose(capacity, np.clip(predictor.capacity_model.predict(scaled), 0, 100), atol=1e-9)
+    np.testing.assert_allclose(probabilities, predictor.mode_classifier.predict_proba(scaled), atol=1e-9)
+    assert compiled.classes == [str(label) for label in predictor.mode_classifier.classes_]
+    # One row takes its own path
+    np.testing.assert_allclose(compiled.predict(inputs[:1])[0], capacity[:1], atol=1e-9)
+
+
+def test_boosting_baseline_is_the_initial_prediction(tmp_path):
+    predictor = trained(tmp_path, 'gradient_boosting')
+    compiled = CompiledModels.from_predictor(predictor)
+    regressor = predictor.capacity_model
+
+    # With no stages applied the model predicts its init_ constant
+    stages = compiled.capacity.predict(np.zeros((1, regressor.n_features_in_), dtype=np.float32))[0, 0]
+    assert compiled.baseline == pytest.approx(regressor.predict(np.zeros((1, regressor.n_features_in_)))[0] - stages)
+
+
+def mapped(array):
+    while array is not None and not isinstance(array, np.memmap):
+        array = array.base
+    return array is not None
+
+
+def test_loaded_models_predict_from_the_mapped_flat_arrays(tmp_path):
+    predictor = trained(tmp_path, 'random_forest')
+    predictor.save_models()
+
+    loaded = MLPredictor(type('TestSettings', (get_config(),), {
+        'ML_ARTIFACT_DIR': str(tmp_path),
+        'ML_PREDICTION_GRID_ENABLED': False
+    }))
+    assert loaded.load_models()
+
+    for ensemble in (loaded.compiled.capacity, loaded.compiled.mode):
+        assert all(mapped(getattr(ensemble, name)) for name in ('feature', 'threshold', 'children', 'value'))
+    inputs = random_inputs(20)
+    for expected, actual in zip(predictor.compiled.predict(inputs), loaded.compiled.predict(inputs)):
+        np.testing.assert_array_equal(actual, expected)
+    assert loaded.compiled.classes == predictor.compiled.classes